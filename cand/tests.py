@@ -1,3 +1,6 @@
-from django.test import TestCase
+from interview.tests import ViewBudgetTestCase
 
-# Create your tests here.
+
+class CandidateViewBudgetTests(ViewBudgetTestCase):
+    def test_view_budgets(self):
+        self.assertViewBudgets([("/candidate/", 3)])
@@ -14,7 +14,7 @@ class Dashboard(View):
     def get(self, request, *args, **kwargs):
         # Handle GET request
         # TODO: Fetch from database later
-        mock_candidate = Candidate.objects.first()  # request.user.candidate
+        mock_candidate = Candidate.objects.select_related("user").first()  # request.user.candidate
         
         if mock_candidate:
             # Get pending interviews
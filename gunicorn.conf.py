@@ -0,0 +1,27 @@
+"""
+Gunicorn settings (see the Procfile).
+
+Sets up prometheus_client's multiprocess mode: the directory must be in the
+environment before workers import the app, and a dead worker's live gauges
+have to be cleaned up so they stop counting towards /metrics.
+"""
+
+import os
+import shutil
+import tempfile
+
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "vode-prometheus")
+)
+
+
+def on_starting(server):
+    # Values left over from a previous run would otherwise be counted again
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
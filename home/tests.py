@@ -0,0 +1,6 @@
+from interview.tests import ViewBudgetTestCase
+
+
+class HomeViewBudgetTests(ViewBudgetTestCase):
+    def test_view_budgets(self):
+        self.assertViewBudgets([("/", 0)])
@@ -1,10 +1,22 @@
-from django.contrib import admin
-from .models import Interview, Role, Round
+from django.contrib import admin, messages
+from .models import Interview, RateLimitBucket, RecordingUpload, Role, Round, UsageRecord
+
+
+def warn_without_transcript(model_admin, request, count):
+    """Tell the admin which interviews the re-score will leave alone"""
+    if count:
+        model_admin.message_user(
+            request,
+            f"{count} completed interviews have no stored transcript (they predate transcripts) "
+            "and keep their current score.",
+            messages.WARNING,
+        )
 
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
     list_display = ("title", "num_rounds", "assigned_swe", "created_at", "updated_at")
+    list_select_related = ("assigned_swe__user",)
     search_fields = ("title", "description")
     list_filter = ("num_rounds", "created_at")
 
@@ -12,14 +24,66 @@ class RoleAdmin(admin.ModelAdmin):
 @admin.register(Round)
 class RoundAdmin(admin.ModelAdmin):
     list_display = ("role", "round_number", "name", "difficulty_level", "time_limit")
+    list_select_related = ("role",)
     list_filter = ("difficulty_level", "role")
     search_fields = ("name", "description", "data_structures")
+    actions = ["rescore_interviews"]
+
+    @admin.action(description="Re-score completed interviews with current success metrics")
+    def rescore_interviews(self, request, queryset):
+        # Imported here so admin autodiscovery doesn't load the AI services at startup
+        from .services.batch_rescorer import rescore_in_background, without_transcript
+
+        interviews = Interview.objects.filter(round__in=queryset)
+        rescore_in_background(interviews)
+        self.message_user(
+            request,
+            "Re-scoring started in the background. Scores are saved in batches as interviews finish.",
+            messages.INFO,
+        )
+        warn_without_transcript(self, request, without_transcript(interviews))
 
 
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
-    list_display = ("candidate", "round", "score", "completed_at", "created_at")
+    list_display = ("candidate", "round", "score", "last_seen_at", "completed_at", "created_at")
+    # Candidate and Round __str__ read the user and role
+    list_select_related = ("candidate__user", "round__role")
     list_filter = ("completed_at", "round__role", "score")
     search_fields = ("candidate__user__first_name", "candidate__user__last_name", "notes")
+    actions = ["rescore"]
+
+    @admin.action(description="Re-score selected interviews with current success metrics")
+    def rescore(self, request, queryset):
+        from .services.batch_rescorer import rescore_in_background, without_transcript
+
+        rescore_in_background(queryset)
+        self.message_user(
+            request,
+            "Re-scoring started in the background. Only completed interviews with a transcript are scored.",
+            messages.INFO,
+        )
+        warn_without_transcript(self, request, without_transcript(queryset))
+
+
+@admin.register(RateLimitBucket)
+class RateLimitBucketAdmin(admin.ModelAdmin):
+    list_display = ("provider", "requests_available", "tokens_available", "in_flight", "refilled_at")
+
+
+@admin.register(UsageRecord)
+class UsageRecordAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "kind", "call_type", "model", "input_tokens", "output_tokens", "characters", "latency_ms", "outcome", "interview")
+    list_select_related = ("interview__candidate__user", "interview__round__role")
+    list_filter = ("kind", "call_type", "outcome", "model")
+    raw_id_fields = ("interview", "round")
+
+
+@admin.register(RecordingUpload)
+class RecordingUploadAdmin(admin.ModelAdmin):
+    list_display = ("interview", "kind", "session", "offset", "length", "completed_at", "preview_status", "updated_at")
+    list_select_related = ("interview__candidate__user", "interview__round__role")
+    list_filter = ("kind", "completed_at", "preview_status")
+    raw_id_fields = ("interview",)
 
 # Register your models here.
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+import os
+import time
+
+from interview.mocks import MOCK_QUESTION
+from interview.services.code_runner import CodeRunner
+from interview.services.sandbox_pool import SandboxPool
+
+BENCHMARK_CODE = """
+def twoSum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+"""
+
+
+class Command(BaseCommand):
+    help = "Benchmark sandboxed code runs: fresh interpreter per run vs the warm worker pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=200, help="Runs per mode")
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1, help="Pool size / client threads"
+        )
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        workers = options["workers"]
+        cores = os.cpu_count() or 1
+
+        self.stdout.write(f"{runs} runs, {workers} concurrent clients, {cores} cores\n")
+
+        with override_settings(CODE_RUNNER_POOL_SIZE=0):
+            cold = self._measure(CodeRunner(), runs, workers)
+        self._report("cold (fresh interpreter)", cold, runs, cores)
+
+        pool = SandboxPool(size=workers, max_queue=runs)
+        try:
+            warm = self._measure(CodeRunner(pool=pool), runs, workers)
+        finally:
+            pool.close()
+        self._report("warm (worker pool)", warm, runs, cores)
+
+    def _measure(self, runner, runs, workers):
+        def one(_):
+            started = time.perf_counter()
+            result = runner.run(BENCHMARK_CODE, MOCK_QUESTION["test_cases"])
+            return time.perf_counter() - started, result["passed"] == result["total"] > 0
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            samples = list(executor.map(one, range(runs)))
+        return time.perf_counter() - started, samples
+
+    def _report(self, label, measurement, runs, cores):
+        elapsed, samples = measurement
+        latencies = sorted(s[0] for s in samples)
+        failures = sum(1 for s in samples if not s[1])
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        rate = runs / elapsed
+
+        self.stdout.write(
+            f"{label:<26} {rate:8.1f} runs/s  {rate / cores:7.1f} runs/s/core  "
+            f"p50 {p50:6.1f}ms  p95 {p95:6.1f}ms  failures {failures}"
+        )
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# What a gunicorn worker does before serving: load the WSGI app, then the URLconf
+WSGI_BOOT = (
+    "import vode.wsgi; from django.urls import resolve; "
+    "resolve('/interview/api/get-response/')"
+)
+
+SCENARIOS = [
+    ("gunicorn worker boot", ["-c", WSGI_BOOT]),
+    ("manage.py check", ["manage.py", "check"]),
+]
+
+# Modules that must only be imported once a request needs them
+LAZY_MODULES = ["google.generativeai", "grpc", "numpy", "requests"]
+
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        Dict of module name -> (cumulative microseconds, nesting depth)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "| imported package" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            cumulative = int(cumulative)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (cumulative, depth)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker boot and management command startup with python -X importtime, "
+        "and fail if heavy SDKs are imported eagerly or startup exceeds a budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Runs per scenario (median is reported)")
+        parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=1000.0,
+            help="Fail if a scenario's median wall time exceeds this",
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+        for label, arguments in SCENARIOS:
+            wall_times = []
+            modules = {}
+            for _ in range(options["runs"]):
+                started = time.perf_counter()
+                result = subprocess.run(
+                    [sys.executable, "-X", "importtime", *arguments],
+                    cwd=settings.BASE_DIR,
+                    env=os.environ.copy(),
+                    capture_output=True,
+                    text=True,
+                )
+                wall_times.append((time.perf_counter() - started) * 1000)
+                if result.returncode != 0:
+                    raise CommandError(f"{label} failed:\n{result.stderr[-2000:]}")
+                modules = parse_importtime(result.stderr)
+
+            wall_ms = statistics.median(wall_times)
+            import_ms = sum(cumulative for cumulative, depth in modules.values() if depth == 0) / 1000
+            self.stdout.write(f"\n{label}: {wall_ms:.0f}ms wall, {import_ms:.0f}ms importing")
+
+            top_level = sorted(
+                ((cumulative, name) for name, (cumulative, depth) in modules.items() if depth == 0),
+                reverse=True,
+            )
+            for cumulative, name in top_level[: options["top"]]:
+                self.stdout.write(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+            eager = [name for name in LAZY_MODULES if name in modules]
+            if eager:
+                failures.append(f"{label} imports {', '.join(eager)} at startup")
+            if wall_ms > options["budget_ms"]:
+                failures.append(f"{label} took {wall_ms:.0f}ms (budget {options['budget_ms']:.0f}ms)")
+
+        if failures:
+            raise CommandError("\n".join(failures))
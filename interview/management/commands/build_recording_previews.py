@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from interview.models import RecordingUpload
+from interview.services.recording_preview import build_and_save
+
+
+class Command(BaseCommand):
+    help = (
+        "Build thumbnail sprites and turn indexes for finished recordings. "
+        "By default only recordings without a preview (or whose preview failed) are processed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interview", type=int, action="append", dest="interviews", help="Interview id (repeatable)")
+        parser.add_argument("--force", action="store_true", help="Rebuild previews that are already ready")
+
+    def handle(self, *args, **options):
+        uploads = RecordingUpload.objects.filter(completed_at__isnull=False).order_by("created_at")
+        if options["interviews"]:
+            uploads = uploads.filter(interview_id__in=options["interviews"])
+        if not options["force"]:
+            uploads = uploads.filter(Q(preview_status="") | Q(preview_status="failed"))
+
+        built = failed = 0
+        for upload_id in uploads.values_list("id", flat=True):
+            if build_and_save(upload_id):
+                built += 1
+            else:
+                failed += 1
+            self.stdout.write(f"\r{built} built, {failed} failed", ending="")
+            self.stdout.flush()
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"{built} previews built, {failed} failed"))
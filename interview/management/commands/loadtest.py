@@ -0,0 +1,265 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from urllib.parse import urlencode, urlsplit
+import asyncio
+import json
+import re
+import statistics
+import time
+
+from cand.models import Candidate
+from interview.models import Interview, Role, Round
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+# Snapshots of a candidate writing twoSum; each differs enough from the last to
+# reach the model instead of the local fast path. {v} keeps code distinct per
+# candidate so the code runner cache doesn't flatter the numbers.
+CODE_STEPS = [
+    "def twoSum(nums, target):\n    pass\n",
+    "def twoSum(nums, target):\n    seen_{v} = {{}}\n    for i, num in enumerate(nums):\n        pass\n",
+    "def twoSum(nums, target):\n    seen_{v} = {{}}\n    for i, num in enumerate(nums):\n"
+    "        if target - num in seen_{v}:\n            return []\n",
+    "def twoSum(nums, target):\n    seen_{v} = {{}}\n    for i, num in enumerate(nums):\n"
+    "        if target - num in seen_{v}:\n            return [seen_{v}[target - num], i]\n"
+    "        seen_{v}[num] = i\n",
+]
+STATEMENTS = [
+    "I'll start with a hash map from value to index.",
+    "",
+    "So for each number I check whether its complement was already seen.",
+    "I think that's linear time and linear space. Does that look right?",
+]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class HttpClient:
+    """
+    Minimal asyncio HTTP/1.1 client (one connection per request) that keeps
+    cookies, so the load test needs nothing beyond the standard library.
+    """
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.ssl = parts.scheme == "https"
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.timeout = timeout
+        self.cookies = {}
+
+    async def request(self, method, path, body=b"", headers=None):
+        """
+        Returns:
+            (status code, response headers dict, body bytes)
+        """
+        headers = {
+            "Host": self.host if self.port in (80, 443) else f"{self.host}:{self.port}",
+            "Connection": "close",
+            "Content-Length": str(len(body)),
+            **(headers or {}),
+        }
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+            f"{key}: {value}\r\n" for key, value in headers.items()
+        )
+
+        async def exchange():
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+            try:
+                writer.write(head.encode() + b"\r\n" + body)
+                await writer.drain()
+                return await reader.read()
+            finally:
+                writer.close()
+
+        raw = await asyncio.wait_for(exchange(), self.timeout)
+        head_bytes, _, payload = raw.partition(b"\r\n\r\n")
+        lines = head_bytes.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+
+        response_headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            value = value.strip()
+            if key.lower() == "set-cookie":
+                name, _, rest = value.partition("=")
+                self.cookies[name] = rest.split(";")[0]
+            response_headers[key.lower()] = value
+        return status, response_headers, payload
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive N virtual candidates through a running server (dashboard, interview "
+        "page, get_response turns, end) and report throughput and latency as JSON. "
+        "Start the server with LLM_PROVIDER=fake."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to test")
+        parser.add_argument("--candidates", type=int, default=20, help="Concurrent virtual candidates")
+        parser.add_argument("--turns", type=int, default=len(CODE_STEPS), help="get_response calls per interview")
+        parser.add_argument("--think-time", type=float, default=2.0, help="Seconds between turns")
+        parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which candidates start")
+        parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+        parser.add_argument("--keep", action="store_true", help="Keep the generated interviews afterwards")
+
+    def handle(self, *args, **options):
+        if options["candidates"] < 1:
+            raise CommandError("--candidates must be at least 1")
+
+        role, created_user, interview_ids = self._create_interviews(options["candidates"])
+        try:
+            report = asyncio.run(self._run(interview_ids, options))
+        finally:
+            if not options["keep"]:
+                role.delete()
+                if created_user:
+                    created_user.delete()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    def _create_interviews(self, count):
+        # The views act as the first candidate (no auth yet), so the load test must too
+        candidate = Candidate.objects.first()
+        created_user = None
+        if candidate is None:
+            created_user = User.objects.create(username="loadtest", first_name="Load", last_name="Test")
+            candidate = Candidate.objects.create(user=created_user)
+
+        role = Role.objects.create(title="Load test")
+        load_round = Round.objects.create(
+            role=role, round_number=1, name="Load test", success_metrics="Correctness, Communication"
+        )
+        interviews = Interview.objects.bulk_create(
+            [Interview(candidate=candidate, round=load_round) for _ in range(count)]
+        )
+        return role, created_user, [interview.id for interview in interviews]
+
+    async def _run(self, interview_ids, options):
+        samples = {}
+        completed = 0
+
+        async def timed(client, step, method, path, body=b"", headers=None, ok=(200,)):
+            started = time.perf_counter()
+            error = None
+            response = None
+            try:
+                response = await client.request(method, path, body, headers)
+                if response[0] not in ok:
+                    error = f"HTTP {response[0]}"
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+                error = type(e).__name__
+            samples.setdefault(step, []).append((time.perf_counter() - started, error))
+            return response if error is None else None
+
+        async def candidate(index, interview_id):
+            nonlocal completed
+            await asyncio.sleep(options["ramp_up"] * index / len(interview_ids))
+            client = HttpClient(options["url"], options["timeout"])
+
+            response = await timed(client, "dashboard", "GET", "/candidate/")
+            match = CSRF_INPUT.search(response[2].decode()) if response else None
+            if match is None:
+                return
+
+            form = urlencode({"csrfmiddlewaretoken": match.group(1), "interview_id": interview_id})
+            response = await timed(
+                client,
+                "start",
+                "POST",
+                "/candidate/",
+                form.encode(),
+                {"Content-Type": "application/x-www-form-urlencoded", "Referer": options["url"] + "/candidate/"},
+                ok=(302,),
+            )
+            if response is None:
+                return
+
+            if await timed(client, "interview_page", "GET", f"/interview/{interview_id}/") is None:
+                return
+
+            for turn in range(options["turns"]):
+                code = CODE_STEPS[min(turn, len(CODE_STEPS) - 1)].format(v=index)
+                payload = {
+                    "code": code,
+                    "audio_transcript": STATEMENTS[turn % len(STATEMENTS)],
+                    "interview_id": interview_id,
+                }
+                await timed(
+                    client,
+                    "get_response",
+                    "POST",
+                    "/interview/api/get-response/",
+                    json.dumps(payload).encode(),
+                    {"Content-Type": "application/json"},
+                )
+                await asyncio.sleep(options["think_time"])
+
+            if await timed(client, "end", "GET", f"/interview/end/{interview_id}/") is not None:
+                completed += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(candidate(index, interview_id) for index, interview_id in enumerate(interview_ids))
+        )
+        elapsed = time.perf_counter() - started
+
+        return self._report(samples, completed, elapsed, options)
+
+    def _report(self, samples, completed, elapsed, options):
+        steps = {}
+        all_latencies = []
+        total_errors = 0
+        for step, results in samples.items():
+            latencies = sorted(seconds * 1000 for seconds, _ in results)
+            errors = [error for _, error in results if error]
+            all_latencies += latencies
+            total_errors += len(errors)
+            steps[step] = {
+                "requests": len(results),
+                "errors": len(errors),
+                "error_rate": round(len(errors) / len(results), 4),
+                "error_kinds": {kind: errors.count(kind) for kind in set(errors)},
+                "mean_ms": round(statistics.fmean(latencies), 1),
+                "p50_ms": round(percentile(latencies, 50), 1),
+                "p95_ms": round(percentile(latencies, 95), 1),
+                "p99_ms": round(percentile(latencies, 99), 1),
+                "max_ms": round(latencies[-1], 1),
+            }
+
+        all_latencies.sort()
+        total = len(all_latencies)
+        return {
+            "config": {
+                "url": options["url"],
+                "candidates": options["candidates"],
+                "turns": options["turns"],
+                "think_time": options["think_time"],
+                "ramp_up": options["ramp_up"],
+            },
+            "duration_s": round(elapsed, 2),
+            "interviews_completed": completed,
+            "requests": total,
+            "requests_per_s": round(total / elapsed, 2),
+            "interviews_per_min": round(completed / elapsed * 60, 2),
+            "error_rate": round(total_errors / total, 4) if total else None,
+            "p50_ms": round(percentile(all_latencies, 50), 1) if total else None,
+            "p95_ms": round(percentile(all_latencies, 95), 1) if total else None,
+            "p99_ms": round(percentile(all_latencies, 99), 1) if total else None,
+            "steps": steps,
+        }
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview.services.presence import reap_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Finalize and score started interviews that are past their round's time limit "
+        "plus INTERVIEW_GRACE_SECONDS (the candidate left without ending them). "
+        "Web processes already do this in the background; this runs one pass, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only list the interviews that would be reaped")
+
+    def handle(self, *args, **options):
+        reaped = reap_expired(dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{len(reaped)} interviews past their time limit + {settings.INTERVIEW_GRACE_SECONDS}s: "
+                f"{', '.join(map(str, reaped)) or '-'}"
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(f"Reaped {len(reaped)} interviews"))
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.models import Interview
+from interview.services.batch_rescorer import BatchRescorer
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-score completed interviews against their round's current success metrics "
+        "by replaying stored transcripts. Resumable: interviews already re-scored with "
+        "the same metrics are skipped. Interviews completed before transcripts were "
+        "stored have nothing to replay and keep their score."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--round", type=int, action="append", dest="rounds", help="Round id (repeatable)")
+        parser.add_argument("--role", type=int, help="Role id")
+        parser.add_argument("--all", action="store_true", help="Every completed interview")
+        parser.add_argument("--workers", type=int, default=settings.RESCORE_WORKERS)
+        parser.add_argument("--batch-size", type=int, default=settings.RESCORE_BATCH_SIZE)
+        parser.add_argument("--checkpoint", default=settings.RESCORE_CHECKPOINT_PATH, help="Checkpoint file")
+        parser.add_argument("--restart", action="store_true", help="Ignore and clear the checkpoint")
+
+    def handle(self, *args, **options):
+        interviews = Interview.objects.all()
+        if options["rounds"]:
+            interviews = interviews.filter(round_id__in=options["rounds"])
+        elif options["role"]:
+            interviews = interviews.filter(round__role_id=options["role"])
+        elif not options["all"]:
+            raise CommandError("Pass --round, --role or --all")
+
+        rescorer = BatchRescorer(
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            checkpoint_path=options["checkpoint"],
+        )
+        if options["restart"]:
+            rescorer.checkpoint.clear()
+
+        def progress(summary):
+            self.stdout.write(
+                f"\r{summary['scored']} scored, {summary['failed']} failed", ending=""
+            )
+            self.stdout.flush()
+
+        try:
+            summary = rescorer.run(interviews, on_progress=progress)
+        except KeyboardInterrupt:
+            self.stderr.write("\nInterrupted; finished scores were saved. Re-run to resume.")
+            return
+
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{summary['total']} interviews: {summary['scored']} re-scored, "
+                f"{summary['skipped']} already done, {summary['failed']} failed"
+            )
+        )
+        if summary["no_transcript"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{summary['no_transcript']} completed interviews have no stored transcript "
+                    "and were not re-scored (they keep their current score)"
+                )
+            )
+        if summary["failed"]:
+            self.stdout.write("Re-run the same command to retry the failed ones")
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.models import Round
+from interview.services.gemini_service import GeminiService
+from interview.services.question_pool import fill_pool, unused_questions
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill each round's pool of unused questions, generating them in batches "
+        "(QUESTION_BATCH_SIZE per model call). Use when seeding a new role."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--role", type=int, help="Role id")
+        parser.add_argument("--round", type=int, action="append", dest="rounds", help="Round id (repeatable)")
+        parser.add_argument("--all", action="store_true", help="Every round")
+        parser.add_argument(
+            "--count", type=int, default=settings.QUESTION_POOL_SIZE, help="Unused questions wanted per round"
+        )
+
+    def handle(self, *args, **options):
+        rounds = Round.objects.select_related("role").order_by("role_id", "round_number")
+        if options["rounds"]:
+            rounds = rounds.filter(id__in=options["rounds"])
+        elif options["role"]:
+            rounds = rounds.filter(role_id=options["role"])
+        elif not options["all"]:
+            raise CommandError("Pass --role, --round or --all")
+
+        gemini = GeminiService()
+        total = 0
+        for round_obj in rounds:
+            try:
+                created = fill_pool(round_obj, gemini, size=options["count"])
+            except Exception as e:
+                self.stderr.write(f"{round_obj}: failed ({e})")
+                continue
+            total += created
+            self.stdout.write(
+                f"{round_obj}: +{created} questions, {unused_questions(round_obj).count()} unused"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Added {total} questions"))
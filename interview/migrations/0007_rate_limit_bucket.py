@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0006_alter_round_time_limit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(help_text='Provider name (e.g., gemini)', max_length=50, unique=True)),
+                ('requests_available', models.FloatField(default=0, help_text='Request tokens left in the bucket')),
+                ('tokens_available', models.FloatField(default=0, help_text='Model/TTS tokens left in the bucket')),
+                ('refilled_at', models.FloatField(default=0, help_text='Unix time of the last refill')),
+                ('in_flight', models.PositiveIntegerField(default=0, help_text='Calls currently running')),
+            ],
+            options={
+                'verbose_name': 'Rate Limit Bucket',
+                'verbose_name_plural': 'Rate Limit Buckets',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0007_rate_limit_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='complexity',
+            field=models.JSONField(blank=True, help_text='Measured complexity of the last passing solution', null=True),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='transcript',
+            field=models.JSONField(blank=True, default=list, help_text='Answered turns, replayed when re-scoring'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0008_interview_transcript'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('model', 'Model call'), ('tts', 'Text to speech')], max_length=10)),
+                ('call_type', models.CharField(blank=True, help_text='turn, question, score, summary or speech', max_length=20)),
+                ('model', models.CharField(blank=True, help_text='Model or voice that served the call', max_length=100)),
+                ('input_tokens', models.PositiveIntegerField(default=0)),
+                ('output_tokens', models.PositiveIntegerField(default=0)),
+                ('characters', models.PositiveIntegerField(default=0, help_text='Characters synthesized (TTS)')),
+                ('latency_ms', models.FloatField(default=0)),
+                ('outcome', models.CharField(help_text='ok, error, rate_limited or abandoned', max_length=20)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('interview', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='usage_records', to='interview.interview')),
+                ('round', models.ForeignKey(blank=True, help_text='Set for calls made outside an interview too (question generation)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='usage_records', to='interview.round')),
+            ],
+            options={
+                'verbose_name': 'Usage Record',
+                'verbose_name_plural': 'Usage Records',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0009_usage_record'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingUpload',
+            fields=[
+                ('id', models.CharField(help_text='Unguessable id, used in the upload URL', max_length=32, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('screen', 'Screen recording'), ('candidate', 'Candidate video')], max_length=10)),
+                ('key', models.CharField(help_text='Object name in recording storage', max_length=300)),
+                ('offset', models.PositiveBigIntegerField(default=0, help_text='Bytes received so far')),
+                ('length', models.PositiveBigIntegerField(blank=True, help_text='Total size, if the client declared it', null=True)),
+                ('storage_state', models.JSONField(blank=True, default=dict, help_text='Backend bookkeeping (e.g. multipart upload parts)')),
+                ('url', models.CharField(blank=True, help_text='Where the finished recording is served from', max_length=500)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_uploads', to='interview.interview')),
+            ],
+            options={
+                'verbose_name': 'Recording Upload',
+                'verbose_name_plural': 'Recording Uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0010_recording_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recordingupload',
+            name='preview_status',
+            field=models.CharField(blank=True, choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], help_text='Thumbnail sprite and index (see services.recording_preview)', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='recordingupload',
+            name='recording_started_at',
+            field=models.DateTimeField(blank=True, help_text='When the recorder started, for lining turns up with the video', null=True),
+        ),
+    ]
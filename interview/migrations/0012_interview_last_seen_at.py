@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0011_recording_preview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, help_text="Last heartbeat from the candidate's page (written at most every PRESENCE_WRITE_SECONDS)", null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0012_interview_last_seen_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ratelimitbucket',
+            name='leases',
+            field=models.JSONField(blank=True, default=dict, help_text='Lease id -> Unix time it expires, one per running call'),
+        ),
+        migrations.AlterField(
+            model_name='ratelimitbucket',
+            name='in_flight',
+            field=models.PositiveIntegerField(default=0, help_text='Calls currently running (number of leases)'),
+        ),
+    ]
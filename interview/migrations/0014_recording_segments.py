@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0013_rate_limit_leases'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recordingupload',
+            name='session',
+            field=models.CharField(blank=True, help_text='Recorder session (page load) this segment was recorded in', max_length=32),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:53
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def claim_used_questions(apps, schema_editor):
+    # Questions already asked in an interview are no longer in the pool
+    Question = apps.get_model('interview', 'Question')
+    Question.objects.filter(interviews__isnull=False).update(claimed_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0014_recording_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text="When an interview took it from the round's pool (see services.question_pool)", null=True),
+        ),
+        migrations.RunPython(claim_used_questions, migrations.RunPython.noop),
+    ]
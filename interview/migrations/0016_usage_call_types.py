@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview', '0015_question_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usagerecord',
+            name='call_type',
+            field=models.CharField(blank=True, help_text='turn, question, score or speech', max_length=20),
+        ),
+    ]
@@ -78,40 +78,22 @@ Output: [0,1]</code></pre>
     ]
 }
 
-QUESTION_GENERATION_PROMPT = """You are an expert technical interviewer tasked with creating a coding interview question.
-
---- INTERVIEW CONTEXT ---
-Difficulty: %(difficulty)s
-Topics: %(topics)s
-
---- RECENTLY USED QUESTIONS (DO NOT REPEAT) ---
-%(already_picked)s
-
---- INSTRUCTIONS ---
-Generate a complete coding interview question that:
-1. Is appropriate for the given difficulty level and covers the specified topics
-2. Is DIFFERENT from the recently used questions listed above
-3. Tests the candidate's problem-solving and coding abilities
-4. Includes clear examples and test cases
-5. Has well-defined constraints
-6. Is solvable within the interview time limit
-
---- OUTPUT FORMAT ---
-Return a JSON object with the following structure:
-
-{
-    "title": "Brief, descriptive question title (e.g., 'Two Sum', 'Valid Parentheses')",
-    "statement": "HTML-formatted question statement including sections for Description, Examples, Constraints, and optionally Follow-up",
-    "test_cases": [
-        {
-            "input": {"param1": value1, "param2": value2},
-            "output": expected_output,
-            "explanation": "Brief explanation of why this output is correct"
-        }
-    ]
+# Canned outputs for the fake LLM provider (load tests, offline development)
+MOCK_COACHING_REPLIES = [
+    "Nice start. What happens to your approach if the same number appears twice in the input?",
+    "You're iterating over every pair right now. Is there a way to remember what you've already seen?",
+    "Good progress. Can you walk me through the time complexity of this loop?",
+    "That looks close. Which of the examples would you use to sanity-check the edge cases?",
+    "I like how you're explaining your thinking. What data structure would make that lookup faster?",
+]
+
+MOCK_SCORE = {
+    "score": 72,
+    "feedback": "Clear communication and a working solution. Areas for improvement: consider edge cases earlier, and reason about complexity before coding.",
 }
 
---- STATEMENT HTML STRUCTURE ---
+# Formatting rules for generated questions
+QUESTION_GUIDELINES = """--- STATEMENT HTML STRUCTURE ---
 The "statement" field should be formatted as HTML with the following structure:
 
 <div class="question-section">
@@ -158,6 +140,48 @@ Output: result</code></pre>
 4. **Constraints**: Specific bounds on input size, value ranges, edge cases
 5. **Test Cases**: Minimum 3 test cases covering normal cases, edge cases, and corner cases
 
-Generate a question that would take approximately 30-45 minutes for a %(difficulty)s level candidate to solve.
+"""
+
+# One call for several questions: the boilerplate above is paid once per batch
+QUESTION_BATCH_GENERATION_PROMPT = (
+    """You are an expert technical interviewer tasked with creating %(count)s coding interview questions.
+
+--- INTERVIEW CONTEXT ---
+Difficulty: %(difficulty)s
+Topics: %(topics)s
+
+--- RECENTLY USED QUESTIONS (DO NOT REPEAT) ---
+%(already_picked)s
+
+--- INSTRUCTIONS ---
+Generate exactly %(count)s complete coding interview questions that:
+1. Are appropriate for the given difficulty level and cover the specified topics
+2. Are DIFFERENT from the recently used questions listed above AND from each other (distinct problems, not variations)
+3. Test the candidate's problem-solving and coding abilities
+4. Include clear examples and test cases
+5. Have well-defined constraints
+6. Are solvable within the interview time limit
+
+--- OUTPUT FORMAT ---
+Return a JSON array of %(count)s objects, each with the following structure:
+
+[
+    {
+        "title": "Brief, descriptive question title (e.g., 'Two Sum', 'Valid Parentheses')",
+        "statement": "HTML-formatted question statement including sections for Description, Examples, Constraints, and optionally Follow-up",
+        "test_cases": [
+            {
+                "input": {"param1": value1, "param2": value2},
+                "output": expected_output,
+                "explanation": "Brief explanation of why this output is correct"
+            }
+        ]
+    }
+]
+
+"""
+    + QUESTION_GUIDELINES
+    + """Each question should take approximately 30-45 minutes for a %(difficulty)s level candidate to solve.
 
-Return ONLY the JSON object, no additional text or explanation."""
+Return ONLY the JSON array, no additional text or explanation."""
+)
@@ -71,6 +71,7 @@ class Question(models.Model):
     statement = models.TextField(help_text="The problem statement/description")
     test_cases = models.JSONField(help_text="Test cases as JSON dict")
     round = models.ForeignKey(Round, on_delete=models.CASCADE, related_name='questions')
+    claimed_at = models.DateTimeField(null=True, blank=True, help_text="When an interview took it from the round's pool (see services.question_pool)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -97,6 +98,9 @@ class Interview(models.Model):
     candidate_video = models.URLField(max_length=500, blank=True, help_text="URL to candidate video recording")
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True, help_text="Last heartbeat from the candidate's page (written at most every PRESENCE_WRITE_SECONDS)")
+    transcript = models.JSONField(default=list, blank=True, help_text="Answered turns, replayed when re-scoring")
+    complexity = models.JSONField(null=True, blank=True, help_text="Measured complexity of the last passing solution")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -107,3 +111,112 @@ class Interview(models.Model):
 
     def __str__(self):
         return f"{self.candidate} - {self.round.role.title} Round {self.round.round_number}"
+
+    def record_turn(self, turn, complexity=None):
+        """Append one answered turn (see InterviewOrchestrator.get_ai_response) and save it"""
+        self.transcript.append(turn)
+        fields = ["transcript", "updated_at"]
+        if complexity:
+            self.complexity = complexity
+            fields.append("complexity")
+        self.save(update_fields=fields)
+
+    def recording_parts(self):
+        """
+        Finished recording segments, one part per recorder session in the order
+        they were recorded: a list of {kind: RecordingUpload}. Reloading the
+        interview page starts a new part.
+        """
+        parts = {}
+        for upload in self.recording_uploads.filter(completed_at__isnull=False).order_by(
+            "recording_started_at", "created_at"
+        ):
+            parts.setdefault(upload.session, {})[upload.kind] = upload
+        return list(parts.values())
+
+
+class RateLimitBucket(models.Model):
+    """Shared token-bucket state for one external AI provider, used by every app process"""
+    provider = models.CharField(max_length=50, unique=True, help_text="Provider name (e.g., gemini)")
+    requests_available = models.FloatField(default=0, help_text="Request tokens left in the bucket")
+    tokens_available = models.FloatField(default=0, help_text="Model/TTS tokens left in the bucket")
+    refilled_at = models.FloatField(default=0, help_text="Unix time of the last refill")
+    in_flight = models.PositiveIntegerField(default=0, help_text="Calls currently running (number of leases)")
+    leases = models.JSONField(default=dict, blank=True, help_text="Lease id -> Unix time it expires, one per running call")
+
+    class Meta:
+        verbose_name = "Rate Limit Bucket"
+        verbose_name_plural = "Rate Limit Buckets"
+
+    def __str__(self):
+        return f"{self.provider} ({self.in_flight} in flight)"
+
+
+class UsageRecord(models.Model):
+    """One model or TTS call: what it cost and how long it took (written in batches by UsageLedger)"""
+    KIND_CHOICES = [
+        ('model', 'Model call'),
+        ('tts', 'Text to speech'),
+    ]
+
+    interview = models.ForeignKey(Interview, on_delete=models.SET_NULL, null=True, blank=True, related_name='usage_records')
+    round = models.ForeignKey(Round, on_delete=models.SET_NULL, null=True, blank=True, related_name='usage_records', help_text="Set for calls made outside an interview too (question generation)")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    call_type = models.CharField(max_length=20, blank=True, help_text="turn, question, score or speech")
+    model = models.CharField(max_length=100, blank=True, help_text="Model or voice that served the call")
+    input_tokens = models.PositiveIntegerField(default=0)
+    output_tokens = models.PositiveIntegerField(default=0)
+    characters = models.PositiveIntegerField(default=0, help_text="Characters synthesized (TTS)")
+    latency_ms = models.FloatField(default=0)
+    outcome = models.CharField(max_length=20, help_text="ok, error, rate_limited or abandoned")
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Usage Record"
+        verbose_name_plural = "Usage Records"
+
+    def __str__(self):
+        return f"{self.kind} {self.call_type} ({self.outcome}, {self.latency_ms:.0f}ms)"
+
+
+class RecordingUpload(models.Model):
+    """
+    A resumable (tus-style) upload of one recording segment, written chunk by chunk to recording storage.
+
+    Every recorder session (page load) starts a new WebM stream, so each one is
+    its own segment; a reloaded interview has several per kind.
+    """
+    KIND_CHOICES = [
+        ('screen', 'Screen recording'),
+        ('candidate', 'Candidate video'),
+    ]
+    PREVIEW_CHOICES = [
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.CharField(primary_key=True, max_length=32, help_text="Unguessable id, used in the upload URL")
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='recording_uploads')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    session = models.CharField(max_length=32, blank=True, help_text="Recorder session (page load) this segment was recorded in")
+    key = models.CharField(max_length=300, help_text="Object name in recording storage")
+    offset = models.PositiveBigIntegerField(default=0, help_text="Bytes received so far")
+    length = models.PositiveBigIntegerField(null=True, blank=True, help_text="Total size, if the client declared it")
+    storage_state = models.JSONField(default=dict, blank=True, help_text="Backend bookkeeping (e.g. multipart upload parts)")
+    url = models.CharField(max_length=500, blank=True, help_text="Where the finished recording is served from")
+    recording_started_at = models.DateTimeField(null=True, blank=True, help_text="When the recorder started, for lining turns up with the video")
+    preview_status = models.CharField(max_length=12, choices=PREVIEW_CHOICES, blank=True, help_text="Thumbnail sprite and index (see services.recording_preview)")
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Recording Upload"
+        verbose_name_plural = "Recording Uploads"
+
+    def __str__(self):
+        state = "complete" if self.completed_at else f"{self.offset} bytes"
+        return f"{self.get_kind_display()} for interview {self.interview_id} ({state})"
@@ -0,0 +1,248 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connections
+from interview.services.complexity import format_complexity
+from interview.services.gemini_service import GeminiService
+from interview.services.llm_providers import get_provider
+from interview.services.rate_limiter import RateLimitExceeded
+from interview.services.usage_ledger import usage_scope
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Attempts per interview when the shared rate limit is saturated
+RATE_LIMIT_RETRIES = 3
+
+
+def metrics_fingerprint(interview):
+    """Identifies the scoring inputs: a changed metric list means the score is stale"""
+    metrics = json.dumps(interview.round.success_metrics_list)
+    return hashlib.sha256(metrics.encode()).hexdigest()[:16]
+
+
+class Checkpoint:
+    """
+    JSON file of {interview id: metrics fingerprint} for interviews already
+    re-scored and written. Re-running skips them unless their metrics changed
+    again, so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.done = json.load(f).get("done", {})
+
+    def is_done(self, interview):
+        return self.done.get(str(interview.id)) == metrics_fingerprint(interview)
+
+    def mark(self, interviews):
+        for interview in interviews:
+            self.done[str(interview.id)] = metrics_fingerprint(interview)
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        # Write then rename, so a crash never leaves a half-written checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": self.done}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.done = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BatchRescorer:
+    """
+    Re-scores completed interviews against their round's current success metrics.
+
+    Only interviews with a stored transcript can be re-scored: the candidate's
+    code and answers were not kept before transcripts were, so older interviews
+    keep their score and are counted as no_transcript.
+
+    Each interview's stored transcript is replayed into a fresh GeminiService and
+    scored with score_interview(). Interviews are scored concurrently, but every
+    call still goes through the shared provider rate limiter at PRIORITY_SCORE,
+    so live interviews keep priority. Results are written with bulk_update every
+    `batch_size` interviews, and only then checkpointed.
+    """
+
+    def __init__(self, workers=None, batch_size=None, checkpoint_path=None, provider=None):
+        self.workers = workers or settings.RESCORE_WORKERS
+        self.batch_size = batch_size or settings.RESCORE_BATCH_SIZE
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.provider = provider or get_provider()
+
+    def score(self, interview):
+        """
+        Replay one interview and score it.
+
+        Returns:
+            Dict with score and feedback
+
+        Raises:
+            Exception: If scoring failed (the interview is left untouched)
+        """
+        question = interview.question
+        gemini = GeminiService(provider=self.provider)
+        gemini.initialize_context(
+            {
+                "title": question.title if question else "",
+                "statement": question.statement if question else "",
+                "test_cases": question.test_cases if question else [],
+            },
+            {
+                "role": interview.round.role.title,
+                "difficulty": interview.round.difficulty_level,
+                "interview_id": interview.id,
+            },
+        )
+        gemini.replay_turns(interview.transcript, interview.id)
+
+        for attempt in range(RATE_LIMIT_RETRIES):
+            try:
+                return gemini.score_interview(
+                    interview.round.success_metrics_list,
+                    complexity=format_complexity(interview.complexity) if interview.complexity else None,
+                    raise_errors=True,
+                    interview_id=interview.id,
+                )
+            except RateLimitExceeded:
+                if attempt == RATE_LIMIT_RETRIES - 1:
+                    raise
+                # score_interview appended its prompt; drop it before retrying
+                gemini.history(interview.id).pop()
+                time.sleep(2**attempt)
+
+    def _score_in_thread(self, interview):
+        try:
+            with usage_scope(interview.id, interview.round_id):
+                return self.score(interview)
+        finally:
+            # Rate limit bucket queries run on the provider-call threads, which
+            # close their own connections; this closes any a lazy load opened here
+            connections.close_all()
+
+    def run(self, interviews, on_progress=None):
+        """
+        Re-score a queryset of interviews.
+
+        Args:
+            interviews: Interview queryset (only completed ones with a transcript are scored)
+            on_progress: Optional callable(summary dict) after every finished interview
+
+        Returns:
+            Dict with total, scored, skipped and failed counts, and no_transcript:
+            completed interviews left out because they have nothing to replay
+        """
+        from interview.models import Interview
+
+        candidates = (
+            interviews.filter(completed_at__isnull=False)
+            .exclude(transcript=[])
+            .select_related("round", "round__role", "question")
+        )
+
+        pending = []
+        summary = {"total": 0, "scored": 0, "skipped": 0, "failed": 0, "no_transcript": without_transcript(interviews)}
+        for interview in candidates.iterator():
+            summary["total"] += 1
+            if self.checkpoint.is_done(interview):
+                summary["skipped"] += 1
+            else:
+                pending.append(interview)
+
+        logger.info(
+            f"Re-scoring {len(pending)} interviews ({summary['skipped']} already done, "
+            f"{summary['no_transcript']} without a transcript) with {self.workers} workers"
+        )
+
+        unwritten = []
+
+        def flush():
+            if not unwritten:
+                return
+            Interview.objects.bulk_update(unwritten, ["score", "notes"])
+            self.checkpoint.mark(unwritten)
+            logger.info(f"Wrote {len(unwritten)} re-scored interviews")
+            unwritten.clear()
+
+        # try/finally: scores already received are written even if interrupted
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="rescore"
+            ) as executor:
+                queue = iter(pending)
+                running = {}
+
+                def submit_next():
+                    interview = next(queue, None)
+                    if interview is not None:
+                        running[executor.submit(self._score_in_thread, interview)] = interview
+
+                # Only keep `workers` jobs queued so an interrupt doesn't wait on the rest
+                for _ in range(self.workers):
+                    submit_next()
+
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        interview = running.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            summary["failed"] += 1
+                            logger.error(f"Could not re-score interview {interview.id}: {e}")
+                        else:
+                            interview.score = max(0, min(100, int(result["score"])))
+                            interview.notes = result["feedback"]
+                            unwritten.append(interview)
+                            summary["scored"] += 1
+
+                        if len(unwritten) >= self.batch_size:
+                            flush()
+                        if on_progress:
+                            on_progress(dict(summary))
+                        submit_next()
+        finally:
+            flush()
+
+        logger.info(f"Re-scoring finished: {summary}")
+        return summary
+
+
+def without_transcript(interviews):
+    """How many completed interviews in the queryset can't be re-scored (no stored transcript)"""
+    return interviews.filter(completed_at__isnull=False, transcript=[]).count()
+
+
+def rescore_in_background(interviews, checkpoint_path=None):
+    """
+    Start a BatchRescorer on a daemon thread (used by the admin actions).
+
+    No checkpoint by default: an explicit admin request re-scores every
+    selected interview, even if its metrics haven't changed.
+    """
+    rescorer = BatchRescorer(checkpoint_path=checkpoint_path)
+
+    def target():
+        try:
+            rescorer.run(interviews)
+        except Exception as e:
+            logger.error(f"Background re-scoring failed: {e}", exc_info=True)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=target, name="rescore-batch", daemon=True)
+    thread.start()
+    return thread
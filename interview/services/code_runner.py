@@ -0,0 +1,263 @@
+from django.conf import settings
+from interview.services.sandbox_harness import read_all
+from interview.services.sandbox_pool import SandboxBusy, get_pool
+from collections import OrderedDict
+from pathlib import Path
+import ast
+import copy
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+HARNESS_PATH = Path(__file__).resolve().parent / "sandbox_harness.py"
+
+
+def normalize_test_cases(test_cases):
+    """
+    Question.test_cases is stored either as a list of cases or as a dict
+    wrapping that list. Always return a list of {"input", "output"} dicts.
+    """
+    if isinstance(test_cases, dict):
+        test_cases = test_cases.get("test_cases") or test_cases.get("cases") or []
+    if not isinstance(test_cases, list):
+        return []
+    return [case for case in test_cases if isinstance(case, dict) and "input" in case]
+
+
+def code_fingerprint(code):
+    """
+    Hash of the code's AST, so whitespace and comment-only edits hit the cache.
+    Falls back to the stripped source when the code does not parse.
+    """
+    try:
+        normalized = ast.dump(ast.parse(code), include_attributes=False)
+    except (SyntaxError, ValueError):
+        normalized = "\n".join(line.rstrip() for line in code.strip().splitlines())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def test_cases_version(cases):
+    """Content hash of the test cases, so edited cases never hit stale results"""
+    payload = json.dumps(cases, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ResultCache:
+    """Thread-safe LRU cache of run results"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def set(self, key, result):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+result_cache = ResultCache(settings.CODE_RUNNER_CACHE_SIZE)
+
+
+class CodeRunner:
+    """Runs candidate Python code against a question's test cases in a sandbox"""
+
+    def __init__(self, pool=None):
+        self.pool = pool  # defaults to the process-wide pool from get_pool()
+        self.limits = {
+            "cpu_seconds": settings.CODE_RUNNER_CPU_SECONDS,
+            "memory_mb": settings.CODE_RUNNER_MEMORY_MB,
+        }
+        self.wall_seconds = settings.CODE_RUNNER_WALL_SECONDS
+
+    def run(self, code, test_cases, question_id=None, use_cache=True, wall_seconds=None):
+        """
+        Execute candidate code against test cases in an isolated subprocess.
+
+        The code runs in a forked child with CPU-time, address-space, file-size
+        and process-count rlimits, an empty environment, and a seccomp filter
+        that blocks process creation, exec, sockets and filesystem changes (see
+        sandbox_harness). When CODE_RUNNER_POOL_SIZE > 0 the run goes to a warm
+        worker from the sandbox pool instead of a fresh interpreter.
+
+        Args:
+            code: Candidate source code (Python)
+            test_cases: Question.test_cases (list or dict)
+            question_id: Question the cases belong to (part of the cache key)
+            use_cache: Set False for one-off inputs that should not fill the cache
+            wall_seconds: Tighter wall-clock limit for this run (never above CODE_RUNNER_WALL_SECONDS)
+
+        Returns:
+            Dict with:
+            - ok: False if the code could not be loaded or the sandbox died
+            - cached: True if the result came from the result cache
+            - error: Load/limit error message, or None
+            - passed / total: Test case counts
+            - results: Per-case dicts (input, expected, actual, passed, error, stdout, duration_ms)
+        """
+        cases = normalize_test_cases(test_cases)
+        if not code or not code.strip() or not cases:
+            return self._summarize({"ok": False, "error": "Nothing to run", "results": []})
+
+        # Unchanged code (up to formatting/comments) returns the previous result
+        cache_key = (question_id, code_fingerprint(code), test_cases_version(cases))
+        cached = result_cache.get(cache_key) if use_cache else None
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        if wall_seconds is None or wall_seconds > self.wall_seconds:
+            wall_seconds = self.wall_seconds
+
+        with tempfile.TemporaryDirectory(prefix="vode-sandbox-") as workdir:
+            job = {
+                "code": code,
+                "cases": cases,
+                "limits": self.limits,
+                "workdir": workdir,
+                "wall_seconds": wall_seconds,
+                "allow_unconfined": settings.CODE_RUNNER_ALLOW_UNCONFINED,
+            }
+            pool = self.pool or get_pool()
+            if pool is not None:
+                result = self._run_pooled(pool, job)
+            else:
+                result = self._run_subprocess(job, workdir)
+
+        result.pop("limit_breached", None)
+        transient = result.pop("transient", False)
+        result = self._summarize(result)
+        result["cached"] = False
+
+        # Busy pools and wall-clock timeouts depend on load, not on the code
+        if use_cache and not transient:
+            result_cache.set(cache_key, result)
+        return result
+
+    def _run_pooled(self, pool, job):
+        """Run on a warm worker (no interpreter startup per run)"""
+        try:
+            return pool.run(job, timeout=job["wall_seconds"] + 2)
+        except SandboxBusy as e:
+            logger.warning(f"Sandbox pool busy: {e}")
+            return {
+                "ok": False,
+                "error": "Code runner is busy, try again shortly",
+                "results": [],
+                "transient": True,
+            }
+        except TimeoutError as e:
+            logger.error(f"Sandbox worker timed out: {e}")
+            return {
+                "ok": False,
+                "error": f"Time limit exceeded ({job['wall_seconds']}s)",
+                "results": [],
+                "transient": True,
+            }
+        except RuntimeError as e:
+            logger.error(f"Sandbox worker failed: {e}")
+            return {
+                "ok": False,
+                "error": "Code runner failed, try again shortly",
+                "results": [],
+                "transient": True,
+            }
+
+    def _run_subprocess(self, job, workdir):
+        """
+        Run in a fresh interpreter (used when the pool is disabled).
+
+        The harness writes its result to a dedicated pipe, never to stdout,
+        and the child running the candidate code can't reach that pipe.
+        """
+        read_fd, write_fd = os.pipe()
+        try:
+            proc = subprocess.Popen(
+                [sys.executable, "-I", "-S", str(HARNESS_PATH), str(write_fd)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(write_fd,),
+                env={},
+                cwd=workdir,
+            )
+        finally:
+            os.close(write_fd)
+
+        try:
+            proc.stdin.write(json.dumps(job).encode())
+            proc.stdin.close()
+            # The harness enforces wall_seconds on the child itself; this covers the harness
+            data, timed_out = read_all(read_fd, time.monotonic() + job["wall_seconds"] + 2)
+        finally:
+            os.close(read_fd)
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+        if timed_out:
+            logger.warning("Sandbox run exceeded wall-clock limit")
+            return {
+                "ok": False,
+                "error": f"Time limit exceeded ({job['wall_seconds']}s)",
+                "results": [],
+                "transient": True,
+            }
+        try:
+            return json.loads(data)
+        except ValueError:
+            logger.error(f"Sandbox produced no result (exit code {proc.returncode})")
+            return {"ok": False, "error": "Code runner failed, try again shortly", "results": [], "transient": True}
+
+    def _summarize(self, result):
+        results = result.get("results") or []
+        result["total"] = len(results)
+        result["passed"] = sum(1 for r in results if r.get("passed"))
+        return result
+
+
+def format_test_results(result, max_failures=3):
+    """
+    Summarize a CodeRunner result as plain text for the model prompt.
+    """
+    if not result:
+        return "(Tests not run)"
+    if not result.get("ok"):
+        return f"Code could not be tested: {result.get('error')}"
+
+    lines = [f"Passed {result['passed']}/{result['total']} test cases."]
+    failures = [r for r in result["results"] if not r.get("passed")]
+    for failure in failures[:max_failures]:
+        outcome = failure.get("error") or f"got {json.dumps(failure.get('actual'))}"
+        lines.append(
+            f"- Case {failure['index'] + 1}: input {json.dumps(failure.get('input'))}, "
+            f"expected {json.dumps(failure.get('expected'))}, {outcome}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,198 @@
+from django.conf import settings
+from interview.services.code_runner import (
+    ResultCache,
+    code_fingerprint,
+    normalize_test_cases,
+    test_cases_version,
+)
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# Candidate growth curves, simplest first (ties go to the simpler curve).
+# numpy is passed in rather than imported here: it is only needed once a
+# solution passes, so workers and management commands don't pay for it at boot.
+COMPLEXITY_MODELS = [
+    ("O(1)", lambda np, n: np.ones_like(n)),
+    ("O(log n)", lambda np, n: np.log2(n)),
+    ("O(n)", lambda np, n: n),
+    ("O(n log n)", lambda np, n: n * np.log2(n)),
+    ("O(n^2)", lambda np, n: n**2),
+    ("O(n^3)", lambda np, n: n**3),
+]
+
+# A more complex curve must beat the simpler one's residual by this factor
+SIMPLER_MODEL_TOLERANCE = 1.5
+
+# Repeats per input size; the fastest run is kept to filter scheduler noise
+REPEATS = 3
+
+analysis_cache = ResultCache(128)
+
+
+def _scale_value(value, n, rng):
+    """Grow one sample input value to size n, keeping its element types"""
+    if isinstance(value, list):
+        if value and all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+            low, high = min(value), max(value)
+            if high - low < n:
+                high = low + n
+            return [rng.randint(low, high) for _ in range(n)]
+        if value:
+            return [value[i % len(value)] for i in range(n)]
+        return [rng.randint(0, n) for _ in range(n)]
+    if isinstance(value, str):
+        alphabet = value or "ab"
+        return "".join(alphabet[i % len(alphabet)] for i in range(n))
+    return value
+
+
+def scale_input(sample_input, n, seed=0):
+    """
+    Derive an input of size n from a test case's input.
+
+    Lists and strings are grown to length n. When the input has no sequence
+    at all, integer parameters are treated as the problem size instead.
+    """
+    rng = random.Random(seed + n)
+    has_sequence = any(isinstance(v, (list, str)) for v in sample_input.values())
+
+    scaled = {}
+    for name, value in sample_input.items():
+        if has_sequence:
+            scaled[name] = _scale_value(value, n, rng)
+        elif isinstance(value, int) and not isinstance(value, bool):
+            scaled[name] = n
+        else:
+            scaled[name] = value
+    return scaled
+
+
+def fit_complexity(sizes, times):
+    """
+    Fit t = c * f(n) for every curve in COMPLEXITY_MODELS at once.
+
+    The fit is done in log space (log t = log c + log f(n)), so every size
+    counts equally instead of the largest n dominating the residuals.
+
+    Args:
+        sizes: Input sizes n
+        times: Measured run times (any unit)
+
+    Returns:
+        Dict with estimate (e.g. "O(n log n)"), r2 of the chosen fit in log
+        space, and the log-log slope of the measurements
+    """
+    import numpy as np
+
+    n = np.asarray(sizes, dtype=float)
+    log_t = np.log(np.maximum(np.asarray(times, dtype=float), 1e-6))
+
+    # One row per model; the best log c for each row is the mean of its offsets
+    log_f = np.log(np.vstack([f(np, n) for _, f in COMPLEXITY_MODELS]))
+    offsets = log_t - log_f
+    residuals = ((offsets - offsets.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+
+    best = 0
+    for index in range(1, len(COMPLEXITY_MODELS)):
+        if residuals[index] * SIMPLER_MODEL_TOLERANCE < residuals[best]:
+            best = index
+
+    total = ((log_t - log_t.mean()) ** 2).sum()
+    r2 = 1.0 - residuals[best] / total if total > 0 else 1.0
+    exponent = np.polyfit(np.log(n), log_t, 1)[0]
+
+    return {
+        "estimate": COMPLEXITY_MODELS[best][0],
+        "r2": round(float(max(r2, 0.0)), 3),
+        "exponent": round(float(exponent), 2),
+    }
+
+
+class ComplexityProfiler:
+    """Estimates a solution's time complexity by timing it on growing inputs"""
+
+    def __init__(self, code_runner):
+        self.code_runner = code_runner
+        self.min_n = settings.COMPLEXITY_MIN_N
+        self.max_n = settings.COMPLEXITY_MAX_N
+        self.budget_seconds = settings.COMPLEXITY_BUDGET_SECONDS
+        self.reserve_seconds = settings.COMPLEXITY_RESERVE_SECONDS
+
+    def profile(self, code, test_cases, question_id=None, deadline=None):
+        """
+        Time the candidate's function on geometrically growing inputs and fit the curve.
+
+        Sizes double from COMPLEXITY_MIN_N up to COMPLEXITY_MAX_N, stopping early when
+        a run fails, hits a limit, or the overall time budget is used up. Each run's
+        wall-clock limit is cut to what is left of the budget, so a slow solution
+        can't overshoot it.
+
+        Args:
+            deadline: Deadline of the request; profiling gets what's left of it minus
+                COMPLEXITY_RESERVE_SECONDS (kept for the model's reply), at most
+                COMPLEXITY_BUDGET_SECONDS
+
+        Returns:
+            Dict with estimate, r2, exponent, sizes and times_ms, or None if fewer
+            than three sizes could be measured
+        """
+        cases = normalize_test_cases(test_cases)
+        if not code or not cases:
+            return None
+
+        cache_key = (question_id, code_fingerprint(code), test_cases_version(cases))
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        budget = self.budget_seconds
+        if deadline is not None:
+            budget = min(budget, deadline.remaining() - self.reserve_seconds)
+        if budget <= 0:
+            logger.info("Complexity profile skipped: no time left in the request budget")
+            return None
+
+        sample_input = cases[0].get("input") or {}
+        sizes, times = [], []
+        stop_at = time.monotonic() + budget
+        n = self.min_n
+
+        while n <= self.max_n and time.monotonic() < stop_at:
+            scaled = {"input": scale_input(sample_input, n), "output": None}
+            result = self.code_runner.run(
+                code, [scaled] * REPEATS, use_cache=False, wall_seconds=round(stop_at - time.monotonic(), 2)
+            )
+            if not result.get("ok") or any(r.get("error") for r in result["results"]):
+                break
+
+            sizes.append(n)
+            times.append(min(r["duration_ms"] for r in result["results"]))
+            n *= 2
+
+        if len(sizes) < 3:
+            logger.info(f"Complexity profile skipped: only {len(sizes)} sizes measured")
+            return None
+
+        analysis = fit_complexity(sizes, times)
+        analysis.update(sizes=sizes, times_ms=times)
+        analysis_cache.set(cache_key, analysis)
+
+        logger.info(
+            f"Complexity estimate {analysis['estimate']} (r2={analysis['r2']}, n up to {sizes[-1]})"
+        )
+        return analysis
+
+
+def format_complexity(analysis):
+    """Summarize a profile as one line for prompts"""
+    if not analysis:
+        return "(Not measured)"
+    return (
+        f"Empirically ~{analysis['estimate']} time "
+        f"(fit r2={analysis['r2']}, log-log slope {analysis['exponent']}, "
+        f"measured n={analysis['sizes'][0]}..{analysis['sizes'][-1]}, "
+        f"{analysis['times_ms'][-1]:.1f}ms at the largest n)"
+    )
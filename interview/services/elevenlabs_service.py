@@ -1,6 +1,12 @@
 import requests
 from django.conf import settings
+from interview.services.rate_limiter import PRIORITY_TURN, get_limiter
+from interview.services.resilience import CircuitOpen, get_breaker, get_latency_tracker
+from interview.services.usage_ledger import KIND_TTS, get_ledger
+from vode.metrics import TTS_AUDIO_BYTES, TTS_CHARACTERS, TTS_SECONDS
+from vode.tracing import span
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -11,11 +17,21 @@ class ElevenLabsService:
         self.base_url = "https://api.elevenlabs.io/v1"
         self.headers = {"xi-api-key": self.api_key}
         self.voice_id = "nPczCjzI2devNBz1zQrb"
+        self.limiter = get_limiter("elevenlabs")
+        self.breaker = get_breaker("elevenlabs")
+        self.latency = get_latency_tracker("elevenlabs")
 
-    def text_to_speech(self, text):
+    def text_to_speech(self, text, priority=PRIORITY_TURN, deadline=None):
         """
         Convert text to speech using Eleven Labs.
         Uses Brian (male) voice with natural, human-sounding settings.
+        Waits for room under the shared rate limit (characters count as tokens).
+
+        Returns b"" without calling Eleven Labs while ELEVENLABS_TTS_ENABLED is off.
+
+        The request timeout is whatever is left of `deadline`, capped at
+        TTS_TIMEOUT_SECONDS. Raises CircuitOpen instead of calling Eleven Labs
+        while it is failing; the frontend then falls back to browser speech.
         """
         endpoint = f"{self.base_url}/text-to-speech/{self.voice_id}"
 
@@ -25,19 +41,69 @@ class ElevenLabsService:
             "voice_settings": {"stability": 0.65, "similarity_boost": 0.9},
         }
 
-        # Disabling for development so we don't use up our credits too early
-        print("Disabling elevenlabs generation")
-        return b""
+        # Off unless ELEVENLABS_TTS_ENABLED, so development doesn't use up credits.
+        # Nothing is called, so nothing is metered or recorded in the usage ledger
+        if not settings.ELEVENLABS_TTS_ENABLED:
+            return b""
+
+        if deadline is not None:
+            timeout = deadline.budget(cap=settings.TTS_TIMEOUT_SECONDS)
+        else:
+            timeout = settings.TTS_TIMEOUT_SECONDS
 
+        if not self.breaker.allow():
+            raise CircuitOpen("elevenlabs circuit is open")
+
+        started = time.monotonic()
+        outcome = "error"
         try:
-            response = requests.post(
-                endpoint, headers=self.headers, json=payload, timeout=30
+            with span("tts.request", characters=len(text)) as tts_span:
+                try:
+                    with self.limiter.acquire(
+                        tokens=len(text), priority=priority, timeout=timeout
+                    ):
+                        remaining = max(0.1, timeout - (time.monotonic() - started))
+                        response = requests.post(
+                            endpoint, headers=self.headers, json=payload, timeout=remaining
+                        )
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    # 4xx means a bad request on our side, not an unhealthy provider
+                    if e.response is not None and e.response.status_code < 500:
+                        self.breaker.record_skipped()
+                    else:
+                        self.breaker.record_failure()
+                    TTS_SECONDS.labels("error").observe(time.monotonic() - started)
+                    logger.error(f"Eleven Labs error: {e}")
+                    raise
+                except requests.exceptions.RequestException as e:
+                    self.breaker.record_failure()
+                    TTS_SECONDS.labels("error").observe(time.monotonic() - started)
+                    logger.error(f"Eleven Labs error: {e}")
+                    raise
+                except Exception:
+                    self.breaker.record_skipped()
+                    raise
+
+                tts_span.set(audio_bytes=len(response.content))
+            outcome = "ok"
+        finally:
+            get_ledger().record(
+                KIND_TTS,
+                call_type="speech",
+                model=self.voice_id,
+                characters=len(text),
+                latency_ms=(time.monotonic() - started) * 1000,
+                outcome=outcome,
             )
-            response.raise_for_status()
-            return response.content  # Returns audio bytes
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Eleven Labs error: {e}")
-            raise
+
+        elapsed = time.monotonic() - started
+        self.breaker.record_success()
+        self.latency.record(elapsed)
+        TTS_SECONDS.labels("ok").observe(elapsed)
+        TTS_CHARACTERS.inc(len(text))
+        TTS_AUDIO_BYTES.inc(len(response.content))
+        return response.content  # Returns audio bytes
 
     def get_available_voices(self):
         """Get list of available voices"""
@@ -0,0 +1,171 @@
+from django.conf import settings
+import ast
+import difflib
+import time
+import zlib
+
+# Turn decisions
+SKIP = "skip"  # nothing worth saying, don't reply at all
+HINT = "hint"  # answer instantly from a template
+MODEL = "model"  # escalate to the LLM
+FALLBACK = "fallback"  # the LLM was needed but unavailable, answered locally
+
+SYNTAX_HINTS = [
+    "Quick heads-up: Python can't parse line {line} yet ({message}). Take a look at that line before we go further.",
+    "Before we dig into the logic, there's a syntax issue around line {line}: {message}.",
+]
+
+IDLE_HINTS = [
+    "Take your time. If you're stuck, try talking me through what you're thinking so far.",
+    "It's been quiet for a bit. Want to walk me through your current approach?",
+    "No rush. Sometimes it helps to work through a small example by hand. What would happen with the first example?",
+]
+
+# Used while the model is unavailable (circuit open or out of time)
+FALLBACK_REPLIES = {
+    "error": "Your code didn't run cleanly ({error}). What do you think is causing that?",
+    "failing": "You're passing {passed} of {total} test cases. Pick a failing case and trace it by hand: where does your output first go wrong?",
+    "passing": "All {total} test cases pass. Can you walk me through the time and space complexity of your approach?",
+    "untested": "Keep going, and talk me through your approach as you work.",
+}
+
+
+def _parse(code):
+    """Return (tree, None) or (None, SyntaxError)"""
+    try:
+        return ast.parse(code), None
+    except SyntaxError as e:
+        return None, e
+
+
+def _node_labels(tree):
+    """Node types in walk order, with names/constants so renames count as edits"""
+    labels = []
+    for node in ast.walk(tree):
+        detail = (
+            getattr(node, "id", None)
+            or getattr(node, "attr", None)
+            or getattr(node, "name", None)
+        )
+        if isinstance(node, ast.Constant):
+            detail = repr(node.value)
+        labels.append(f"{type(node).__name__}:{detail}" if detail else type(node).__name__)
+    return labels
+
+
+def ast_change_size(old_tree, new_tree):
+    """
+    Rough size of an edit, in AST nodes.
+
+    Formatting and comments never show up in the AST, so they count as 0;
+    changing a constant counts as 1 and adding a loop counts as several.
+    """
+    old_nodes = _node_labels(old_tree) if old_tree else []
+    new_nodes = _node_labels(new_tree)
+    matcher = difflib.SequenceMatcher(a=old_nodes, b=new_nodes, autojunk=False)
+
+    changed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            changed += max(i2 - i1, j2 - j1)
+    return changed
+
+
+def _pick(templates, seed):
+    """Deterministic template choice (str hash() is salted per process)"""
+    return templates[zlib.crc32(repr(seed).encode()) % len(templates)]
+
+
+def fallback_reply(test_results):
+    """Coaching line built from the test run alone, for when the model can't be reached"""
+    if not test_results:
+        return FALLBACK_REPLIES["untested"]
+    if not test_results.get("ok"):
+        return FALLBACK_REPLIES["error"].format(error=test_results.get("error") or "unknown error")
+    if test_results["passed"] < test_results["total"]:
+        return FALLBACK_REPLIES["failing"].format(**test_results)
+    return FALLBACK_REPLIES["passing"].format(**test_results)
+
+
+class TurnClassifier:
+    """
+    Decides, before any model call, whether a get_response turn needs the LLM.
+
+    Uses the interview's session dict to remember the previous snapshot:
+    - last_tree: AST of the last code that parsed
+    - last_error: (line, message) of the last syntax error seen, if any
+    - last_change_at: time.monotonic() of the last meaningful code change
+    - hinted: key of the last templated hint, so it's never repeated back to back
+    """
+
+    def __init__(self):
+        self.enabled = settings.FAST_PATH_ENABLED
+        self.min_ast_change = settings.FAST_PATH_MIN_AST_CHANGE
+        self.idle_nudge_seconds = settings.FAST_PATH_IDLE_NUDGE_SECONDS
+
+    def classify(self, code, transcript, session, now=None):
+        """
+        Args:
+            code: Current editor contents
+            transcript: What the candidate said/typed this turn
+            session: Per-interview state dict (updated in place)
+            now: time.monotonic() override for tests/benchmarks
+
+        Returns:
+            Dict with action (SKIP, HINT or MODEL), reason, and reply (for HINT)
+        """
+        now = time.monotonic() if now is None else now
+        session.setdefault("last_change_at", now)
+
+        if not self.enabled:
+            return {"action": MODEL, "reason": "fast path disabled", "reply": ""}
+
+        # The candidate said something: always worth a real answer
+        if transcript and transcript.strip():
+            session["last_change_at"] = now
+            self._remember(code, session)
+            return {"action": MODEL, "reason": "candidate spoke", "reply": ""}
+
+        if not code or not code.strip():
+            return {"action": SKIP, "reason": "empty", "reply": ""}
+
+        tree, error = _parse(code)
+
+        if error is not None:
+            current = (error.lineno, error.msg)
+            previous = session.get("last_error")
+            session["last_error"] = current
+            session["last_change_at"] = now
+
+            # A fresh syntax error is usually just an edit in progress
+            if previous != current or session.get("hinted") == ("syntax", current):
+                return {"action": SKIP, "reason": "syntax error (in progress)", "reply": ""}
+
+            session["hinted"] = ("syntax", current)
+            reply = _pick(SYNTAX_HINTS, current).format(line=error.lineno, message=error.msg)
+            return {"action": HINT, "reason": "persistent syntax error", "reply": reply}
+
+        session["last_error"] = None
+        previous_tree = session.get("last_tree")
+        change = ast_change_size(previous_tree, tree)
+
+        if change == 0:
+            idle = now - session["last_change_at"]
+            idle_key = ("idle", session["last_change_at"])
+            if idle >= self.idle_nudge_seconds and session.get("hinted") != idle_key:
+                session["hinted"] = idle_key
+                reply = _pick(IDLE_HINTS, idle_key)
+                return {"action": HINT, "reason": f"idle for {int(idle)}s", "reply": reply}
+            return {"action": SKIP, "reason": "unchanged apart from formatting", "reply": ""}
+
+        if previous_tree is not None and change < self.min_ast_change:
+            return {"action": SKIP, "reason": f"minor edit ({change} AST nodes)", "reply": ""}
+
+        session["last_tree"] = tree
+        session["last_change_at"] = now
+        return {"action": MODEL, "reason": f"code changed ({change} AST nodes)", "reply": ""}
+
+    def _remember(self, code, session):
+        tree, _ = _parse(code or "")
+        if tree is not None:
+            session["last_tree"] = tree
@@ -1,73 +1,390 @@
-import google.generativeai as genai
 from django.conf import settings
-from interview.mocks import QUESTION_GENERATION_PROMPT
-import json
+from interview.mocks import QUESTION_BATCH_GENERATION_PROMPT
+from interview.services.llm_providers import contents_text, get_provider
+from interview.services.rate_limiter import (
+    PRIORITY_QUESTION,
+    PRIORITY_SCORE,
+    PRIORITY_TURN,
+    RateLimitExceeded,
+    get_limiter,
+)
+from interview.services.model_router import (
+    CALL_QUESTION,
+    CALL_SCORE,
+    CALL_TURN,
+    breaker_name,
+    get_router,
+)
+from interview.services.resilience import (
+    CircuitOpen,
+    failure_reason,
+    get_breaker,
+    get_latency_tracker,
+    hedged_call,
+)
+from interview.services.usage_ledger import KIND_MODEL, get_ledger
+from vode.metrics import FALLBACKS, MODEL_CALL_SECONDS, MODEL_TOKENS
+from vode.tracing import record_span, span
+from interview.services.structured_output import (
+    SCORE_SCHEMA,
+    JsonStreamParser,
+    repair_json,
+    title_key,
+    validate_question,
+    validate_score,
+)
 import logging
+import math
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Model calls allowed per batch of questions before giving up when titles keep colliding
+MAX_QUESTION_ATTEMPTS = 3
+
+
+# Rate limiter priority per call type
+CALL_PRIORITIES = {
+    CALL_TURN: PRIORITY_TURN,
+    CALL_QUESTION: PRIORITY_QUESTION,
+    CALL_SCORE: PRIORITY_SCORE,
+}
+
 
 class GeminiService:
-    def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel("gemini-2.0-flash-lite")
-        self.conversation_history = []
+    def __init__(self, provider=None):
+        # Backend is pluggable (settings.LLM_PROVIDER): "gemini" or the local "fake"
+        self.provider = provider or get_provider()
+        # Model per call comes from the routing table (settings.LLM_ROUTES)
+        self.router = get_router(self.provider.name)
+        self.limiter = get_limiter("gemini")
+        # One conversation per interview id: the orchestrator's service is shared by
+        # every interview this process is running
+        self.conversations = {}
+        self._conversations_lock = threading.Lock()
+
+    def history(self, interview_id):
+        """An interview's conversation (a new, empty one if it hasn't started)"""
+        with self._conversations_lock:
+            return self.conversations.setdefault(interview_id, [])
+
+    def interview_ids(self):
+        """Ids of the interviews with a conversation"""
+        with self._conversations_lock:
+            return set(self.conversations)
+
+    def _generate(self, contents, call_type, deadline=None, response_format=None):
+        """
+        Call the best available model for `call_type`, once there is room under
+        the shared rate limit. If a model fails, the next one in the route is
+        tried with whatever time is left.
 
-    def get_question(self, context):
+        Args:
+            contents: Prompt string or conversation history
+            call_type: CALL_TURN, CALL_QUESTION or CALL_SCORE
+                (live turns also get hedged)
+            deadline: Request Deadline; the call gets what's left of it minus
+                TTS_RESERVE_SECONDS (LLM_TIMEOUT_SECONDS when there is none)
+            response_format: None, "json" or a response schema dict
+
+        Raises:
+            CircuitOpen: If every model for this call type is failing
+            DeadlineExceeded: If the call did not finish within its budget
         """
-        Generates a coding interview question using Gemini AI.
+        if deadline is not None:
+            timeout = deadline.budget(
+                cap=settings.LLM_TIMEOUT_SECONDS, reserve=settings.TTS_RESERVE_SECONDS
+            )
+        else:
+            timeout = settings.LLM_TIMEOUT_SECONDS
+
+        # An abandoned attempt may still be reading the history after we return
+        if isinstance(contents, list):
+            contents = list(contents)
+
+        priority = CALL_PRIORITIES[call_type]
+        # ~4 chars per token for the prompt, plus headroom for the reply
+        prompt_chars = len(contents_text(contents))
+        estimated_tokens = prompt_chars // 4 + 512
+        started = time.monotonic()
+        last_error = None
+
+        for model in self.router.candidates(call_type):
+            name = breaker_name(self.provider.name, model)
+            breaker = get_breaker(name)
+            latency = get_latency_tracker(name)
+
+            budget = timeout - (time.monotonic() - started)
+            if budget <= 0:
+                break
+            if not breaker.allow():
+                continue
+
+            attempt_started = time.monotonic()
+
+            def attempt(model=model, budget=budget):
+                # Every attempt is billed, including hedges that lose the race
+                response = None
+                outcome = "error"
+                try:
+                    with span(
+                        "llm.generate", call_type=call_type, model=model, prompt_chars=prompt_chars
+                    ) as call_span:
+                        remaining = max(0.1, budget - (time.monotonic() - attempt_started))
+                        with self.limiter.acquire(
+                            tokens=estimated_tokens, priority=priority, timeout=remaining
+                        ):
+                            call_span.set(queued_ms=round((time.monotonic() - attempt_started) * 1000, 3))
+                            remaining = max(0.1, budget - (time.monotonic() - attempt_started))
+                            response = self.provider.generate(
+                                contents,
+                                model=model,
+                                timeout=remaining,
+                                response_format=response_format,
+                            )
+                        call_span.set(
+                            input_tokens=response.input_tokens,
+                            output_tokens=response.output_tokens,
+                            response_chars=len(response.text or ""),
+                        )
+                        MODEL_TOKENS.labels(call_type, model, "input").inc(response.input_tokens)
+                        MODEL_TOKENS.labels(call_type, model, "output").inc(response.output_tokens)
+                        outcome = "ok"
+                        return response
+                except RateLimitExceeded:
+                    outcome = "rate_limited"
+                    raise
+                finally:
+                    get_ledger().record(
+                        KIND_MODEL,
+                        call_type=call_type,
+                        model=model,
+                        input_tokens=response.input_tokens if response else 0,
+                        output_tokens=response.output_tokens if response else 0,
+                        latency_ms=(time.monotonic() - attempt_started) * 1000,
+                        outcome=outcome,
+                    )
+
+            # Only live turns are worth paying for a duplicate request
+            hedge_after = None
+            if settings.LLM_HEDGE_ENABLED and call_type == CALL_TURN:
+                hedge_after = latency.percentile(settings.LLM_HEDGE_PERCENTILE)
+
+            try:
+                response = hedged_call(attempt, budget, hedge_after=hedge_after)
+            except RateLimitExceeded:
+                # Our own throttling, not a sign that the provider is unhealthy
+                breaker.record_skipped()
+                MODEL_CALL_SECONDS.labels(call_type, model, "rate_limited").observe(
+                    time.monotonic() - attempt_started
+                )
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                MODEL_CALL_SECONDS.labels(call_type, model, "error").observe(
+                    time.monotonic() - attempt_started
+                )
+                last_error = e
+                logger.warning(f"{model} failed for {call_type} call: {e}")
+                continue
+
+            elapsed = time.monotonic() - attempt_started
+            MODEL_CALL_SECONDS.labels(call_type, model, "ok").observe(elapsed)
+            breaker.record_success()
+            latency.record(elapsed)
+            self.router.record(call_type, model, elapsed)
+            return response
+
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpen(f"No healthy model for {call_type} calls")
+
+    def _stream(self, contents, call_type, response_format=None):
         """
-        try:
-            # Format the prompt with context
-            prompt = QUESTION_GENERATION_PROMPT % context
+        Stream a completion as text chunks.
 
-            logger.info(
-                f"Generating question for difficulty={context.get('difficulty')}, topics={context.get('topics')}"
-            )
+        Same routing, rate limiting and circuit breaking as _generate(), but
+        never hedged (callers may stop reading early, which closes the stream),
+        and a failing model is only swapped out before its first chunk.
+        """
+        timeout = settings.LLM_TIMEOUT_SECONDS
+        priority = CALL_PRIORITIES[call_type]
+        prompt_chars = len(contents_text(contents))
+        estimated_tokens = prompt_chars // 4 + 512
+        last_error = None
+
+        for model in self.router.candidates(call_type):
+            breaker = get_breaker(breaker_name(self.provider.name, model))
+            if not breaker.allow():
+                continue
+
+            started = time.monotonic()
+            span_started = time.time_ns()
+            first_chunk_at = None
+            streamed_chars = 0
+            outcome = "ok"
+            try:
+                with self.limiter.acquire(
+                    tokens=estimated_tokens, priority=priority, timeout=timeout
+                ):
+                    for chunk in self.provider.stream(
+                        contents,
+                        model=model,
+                        timeout=timeout,
+                        response_format=response_format,
+                    ):
+                        if first_chunk_at is None:
+                            first_chunk_at = time.monotonic()
+                            # Time to first chunk is what the caller waits on
+                            self.router.record(call_type, model, first_chunk_at - started)
+                        streamed_chars += len(chunk)
+                        yield chunk
+            except RateLimitExceeded:
+                outcome = "rate_limited"
+                breaker.record_skipped()
+                raise
+            except GeneratorExit:
+                # Caller stopped early; the model was answering fine
+                outcome = "abandoned"
+                breaker.record_success()
+                raise
+            except Exception as e:
+                outcome = "error"
+                breaker.record_failure()
+                if first_chunk_at is not None:
+                    raise
+                last_error = e
+                logger.warning(f"{model} failed for {call_type} call: {e}")
+                continue
+            finally:
+                # Recorded afterwards: a span can't stay open across yields to the caller
+                record_span(
+                    "llm.stream",
+                    span_started,
+                    call_type=call_type,
+                    model=model,
+                    prompt_chars=prompt_chars,
+                    response_chars=streamed_chars,
+                    first_chunk_ms=(
+                        round((first_chunk_at - started) * 1000, 3) if first_chunk_at else None
+                    ),
+                    outcome=outcome,
+                )
+                MODEL_CALL_SECONDS.labels(call_type, model, outcome).observe(
+                    time.monotonic() - started
+                )
+                # Streams don't report usage; estimate ~4 chars per token like the limiter
+                get_ledger().record(
+                    KIND_MODEL,
+                    call_type=call_type,
+                    model=model,
+                    input_tokens=prompt_chars // 4,
+                    output_tokens=streamed_chars // 4,
+                    latency_ms=(time.monotonic() - started) * 1000,
+                    outcome=outcome,
+                )
 
-            # Generate question using Gemini
-            response = self.model.generate_content(prompt)
-            response_text = response.text
+            breaker.record_success()
+            return
 
-            logger.info(
-                f"Question generation response received: {len(response_text)} characters"
-            )
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpen(f"No healthy model for {call_type} calls")
 
-            # Extract JSON from response
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
+    def get_questions(self, context, count, title_taken=None):
+        """
+        Generates `count` distinct questions, up to QUESTION_BATCH_SIZE per model call,
+        so the long question prompt is paid once per batch instead of once per question.
 
-            if json_start == -1 or json_end == 0:
-                logger.error(f"Could not find JSON in response: {response_text[:200]}")
-                raise ValueError("Invalid response format from Gemini")
+        The model returns a JSON array, which is streamed and checked item by item:
+        each question is validated (and repaired) on its own, and invalid ones or
+        duplicates (within the batch, of already_picked, or per `title_taken`) are
+        dropped without losing the rest. Shortfalls are requested again with
+        everything seen so far excluded.
 
-            json_str = response_text[json_start:json_end]
+        Args:
+            context: Dict with difficulty, topics and already_picked for the prompt
+            count: Number of questions wanted
+            title_taken: Optional callable(title) -> bool for titles already in use
 
-            # Parse JSON
-            question_data = json.loads(json_str)
+        Returns:
+            List of question dicts (title, statement, test_cases); shorter than
+            `count` only if the model kept repeating itself
+        """
+        context = dict(context)
+        already_picked = context.get("already_picked")
+        excluded = [] if already_picked in (None, "", "None") else [already_picked]
+        seen = {title_key(title) for title in (already_picked or "").split(", ") if title}
+        questions = []
+        rejected = []
+        invalid = 0
+
+        def accept(item):
+            nonlocal invalid
+            if not isinstance(item, dict):
+                invalid += 1
+                return
+            try:
+                question, repairs = validate_question(item)
+            except ValueError as e:
+                logger.warning(f"Dropped generated question: {e}")
+                invalid += 1
+                return
+            key = title_key(question["title"])
+            if key in seen or (title_taken and title_taken(question["title"])):
+                logger.info(f"Dropped duplicate question '{question['title']}'")
+                rejected.append(question["title"])
+                return
+            if repairs:
+                logger.info(f"Repaired generated question: {', '.join(repairs)}")
+            seen.add(key)
+            questions.append(question)
+
+        max_calls = math.ceil(count / settings.QUESTION_BATCH_SIZE) + MAX_QUESTION_ATTEMPTS - 1
+        calls = 0
 
-            # Validate required fields
-            if (
-                "title" not in question_data
-                or "statement" not in question_data
-                or "test_cases" not in question_data
-            ):
-                logger.error(
-                    f"Missing required fields in question data: {question_data.keys()}"
+        try:
+            while len(questions) < count and calls < max_calls:
+                calls += 1
+                context["count"] = min(settings.QUESTION_BATCH_SIZE, count - len(questions))
+                context["already_picked"] = (
+                    ", ".join(excluded + [q["title"] for q in questions] + rejected) or "None"
                 )
-                raise ValueError("Incomplete question data from Gemini")
+                prompt = QUESTION_BATCH_GENERATION_PROMPT % context
 
-            logger.info(f"Successfully generated question: {question_data['title']}")
+                logger.info(
+                    f"Generating {context['count']} questions for difficulty={context.get('difficulty')}, topics={context.get('topics')}"
+                )
 
-            return question_data
+                parser = JsonStreamParser()
+                stream = self._stream(prompt, CALL_QUESTION, response_format="json")
+                try:
+                    for chunk in stream:
+                        for _, item in parser.feed(chunk):
+                            if parser.is_array and len(questions) < count:
+                                accept(item)
+                        if parser.done or len(questions) >= count:
+                            break
+                finally:
+                    stream.close()
+
+                invalid += len(parser.errors)
+                if not parser.is_array:
+                    # The model wrapped the array in an object ({"questions": [...]})
+                    data = parser.fields if parser.done else repair_json(parser.text)
+                    items = next((v for v in data.values() if isinstance(v, list)), [])
+                    for item in items[: count - len(questions)]:
+                        accept(item)
 
-        except json.JSONDecodeError as e:
-            logger.error(
-                f"JSON parse error generating question: {e}. Raw response: {response_text[:500]}"
+            logger.info(
+                f"Generated {len(questions)}/{count} questions in {calls} calls "
+                f"({len(rejected)} duplicates, {invalid} invalid)"
             )
-            raise ValueError(f"Failed to parse question JSON: {e}")
+            return questions
+
         except Exception as e:
-            logger.error(f"Error generating question: {e}", exc_info=True)
+            logger.error(f"Error generating questions: {e}", exc_info=True)
             raise
 
     def initialize_context(self, question_data, interview_context):
@@ -77,7 +394,7 @@ class GeminiService:
 
         Args:
             question_data: The question details (title, statement, examples, constraints)
-            interview_context: Interview metadata (role, difficulty)
+            interview_context: Interview metadata (role, difficulty, interview_id)
         """
         context_prompt = f"""
 You are a professional AI coding interviewer designed to conduct standardized, fair, and consistent technical interviews for software engineering candidates.
@@ -127,8 +444,8 @@ COMMUNICATION STYLE:
 You will now evaluate the candidate's submission and provide interview feedback based on these principles.
         """
 
-        # Initialize conversation history with context
-        self.conversation_history = [
+        # Initialize conversation history with context (a reloaded page starts over)
+        conversation = [
             {"role": "user", "parts": [{"text": context_prompt}]},
             {
                 "role": "model",
@@ -139,28 +456,12 @@ You will now evaluate the candidate's submission and provide interview feedback
                 ],
             },
         ]
+        with self._conversations_lock:
+            self.conversations[interview_context.get("interview_id")] = conversation
 
-    def agent_reasoning(self, candidate_code, audio_transcript, interview_context):
-        """
-        AI agent that reasons on the spot about candidate's submission.
-        Takes code, audio transcript, and interview context to provide intelligent feedback.
-        Uses conversation history to maintain context across all exchanges.
-
-        This single method handles:
-        - Code submissions
-        - Code updates
-        - Questions from candidate
-        - Follow-ups (via conversation history)
-
-        Args:
-            candidate_code: Code from editor (may be empty if just asking a question)
-            audio_transcript: Audio/voice transcript of candidate's explanation
-            interview_context: Dict with interview details (used as context reference)
-
-        Returns:
-            Agent response with reasoning and feedback
-        """
-        submission_prompt = f"""
+    def _submission_prompt(self, candidate_code, audio_transcript, test_results, complexity):
+        """Prompt for one candidate turn (shared by live turns and transcript replay)"""
+        return f"""
         CANDIDATE'S CURRENT INPUT:
         
         Code:
@@ -168,14 +469,20 @@ You will now evaluate the candidate's submission and provide interview feedback
 
         Candidate's Statement (from voice/text):
         "{audio_transcript or '(No statement provided)'}"
+
+        Test Results (code was executed against the test cases):
+        {test_results or '(Tests not run)'}
+
+        Measured Complexity (timed on growing inputs):
+        {complexity or '(Not measured)'}
         
         ANALYZE AND RESPOND:
         Evaluate this by considering:
-        1. **Correctness**: Does the code solve the problem? Test against examples.
+        1. **Correctness**: Does the code solve the problem? Use the test results above; do not reveal hidden test inputs.
         2. **Approach**: What strategy are they using? Efficient?
         3. **Understanding**: Does their explanation match their code?
         4. **Edge Cases**: Handling all constraints?
-        5. **Trade-offs**: Time vs space complexity considerations?
+        5. **Trade-offs**: Time vs space complexity considerations? Compare their claims with the measured complexity.
         
         PROVIDE COACHING FEEDBACK:
         - Acknowledge what they're doing well
@@ -187,18 +494,56 @@ You will now evaluate the candidate's submission and provide interview feedback
         Keep response conversational and actionable (1 - 3 sentences max).
         """
 
+    def agent_reasoning(
+        self,
+        candidate_code,
+        audio_transcript,
+        interview_context,
+        test_results=None,
+        complexity=None,
+        deadline=None,
+    ):
+        """
+        AI agent that reasons on the spot about candidate's submission.
+        Takes code, audio transcript, and interview context to provide intelligent feedback.
+        Uses conversation history to maintain context across all exchanges.
+
+        This single method handles:
+        - Code submissions
+        - Code updates
+        - Questions from candidate
+        - Follow-ups (via conversation history)
+
+        Args:
+            candidate_code: Code from editor (may be empty if just asking a question)
+            audio_transcript: Audio/voice transcript of candidate's explanation
+            interview_context: Dict with interview details; its interview_id picks the conversation
+            test_results: Plain-text summary of the sandboxed test run (optional)
+            complexity: Plain-text empirical complexity estimate (optional)
+            deadline: Deadline of the request this turn is answering (optional)
+
+        Returns:
+            Agent response with reasoning and feedback
+        """
+        submission_prompt = self._submission_prompt(
+            candidate_code, audio_transcript, test_results, complexity
+        )
+        conversation = self.history(interview_context.get("interview_id"))
+
         try:
             # Add the submission to conversation history
-            self.conversation_history.append(
+            conversation.append(
                 {"role": "user", "parts": [{"text": submission_prompt}]}
             )
 
             # Get response using conversation history
-            response = self.model.generate_content(self.conversation_history)
+            response = self._generate(
+                conversation, CALL_TURN, deadline=deadline
+            )
             feedback = response.text
 
             # Add response to history for continuity
-            self.conversation_history.append(
+            conversation.append(
                 {"role": "model", "parts": [{"text": feedback}]}
             )
 
@@ -207,11 +552,38 @@ You will now evaluate the candidate's submission and provide interview feedback
             logger.error(f"Gemini agent reasoning error: {e}")
             raise
 
-    def clear_context(self):
-        """Clear conversation history between interviews"""
-        self.conversation_history.clear()
+    def replay_turns(self, turns, interview_id=None):
+        """
+        Rebuild an interview's conversation from its stored transcript (Interview.transcript),
+        without calling the model. Call initialize_context() first.
+        """
+        conversation = self.history(interview_id)
+        for turn in turns:
+            prompt = self._submission_prompt(
+                turn.get("code"),
+                turn.get("statement"),
+                turn.get("test_results"),
+                turn.get("complexity"),
+            )
+            conversation.append({"role": "user", "parts": [{"text": prompt}]})
+            if turn.get("reply"):
+                conversation.append(
+                    {"role": "model", "parts": [{"text": turn["reply"]}]}
+                )
+
+    def clear_context(self, interview_id=None):
+        """
+        Drop an interview's conversation once it has ended.
+
+        Returns:
+            Whether there was one
+        """
+        with self._conversations_lock:
+            return self.conversations.pop(interview_id, None) is not None
 
-    def score_interview(self, success_metrics_list):
+    def score_interview(
+        self, success_metrics_list, complexity=None, raise_errors=False, deadline=None, interview_id=None
+    ):
         """
         Analyze the entire interview conversation and generate:
         - Score (0-100) based on provided metrics
@@ -219,14 +591,24 @@ You will now evaluate the candidate's submission and provide interview feedback
 
         Args:
             success_metrics_list: List of metrics set by SWE (e.g., ['correctness', 'code efficiency', 'communication'])
+            complexity: Empirical complexity of the final passing solution (optional)
+            raise_errors: Raise instead of returning the default score (batch re-scoring
+                must not overwrite a real score with a placeholder)
+            deadline: Deadline of the request ending the interview (optional)
+            interview_id: Whose conversation to score
 
         Returns:
             Dict with:
             - score: Integer 0-100 (always returns a valid score, never None)
             - feedback: String with structured feedback (25-35% what went well, rest improvements)
         """
-        if not self.conversation_history:
-            logger.warning("No conversation history available for scoring")
+        with self._conversations_lock:
+            conversation = self.conversations.get(interview_id)
+        if not conversation:
+            logger.warning(f"No conversation history available for scoring interview {interview_id}")
+            if raise_errors:
+                raise ValueError("No conversation history available for scoring")
+            FALLBACKS.labels("score", "no_history").inc()
             return {
                 "score": 50,
                 "feedback": "Interview completed. Unable to generate detailed feedback at this time.",
@@ -244,6 +626,9 @@ Based on the entire interview conversation history above, please evaluate the ca
 EVALUATION METRICS:
 {metrics_str}
 
+MEASURED COMPLEXITY OF THE FINAL PASSING SOLUTION:
+{complexity or 'Not measured (no solution passed all test cases)'}
+
 SCORING REQUIREMENTS:
 1. Provide a score between 0-100 indicating overall performance
 2. Generate structured feedback with:
@@ -263,63 +648,52 @@ Provide ONLY valid JSON, no other text.
 
         try:
             # Add scoring prompt to conversation history
-            self.conversation_history.append(
+            conversation.append(
                 {"role": "user", "parts": [{"text": scoring_prompt}]}
             )
 
-            # Get response using conversation history
-            response = self.model.generate_content(self.conversation_history)
+            # Get response using conversation history (constrained to SCORE_SCHEMA)
+            response = self._generate(
+                conversation, CALL_SCORE, deadline=deadline, response_format=SCORE_SCHEMA
+            )
             response_text = response.text
 
             logger.info(f"Scoring response received: {len(response_text)} characters")
 
-            import json
-
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-
-            if json_start == -1 or json_end == 0:
-                logger.error(f"Could not find JSON in response: {response_text[:200]}")
+            try:
+                data = repair_json(response_text)
+            except ValueError as je:
+                logger.error(f"JSON parse error: {je}")
+                if raise_errors:
+                    raise
+                FALLBACKS.labels("score", "unparseable").inc()
                 return {
                     "score": 50,
                     "feedback": "Interview completed. Feedback will be provided shortly.",
                 }
 
-            json_str = response_text[json_start:json_end]
-
+            # Coerce rather than discard: a stringly score or list feedback is still usable
             try:
-                result = json.loads(json_str)
-            except json.JSONDecodeError as je:
-                logger.error(f"JSON parse error: {je}. Raw JSON: {json_str[:200]}")
+                result, repairs = validate_score(data)
+            except ValueError as ve:
+                logger.error(f"Invalid scoring response: {ve}")
+                if raise_errors:
+                    raise
+                FALLBACKS.labels("score", "invalid_score").inc()
                 return {
                     "score": 50,
                     "feedback": "Interview completed. Feedback will be provided shortly.",
                 }
+            if repairs:
+                logger.info(f"Repaired scoring response: {', '.join(repairs)}")
 
-            # Safely extract and validate score
-            score = result.get("score")
-
-            if score is None:
-                logger.warning("Score is None in response")
-                score = 50
-            else:
-                try:
-                    score = int(score)
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Could not convert score to int: {score}, error: {e}")
-                    score = 50
-
-            # Ensure score is in valid range [0, 100]
-            score = max(0, min(100, score))
-
-            feedback = result.get("feedback", "Interview completed.")
-            if not feedback:
-                feedback = "Interview completed successfully."
-
-            logger.info(f"Interview scored: {score}/100")
-            return {"score": score, "feedback": feedback}
+            logger.info(f"Interview scored: {result['score']}/100")
+            return result
         except Exception as e:
             logger.error(f"Error scoring interview: {e}", exc_info=True)
+            if raise_errors:
+                raise
+            FALLBACKS.labels("score", failure_reason(e)).inc()
             return {
                 "score": 50,
                 "feedback": "Interview completed. Unable to generate detailed feedback at this time.",
@@ -1,10 +1,20 @@
 from interview.services.gemini_service import GeminiService
 from interview.services.elevenlabs_service import ElevenLabsService
+from interview.services.code_runner import CodeRunner, format_test_results
+from interview.services.complexity import ComplexityProfiler, format_complexity
+from interview.services.fast_path import FALLBACK, MODEL, TurnClassifier, fallback_reply
+from interview.services.resilience import CircuitOpen, DeadlineExceeded, failure_reason
+from django.utils import timezone
+from vode.metrics import FALLBACKS, LIVE_INTERVIEWS, TURNS
+from vode.tracing import span
 import logging
 import base64
+import threading
 
 logger = logging.getLogger(__name__)
 
+CLOSING_MESSAGE = "Thanks for your time today. That's the end of the interview; your recruiter will be in touch."
+
 
 class InterviewOrchestrator:
     """Orchestrates the interview flow with AI agent reasoning"""
@@ -12,6 +22,11 @@ class InterviewOrchestrator:
     def __init__(self):
         self.gemini = GeminiService()
         self.elevenlabs = ElevenLabsService()
+        self.code_runner = CodeRunner()
+        self.complexity = ComplexityProfiler(self.code_runner)
+        self.classifier = TurnClassifier()
+        # Per-interview state, keyed by interview id
+        self.sessions = {}
 
     def start_interview(self, question_data, interview_context):
         """
@@ -20,7 +35,7 @@ class InterviewOrchestrator:
 
         Args:
             question_data: Dict with title, statement, test_cases from actual Question
-            interview_context: Dict with role, difficulty
+            interview_context: Dict with role, difficulty, interview_id
 
         Returns:
             Dict with success status
@@ -33,7 +48,9 @@ class InterviewOrchestrator:
             logger.error(f"Error starting interview: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_ai_response(self, candidate_code, audio_transcript, interview_context):
+    def get_ai_response(
+        self, candidate_code, audio_transcript, interview_context, deadline=None
+    ):
         """
         AI agent evaluates continuous code + audio transcript updates.
         Frontend sends these intermittently.
@@ -48,13 +65,17 @@ class InterviewOrchestrator:
         Args:
             candidate_code: Current code from editor (may be partial or empty)
             audio_transcript: Current audio transcript (may be partial or empty)
-            interview_context: Interview metadata
+            interview_context: Interview metadata (may include the question's test_cases)
+            deadline: Deadline of the HTTP request; model and speech calls share it
 
         Returns:
-            Dict with audio bytes, reasoning, and success status
+            Dict with audio bytes, reasoning, test results, fast_path decision,
+            the turn to store in the transcript (model turns only), measured
+            complexity, and success status
         """
         reasoning = ""
         audio = b""
+        test_results = None
 
         try:
             if not candidate_code and not audio_transcript:
@@ -65,24 +86,110 @@ class InterviewOrchestrator:
                     "audio": b"",
                 }
 
+            session = self.sessions.setdefault(interview_context.get("interview_id"), {})
+            LIVE_INTERVIEWS.set(len(self.sessions))
+
+            # Trivial states (unparseable, unchanged, idle) are answered locally
+            with span("turn.classify") as classify_span:
+                decision = self.classifier.classify(candidate_code, audio_transcript, session)
+                classify_span.set(action=decision["action"])
+
+            # Tests run on every turn, fast path or not: runs are cheap and cached,
+            # and a one-character fix (`<` to `<=`) deserves feedback right away
+            test_results = self._run_tests(candidate_code, interview_context)
+
+            if decision["action"] != MODEL:
+                logger.info(f"Fast path {decision['action']}: {decision['reason']}")
+                TURNS.labels(decision["action"]).inc()
+                return {
+                    "audio": b"",
+                    "reasoning": decision["reply"],
+                    "test_results": test_results,
+                    "fast_path": decision["action"],
+                    "success": True,
+                }
+
+            # Once every test passes, measure how the solution scales
+            complexity = None
+            try:
+                if (
+                    test_results
+                    and test_results["ok"]
+                    and test_results["passed"] == test_results["total"]
+                ):
+                    with span("code.complexity"):
+                        complexity = self.complexity.profile(
+                            candidate_code,
+                            interview_context["test_cases"],
+                            question_id=interview_context.get("question_id"),
+                            deadline=deadline,
+                        )
+                    if complexity:
+                        session["complexity"] = complexity
+            except Exception as profile_error:
+                logger.error(f"Error profiling candidate code: {profile_error}")
+
+            test_summary = format_test_results(test_results) if test_results else None
+            complexity_summary = format_complexity(complexity) if complexity else None
+
             # Try to get reasoning from Gemini
+            fast_path = MODEL
             try:
-                reasoning = self.gemini.agent_reasoning(
-                    candidate_code, audio_transcript, interview_context
-                )
+                with span("turn.reasoning") as reasoning_span:
+                    reasoning = self.gemini.agent_reasoning(
+                        candidate_code,
+                        audio_transcript,
+                        interview_context,
+                        test_results=test_summary,
+                        complexity=complexity_summary,
+                        deadline=deadline,
+                    )
+                    reasoning_span.set(reply_chars=len(reasoning or ""))
+            except (CircuitOpen, DeadlineExceeded) as unavailable:
+                # Answer from the test run instead of keeping the candidate waiting
+                logger.warning(f"Gemini unavailable, using local fallback: {unavailable}")
+                reasoning = fallback_reply(test_results)
+                fast_path = FALLBACK
+                FALLBACKS.labels("reasoning", failure_reason(unavailable)).inc()
             except Exception as gemini_error:
                 logger.error(f"Error getting Gemini reasoning: {gemini_error}")
                 reasoning = "I'm having trouble analyzing your submission right now. Please continue working and try again."
+                fast_path = FALLBACK
+                FALLBACKS.labels("reasoning", "error").inc()
+            TURNS.labels(fast_path).inc()
 
             # Try to convert reasoning to speech (separate try block)
             try:
                 if reasoning:
-                    audio = self.elevenlabs.text_to_speech(reasoning)
+                    with span("turn.speech"):
+                        audio = self.elevenlabs.text_to_speech(reasoning, deadline=deadline)
+            except (CircuitOpen, DeadlineExceeded) as audio_unavailable:
+                logger.warning(f"Skipping speech: {audio_unavailable}")
+                audio = b""
+                FALLBACKS.labels("speech", failure_reason(audio_unavailable)).inc()
             except Exception as audio_error:
                 logger.error(f"Error generating audio: {audio_error}")
                 audio = b""  # Empty audio if TTS fails
+                FALLBACKS.labels("speech", "error").inc()
 
-            return {"audio": audio, "reasoning": reasoning, "success": True}
+            return {
+                "audio": audio,
+                "reasoning": reasoning,
+                "test_results": test_results,
+                "fast_path": fast_path,
+                # Stored on the Interview so the turn can be replayed when re-scoring
+                "turn": {
+                    "at": timezone.now().isoformat(),
+                    "code": candidate_code,
+                    "statement": audio_transcript,
+                    "test_results": test_summary,
+                    "complexity": complexity_summary,
+                    "reply": reasoning,
+                    "source": fast_path,
+                },
+                "complexity": complexity,
+                "success": True,
+            }
         except Exception as e:
             logger.error(f"Error evaluating submission: {e}")
             return {
@@ -94,9 +201,27 @@ class InterviewOrchestrator:
                     else "An error occurred processing your submission."
                 ),
                 "audio": audio,
+                "test_results": test_results,
             }
 
-    def end_interview(self, success_metrics_list=None):
+    def _run_tests(self, candidate_code, interview_context):
+        """Run the code against the question's test cases; None if there's nothing to run or it failed"""
+        if not candidate_code or not interview_context.get("test_cases"):
+            return None
+        try:
+            with span("code.run", code_chars=len(candidate_code)) as run_span:
+                test_results = self.code_runner.run(
+                    candidate_code,
+                    interview_context["test_cases"],
+                    question_id=interview_context.get("question_id"),
+                )
+                run_span.set(passed=test_results.get("passed"), total=test_results.get("total"))
+            return test_results
+        except Exception as runner_error:
+            logger.error(f"Error running candidate code: {runner_error}")
+            return None
+
+    def end_interview(self, success_metrics_list=None, interview_id=None, deadline=None):
         """
         Generate end-of-interview score, feedback, and closing message.
         Called when interview timer runs out or candidate completes interview.
@@ -104,12 +229,14 @@ class InterviewOrchestrator:
         Args:
             success_metrics_list: List of metrics (e.g., ['Correctness', 'Code Efficiency', 'Communication'])
                                  Set by SWE for each round. If None, uses generic metrics.
+            interview_id: Interview being ended (used to look up its measured complexity)
+            deadline: Deadline of the HTTP request; scoring gets what's left of it
 
         Returns:
             Dict with:
             - score: Integer 0-100
             - feedback: String with structured feedback
-            - message: Closing message text
+            - message: Closing message text (CLOSING_MESSAGE)
             - audio: MP3 audio bytes (base64) or empty string if TTS fails
             - success: Boolean
         """
@@ -125,21 +252,33 @@ class InterviewOrchestrator:
                     "Communication",
                 ]
 
+            session = self.sessions.pop(interview_id, {})
+            LIVE_INTERVIEWS.set(len(self.sessions))
+            complexity = session.get("complexity")
+
             # Try to get scoring from Gemini
             try:
-                scoring_result = self.gemini.score_interview(success_metrics_list)
+                with span("interview.score", metrics=len(success_metrics_list)):
+                    scoring_result = self.gemini.score_interview(
+                        success_metrics_list,
+                        complexity=format_complexity(complexity) if complexity else None,
+                        deadline=deadline,
+                        interview_id=interview_id,
+                    )
                 score = scoring_result.get("score", 50)
                 feedback = scoring_result.get("feedback", "")
             except Exception as scoring_error:
                 logger.error(f"Error getting interview score: {scoring_error}")
+                FALLBACKS.labels("score", failure_reason(scoring_error)).inc()
                 score = 50
                 feedback = "Interview completed. Detailed feedback will be provided by your recruiter."
 
-            self.gemini.clear_context()
+            self.gemini.clear_context(interview_id)
 
             return {
                 "score": score,
                 "feedback": feedback,
+                "message": CLOSING_MESSAGE,
                 "success": True,
             }
 
@@ -151,3 +290,47 @@ class InterviewOrchestrator:
                 "success": False,
                 "error": str(e),
             }
+
+    def evict(self, interview_ids):
+        """
+        Drop in-memory state for interviews that ended elsewhere or went quiet
+        (see services.presence). A returning candidate just starts a new session.
+
+        Returns:
+            Ids whose state was dropped
+        """
+        evicted = []
+        for interview_id in interview_ids:
+            had_session = self.sessions.pop(interview_id, None) is not None
+            if self.gemini.clear_context(interview_id) or had_session:
+                evicted.append(interview_id)
+        LIVE_INTERVIEWS.set(len(self.sessions))
+        return evicted
+
+    def active_interview_ids(self):
+        """Ids of interviews with a session or a conversation in this process"""
+        return set(self.sessions) | self.gemini.interview_ids()
+
+
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator():
+    """
+    Return the process-wide orchestrator, creating it on first use.
+
+    Building it configures the model provider (importing its SDK), so it is
+    deferred until a request needs it instead of happening in every worker
+    and management command at import time.
+    """
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = InterviewOrchestrator()
+        return _orchestrator
+
+
+def loaded_orchestrator():
+    """The process-wide orchestrator if it has been built, else None (never builds it)"""
+    return _orchestrator
@@ -0,0 +1,221 @@
+from abc import ABC, abstractmethod
+from django.conf import settings
+from interview.mocks import MOCK_COACHING_REPLIES, MOCK_QUESTION, MOCK_SCORE
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponse:
+    """Provider-neutral result of a generate() call"""
+
+    def __init__(self, text, model, input_tokens=0, output_tokens=0):
+        self.text = text
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+def contents_text(contents):
+    """Flatten a prompt string or a Gemini-style contents list into plain text"""
+    if isinstance(contents, str):
+        return contents
+    texts = []
+    for message in contents:
+        for part in message.get("parts", []):
+            texts.append(part.get("text", ""))
+    return "\n".join(texts)
+
+
+class LLMProvider(ABC):
+    """
+    Interface every model backend implements.
+
+    `contents` is either a prompt string or a list of
+    {"role": "user"|"model", "parts": [{"text": ...}]} messages.
+
+    `response_format` is None for free text, "json" for any JSON object, or a
+    response schema dict (see interview.services.structured_output).
+
+    A backend missing one of these methods fails when it is constructed
+    (in get_provider()), not halfway through an interview.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def generate(self, contents, model, timeout=None, response_format=None, **options):
+        """Return an LLMResponse for the whole completion (TimeoutError after `timeout` seconds)"""
+
+    @abstractmethod
+    def stream(self, contents, model, timeout=None, response_format=None, **options):
+        """Yield the completion as text chunks"""
+
+    @abstractmethod
+    def count_tokens(self, contents, model):
+        """Return the prompt size in tokens"""
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini via google.generativeai"""
+
+    name = "gemini"
+
+    def __init__(self):
+        import google.generativeai as genai
+
+        self.genai = genai
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model):
+        with self._lock:
+            if model not in self._models:
+                self._models[model] = self.genai.GenerativeModel(model)
+            return self._models[model]
+
+    def _options(self, timeout, response_format, options):
+        if timeout is not None:
+            options["request_options"] = {"timeout": timeout}
+        if response_format is not None:
+            config = {"response_mime_type": "application/json"}
+            if isinstance(response_format, dict):
+                config["response_schema"] = response_format
+            options["generation_config"] = config
+        return options
+
+    def generate(self, contents, model, timeout=None, response_format=None, **options):
+        options = self._options(timeout, response_format, options)
+        response = self._model(model).generate_content(contents, **options)
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            response.text,
+            model,
+            input_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+        )
+
+    def stream(self, contents, model, timeout=None, response_format=None, **options):
+        options = self._options(timeout, response_format, options)
+        for chunk in self._model(model).generate_content(contents, stream=True, **options):
+            if chunk.text:
+                yield chunk.text
+
+    def count_tokens(self, contents, model):
+        return self._model(model).count_tokens(contents).total_tokens
+
+
+def parse_latency(spec):
+    """
+    Build a latency sampler (seconds) from a spec string:
+
+    - "constant:0.5"
+    - "uniform:0.2:1.5"  (low, high)
+    - "lognormal:0.8:0.35"  (median, sigma)
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+
+    if kind == "constant":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic local stand-in for load testing and offline development.
+
+    Replies are canned (from interview.mocks) and chosen by a seeded RNG;
+    latency is sampled from LLM_FAKE_LATENCY. Batched question prompts get an
+    array of valid questions (with unique titles), scoring prompts get a score
+    JSON, everything else gets a coaching reply.
+    """
+
+    name = "fake"
+
+    # Approximate streaming cadence once the first token has arrived
+    CHUNK_CHARS = 40
+    CHUNK_DELAY = 0.02
+
+    def __init__(self, latency=None, seed=None):
+        self.sample_latency = parse_latency(latency or settings.LLM_FAKE_LATENCY)
+        self.rng = random.Random(settings.LLM_FAKE_SEED if seed is None else seed)
+        self._lock = threading.Lock()
+
+    def _reply(self, prompt):
+        with self._lock:
+            latency = self.sample_latency(self.rng)
+            token = self.rng.randrange(1_000_000)
+
+        # Only the latest message decides what kind of answer is expected
+        batch = re.search(r"Generate exactly (\d+) complete", prompt)
+        if '"score"' in prompt and "RESPONSE FORMAT" in prompt:
+            text = json.dumps(MOCK_SCORE)
+        elif batch and '"test_cases"' in prompt:
+            questions = [
+                dict(MOCK_QUESTION, title=f"{MOCK_QUESTION['title']} #{token}-{i}")
+                for i in range(int(batch.group(1)))
+            ]
+            text = json.dumps(questions)
+        else:
+            text = MOCK_COACHING_REPLIES[token % len(MOCK_COACHING_REPLIES)]
+        return text, latency
+
+    def _last_prompt(self, contents):
+        if isinstance(contents, str):
+            return contents
+        return contents_text(contents[-1:]) if contents else ""
+
+    def generate(self, contents, model, timeout=None, response_format=None, **options):
+        text, latency = self._reply(self._last_prompt(contents))
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake provider took longer than {timeout:.1f}s")
+        time.sleep(latency)
+        return LLMResponse(
+            text,
+            model,
+            input_tokens=self.count_tokens(contents, model),
+            output_tokens=max(1, len(text) // 4),
+        )
+
+    def stream(self, contents, model, timeout=None, response_format=None, **options):
+        text, latency = self._reply(self._last_prompt(contents))
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake provider took longer than {timeout:.1f}s")
+        time.sleep(latency)
+        for start in range(0, len(text), self.CHUNK_CHARS):
+            yield text[start : start + self.CHUNK_CHARS]
+            time.sleep(self.CHUNK_DELAY)
+
+    def count_tokens(self, contents, model):
+        # ~4 characters per token, close enough for English prompts
+        return max(1, len(contents_text(contents)) // 4)
+
+
+PROVIDERS = {
+    GeminiProvider.name: GeminiProvider,
+    FakeProvider.name: FakeProvider,
+}
+
+
+def get_provider(name=None):
+    """Instantiate the configured provider (settings.LLM_PROVIDER by default)"""
+    name = name or settings.LLM_PROVIDER
+    try:
+        return PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider '{name}'. Options: {', '.join(PROVIDERS)}")
@@ -0,0 +1,95 @@
+from django.conf import settings
+from interview.services.resilience import get_breaker
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Call types, each with its own route in settings.LLM_ROUTES
+CALL_TURN = "turn"  # live coaching reply, latency matters most
+CALL_QUESTION = "question"  # question generation
+CALL_SCORE = "score"  # end-of-interview scoring, quality matters most
+
+
+def breaker_name(provider, model):
+    """Circuit breakers (and latency windows) are kept per model"""
+    return f"{provider}:{model}"
+
+
+class ModelRouter:
+    """
+    Picks the model for each call from a routing table of quality tiers.
+
+    settings.LLM_ROUTES maps a call type to a list of tiers, best first, and
+    each tier is a list of models of similar quality:
+
+        "score": [["gemini-2.0-flash"], ["gemini-2.0-flash-lite"]]
+
+    Within a tier, healthy models (circuit not open) are ordered by a live
+    exponentially weighted moving average of their latency for that call type.
+    Models without measurements go first, so each gets measured. Lower tiers
+    are only used as fallbacks once every model of a better tier is unhealthy
+    or has failed for this call.
+    """
+
+    def __init__(self, provider, routes=None, alpha=None):
+        self.provider = provider
+        self.routes = routes or settings.LLM_ROUTES
+        self.alpha = settings.LLM_ROUTER_EWMA_ALPHA if alpha is None else alpha
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, call_type):
+        """
+        Returns:
+            Healthy models to try, in order (best tier, then fastest first)
+        """
+        ordered = []
+        for tier in self.routes[call_type]:
+            healthy = [
+                model
+                for model in tier
+                if get_breaker(breaker_name(self.provider, model)).available()
+            ]
+            with self._lock:
+                healthy.sort(key=lambda model: self._latency.get((call_type, model), 0.0))
+            ordered += healthy
+        return ordered
+
+    def record(self, call_type, model, seconds):
+        """Fold one successful call's latency into the model's average"""
+        with self._lock:
+            key = (call_type, model)
+            previous = self._latency.get(key)
+            self._latency[key] = (
+                seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+            )
+
+    def snapshot(self):
+        """Current order and average latency per call type, for monitoring"""
+        with self._lock:
+            latency = dict(self._latency)
+        return {
+            call_type: {
+                "order": self.candidates(call_type),
+                "ewma_ms": {
+                    model: round(latency[(call_type, model)] * 1000)
+                    for tier in tiers
+                    for model in tier
+                    if (call_type, model) in latency
+                },
+            }
+            for call_type, tiers in self.routes.items()
+        }
+
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(provider):
+    """Process-wide router for a provider, so latency averages are shared"""
+    with _routers_lock:
+        if provider not in _routers:
+            _routers[provider] = ModelRouter(provider)
+        return _routers[provider]
@@ -0,0 +1,225 @@
+"""
+Candidate presence and the abandoned-interview reaper.
+
+The interview page sends a heartbeat every few seconds. PresenceStore keeps
+the time of each interview's last write in memory and only writes
+Interview.last_seen_at every PRESENCE_WRITE_SECONDS, so most heartbeats cost
+a dict lookup rather than a query.
+
+Interviews whose candidate closed the tab never reach the end view. Every
+process that has served a heartbeat runs a SessionReaper thread which, every
+REAPER_INTERVAL_SECONDS:
+- finalizes and scores started interviews past their round's time limit plus
+  INTERVIEW_GRACE_SECONDS. Each one is claimed with a conditional UPDATE, so
+  exactly one process (or the candidate's own end request) handles it.
+- evicts this process's orchestrator sessions for interviews that are
+  finished, deleted, or haven't been heard from for SESSION_IDLE_SECONDS.
+The reap_interviews command runs the finalizing pass once, e.g. from cron.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from interview.models import Interview, RecordingUpload
+from vode.metrics import INTERVIEWS_REAPED, SESSIONS_EVICTED
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ABANDONED_NOTE = "The candidate left before answering anything; the interview was closed automatically."
+
+
+class PresenceStore:
+    """Coalesces heartbeats into occasional writes of Interview.last_seen_at"""
+
+    def __init__(self, write_seconds=None):
+        self.write_seconds = write_seconds or settings.PRESENCE_WRITE_SECONDS
+        # Interview id -> time.monotonic() of the last write from this process
+        self._written = {}
+        self._lock = threading.Lock()
+
+    def beat(self, interview_id):
+        """
+        Record that the candidate's page for an interview is open.
+
+        Returns:
+            False if the interview doesn't exist or is already finished (as of
+            the last write, so up to PRESENCE_WRITE_SECONDS stale)
+        """
+        now = time.monotonic()
+        with self._lock:
+            last = self._written.get(interview_id)
+            if last is not None and now - last < self.write_seconds:
+                return True
+            self._written[interview_id] = now
+
+        updated = Interview.objects.filter(id=interview_id, completed_at__isnull=True).update(
+            last_seen_at=timezone.now()
+        )
+        if not updated:
+            self.forget([interview_id])
+        return bool(updated)
+
+    def tracked(self):
+        """Interview ids this process has heartbeats for"""
+        with self._lock:
+            return set(self._written)
+
+    def forget(self, interview_ids):
+        with self._lock:
+            for interview_id in interview_ids:
+                self._written.pop(interview_id, None)
+
+
+def expired_interviews(now=None):
+    """
+    Ids of started, unfinished interviews past their round's time limit plus
+    INTERVIEW_GRACE_SECONDS.
+    """
+    now = now or timezone.now()
+    grace = timedelta(seconds=settings.INTERVIEW_GRACE_SECONDS)
+    # Time limits differ per round, so the database only narrows it down
+    started = Interview.objects.filter(
+        started_at__isnull=False, completed_at__isnull=True, started_at__lte=now - grace
+    ).values_list("id", "started_at", "round__time_limit")
+    return [
+        interview_id
+        for interview_id, started_at, time_limit in started
+        if started_at + timedelta(minutes=time_limit) + grace <= now
+    ]
+
+
+def finalize(interview_ids):
+    """
+    Finish the recordings of claimed interviews and score them from their
+    stored transcripts (the way re-scoring does; the live conversation is gone).
+    Interviews with no answered turns get ABANDONED_NOTE instead of a model call.
+    """
+    # Imported here: the scorer pulls in the model SDK, and views import this module
+    from interview.services.batch_rescorer import BatchRescorer
+    from interview.views import finish_recording
+
+    interviews = Interview.objects.filter(id__in=interview_ids)
+    # finish_recording stores each recording's URL on its interview
+    for upload in RecordingUpload.objects.filter(interview_id__in=interview_ids, completed_at__isnull=True):
+        try:
+            finish_recording(upload)
+        except Exception as e:
+            logger.error(f"Could not finish {upload.kind} recording for interview {upload.interview_id}: {e}")
+
+    interviews.filter(transcript=[]).update(score=0, notes=ABANDONED_NOTE)
+    if interviews.exclude(transcript=[]).exists():
+        BatchRescorer().run(interviews)
+
+
+def reap_expired(now=None, dry_run=False):
+    """
+    Finalize and score interviews past their deadline.
+
+    Args:
+        now: Reference time (defaults to now)
+        dry_run: Only report what would be reaped
+
+    Returns:
+        Ids of the interviews reaped (or that would be) by this call
+    """
+    now = now or timezone.now()
+    expired = expired_interviews(now)
+    if dry_run:
+        return expired
+
+    reaped = [
+        interview_id
+        for interview_id in expired
+        # Whoever sets completed_at first owns finalizing it
+        if Interview.objects.filter(id=interview_id, completed_at__isnull=True).update(completed_at=now)
+    ]
+    if reaped:
+        logger.info(f"Reaping {len(reaped)} abandoned interviews: {reaped}")
+        INTERVIEWS_REAPED.inc(len(reaped))
+        finalize(reaped)
+    return reaped
+
+
+def _loaded_orchestrator():
+    # Never build the orchestrator here: a process that hasn't imported it holds no sessions
+    module = sys.modules.get("interview.services.interview_orchestrator")
+    return module.loaded_orchestrator() if module else None
+
+
+def evict_idle_sessions(store, now=None):
+    """
+    Drop this process's in-memory state for interviews that are finished,
+    deleted, or haven't been heard from for SESSION_IDLE_SECONDS.
+
+    Returns:
+        Ids evicted
+    """
+    now = now or timezone.now()
+    orchestrator = _loaded_orchestrator()
+    session_ids = {i for i in (orchestrator.active_interview_ids() if orchestrator else ()) if isinstance(i, int)}
+    ids = session_ids | store.tracked()
+    if not ids:
+        return []
+
+    idle_before = now - timedelta(seconds=settings.SESSION_IDLE_SECONDS)
+    stale = set(ids)
+    for interview_id, completed_at, last_seen_at, started_at in Interview.objects.filter(
+        id__in=ids
+    ).values_list("id", "completed_at", "last_seen_at", "started_at"):
+        seen = last_seen_at or started_at
+        if completed_at is None and (seen is None or seen >= idle_before):
+            stale.discard(interview_id)
+
+    store.forget(stale)
+    evicted = orchestrator.evict(stale & session_ids) if orchestrator else []
+    if evicted:
+        logger.info(f"Evicted {len(evicted)} idle interview sessions: {evicted}")
+        SESSIONS_EVICTED.inc(len(evicted))
+    return sorted(stale)
+
+
+class SessionReaper:
+    """Runs reap_expired() and evict_idle_sessions() every REAPER_INTERVAL_SECONDS on a daemon thread"""
+
+    def __init__(self, store, interval=None):
+        self.store = store
+        self.interval = interval or settings.REAPER_INTERVAL_SECONDS
+        self._thread = threading.Thread(target=self._run, name="session-reaper", daemon=True)
+        self._thread.start()
+
+    def run_once(self):
+        reaped = reap_expired()
+        evicted = evict_idle_sessions(self.store)
+        return reaped, evicted
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Session reaper pass failed: {e}", exc_info=True)
+            finally:
+                # This thread's connection would otherwise outlive CONN_MAX_AGE
+                connections.close_all()
+
+
+_presence = None
+_reaper = None
+_presence_lock = threading.Lock()
+
+
+def get_presence():
+    """Return the process-wide PresenceStore, starting this process's reaper on first use"""
+    global _presence, _reaper
+    with _presence_lock:
+        if _presence is None:
+            _presence = PresenceStore()
+            if settings.REAPER_ENABLED:
+                _reaper = SessionReaper(_presence)
+        return _presence
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.utils import timezone
+from interview.models import Question
+from interview.services.usage_ledger import usage_scope
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUESTION_THRESHOLD = 5  # recent titles shown to the model as "do not repeat"; could be 1000
+# Pool questions tried per pass when other interviews keep claiming them first
+CLAIM_CANDIDATES = 5
+
+
+def unused_questions(round_obj):
+    """Questions generated for a round that no interview has claimed yet"""
+    return Question.objects.filter(round=round_obj, claimed_at__isnull=True).order_by("id")
+
+
+def title_taken(title):
+    # Titles are unique across rounds, so any existing one counts as taken
+    return Question.objects.filter(title__iexact=title).exists()
+
+
+def fill_pool(round_obj, gemini, size=None):
+    """
+    Top up a round's pool of unused questions to `size` (QUESTION_POOL_SIZE by
+    default) with batched generation: one model call per QUESTION_BATCH_SIZE questions.
+
+    Args:
+        round_obj: Round to generate for
+        gemini: GeminiService to generate with
+        size: Number of unused questions wanted
+
+    Returns:
+        How many more unused questions the round has than before. Fewer than were
+        generated when another worker created the same titles first (or claimed
+        questions meanwhile)
+    """
+    size = size or settings.QUESTION_POOL_SIZE
+    unused_before = unused_questions(round_obj).count()
+    missing = size - unused_before
+    if missing <= 0:
+        return 0
+
+    latest_questions = Question.objects.filter(round=round_obj).order_by("-id")[
+        :QUESTION_THRESHOLD
+    ]
+    context = {
+        "difficulty": round_obj.difficulty_level,
+        "topics": round_obj.data_structures,
+        "already_picked": ", ".join(q.title for q in latest_questions) or "None",
+    }
+
+    with usage_scope(round_id=round_obj.id):
+        generated = gemini.get_questions(context, missing, title_taken=title_taken)
+    # ignore_conflicts: another worker may have created the same title meanwhile
+    Question.objects.bulk_create(
+        [
+            Question(
+                title=question["title"],
+                statement=question["statement"],
+                test_cases=question["test_cases"],
+                round=round_obj,
+            )
+            for question in generated
+        ],
+        ignore_conflicts=True,
+    )
+    added = unused_questions(round_obj).count() - unused_before
+    logger.info(f"Added {added} of {len(generated)} generated questions to the pool for round {round_obj.id}")
+    return added
+
+
+def claim_question(round_obj):
+    """
+    Claim an unused question from a round's pool.
+
+    Interviews starting at the same time read the same pool; the conditional
+    UPDATE lets exactly one of them have each question.
+
+    Returns:
+        The claimed Question, or None if the pool is empty
+    """
+    for question_id in unused_questions(round_obj).values_list("id", flat=True)[:CLAIM_CANDIDATES]:
+        if Question.objects.filter(id=question_id, claimed_at__isnull=True).update(claimed_at=timezone.now()):
+            return Question.objects.get(id=question_id)
+    return None
+
+
+def take_question(round_obj, gemini):
+    """
+    Claim an unused question for a new interview, refilling the round's pool when empty.
+
+    Raises:
+        ValueError: If no question could be generated
+    """
+    question = claim_question(round_obj)
+    if question is None:
+        fill_pool(round_obj, gemini)
+        question = claim_question(round_obj)
+    if question is None:
+        raise ValueError(f"Could not generate a question for round {round_obj.id}")
+    return question
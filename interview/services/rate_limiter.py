@@ -0,0 +1,300 @@
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from vode.metrics import RATE_LIMIT_QUEUE_DEPTH
+import heapq
+import itertools
+import logging
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first. Live candidate turns beat question generation,
+# which beats end-of-interview scoring (nobody is waiting on a score in real time).
+# Within a process waiters are queued by priority; across processes the shared
+# bucket keeps part of its capacity back from the lower priorities (see _decide).
+PRIORITY_TURN = 0
+PRIORITY_QUESTION = 1
+PRIORITY_SCORE = 2
+
+# How often a waiter first re-checks the shared bucket while at the head of the
+# queue when every concurrency slot is taken. Each re-check is a locked write
+# with the db backend, so consecutive re-checks back off up to MAX_POLL_SECONDS;
+# a release in this process wakes the waiter straight away.
+POLL_SECONDS = 0.05
+MAX_POLL_SECONDS = 1.0
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call could not get capacity within the allowed wait"""
+
+
+def _refill(available, capacity, per_minute, elapsed):
+    return min(capacity, available + elapsed * per_minute / 60.0)
+
+
+def _reserved(capacity, priority):
+    """Part of a bucket a call of `priority` must leave for higher-priority calls"""
+    return capacity * min(1.0, settings.RATE_LIMIT_PRIORITY_RESERVE * priority)
+
+
+def _decide(state, limits, request_cost, token_cost, now, lease_id, priority=PRIORITY_TURN):
+    """
+    Refill the buckets in `state` and try to take capacity from them.
+
+    Shared by both backends so the arithmetic is identical. Every running call
+    holds a lease in state["leases"] that expires RATE_LIMIT_LEASE_SECONDS
+    after it was taken; expired leases (from a worker killed mid-call, which
+    never released) are reclaimed here, one by one.
+
+    Priority is enforced here too, so it holds across processes: each step down
+    from PRIORITY_TURN leaves another RATE_LIMIT_PRIORITY_RESERVE of the
+    concurrency slots, requests and tokens untouched (scoring can use half of
+    each bucket by default, question generation three quarters). A batch of
+    scoring calls in one worker can't drain what live turns in another need.
+
+    Returns:
+        (wait, slots_full): seconds to wait before retrying (0 when the capacity
+        was taken under `lease_id`), and whether the wait is because every
+        concurrency slot open to this priority is taken (there is no refill time
+        to wait for; a retry should back off instead)
+    """
+    rpm = limits["requests_per_minute"]
+    tpm = limits["tokens_per_minute"]
+    elapsed = max(0.0, now - state["refilled_at"])
+
+    expired = [lease for lease, expires_at in state["leases"].items() if expires_at <= now]
+    for lease in expired:
+        del state["leases"][lease]
+    if expired:
+        logger.warning(f"Reclaimed {len(expired)} expired rate limit leases (calls that never released)")
+
+    state["requests_available"] = _refill(state["requests_available"], rpm, rpm, elapsed)
+    state["tokens_available"] = _refill(state["tokens_available"], tpm, tpm, elapsed)
+    state["refilled_at"] = now
+
+    # A single call larger than the whole bucket would otherwise wait forever
+    token_cost = min(token_cost, tpm)
+
+    # Every priority keeps at least one slot, or it could never run at all
+    slots = max(1, limits["max_concurrent"] - int(_reserved(limits["max_concurrent"], priority)))
+    if len(state["leases"]) >= slots:
+        return POLL_SECONDS, True
+    # Only what's above the reserve may be taken. The reserve is a share of what
+    # the call leaves, so even a call as large as the whole bucket fits eventually
+    requests_short = request_cost + _reserved(rpm - request_cost, priority) - state["requests_available"]
+    if requests_short > 0:
+        return requests_short * 60.0 / rpm, False
+    tokens_short = token_cost + _reserved(tpm - token_cost, priority) - state["tokens_available"]
+    if tokens_short > 0:
+        return tokens_short * 60.0 / tpm, False
+
+    state["requests_available"] -= request_cost
+    state["tokens_available"] -= token_cost
+    state["leases"][lease_id] = now + settings.RATE_LIMIT_LEASE_SECONDS
+    return 0.0, False
+
+
+class LocalBackend:
+    """Per-process buckets. Fine for a single worker or local development."""
+
+    def __init__(self):
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, provider, limits, request_cost, token_cost, lease_id, priority):
+        with self._lock:
+            state = self._state.setdefault(
+                provider,
+                {
+                    "requests_available": limits["requests_per_minute"],
+                    "tokens_available": limits["tokens_per_minute"],
+                    "refilled_at": time.time(),
+                    "leases": {},
+                },
+            )
+            return _decide(state, limits, request_cost, token_cost, time.time(), lease_id, priority)
+
+    def release(self, provider, lease_id):
+        with self._lock:
+            state = self._state.get(provider)
+            if state:
+                state["leases"].pop(lease_id, None)
+
+
+class DatabaseBackend:
+    """
+    Buckets stored in RateLimitBucket rows, so every gunicorn worker and dyno
+    shares the same budget. Rows are locked with SELECT ... FOR UPDATE.
+
+    Cost: every acquire attempt and every release is one short transaction
+    that locks and rewrites the provider's row. Waiters at the head of each
+    process's queue retry with backoff (POLL_SECONDS doubling up to
+    MAX_POLL_SECONDS), so a saturated provider costs each process at most a
+    few writes per second on top of one write per call and per release.
+    """
+
+    def _locked_bucket(self, provider, limits):
+        from interview.models import RateLimitBucket
+
+        # Write first so the lock is taken before reading. On SQLite this
+        # avoids a read-to-write lock upgrade failing with "database is locked".
+        RateLimitBucket.objects.filter(provider=provider).update(in_flight=F("in_flight"))
+        bucket, _ = RateLimitBucket.objects.select_for_update().get_or_create(
+            provider=provider,
+            defaults={
+                "requests_available": limits["requests_per_minute"],
+                "tokens_available": limits["tokens_per_minute"],
+                "refilled_at": time.time(),
+            },
+        )
+        return bucket
+
+    def try_acquire(self, provider, limits, request_cost, token_cost, lease_id, priority):
+        with transaction.atomic():
+            bucket = self._locked_bucket(provider, limits)
+            state = {
+                "requests_available": bucket.requests_available,
+                "tokens_available": bucket.tokens_available,
+                "refilled_at": bucket.refilled_at,
+                "leases": dict(bucket.leases),
+            }
+            decision = _decide(state, limits, request_cost, token_cost, time.time(), lease_id, priority)
+            for field, value in state.items():
+                setattr(bucket, field, value)
+            bucket.in_flight = len(bucket.leases)
+            bucket.save()
+        return decision
+
+    def release(self, provider, lease_id):
+        from interview.models import RateLimitBucket
+
+        with transaction.atomic():
+            RateLimitBucket.objects.filter(provider=provider).update(in_flight=F("in_flight"))
+            bucket = RateLimitBucket.objects.select_for_update().filter(provider=provider).first()
+            if bucket is None or bucket.leases.pop(lease_id, None) is None:
+                return
+            bucket.in_flight = len(bucket.leases)
+            bucket.save(update_fields=["leases", "in_flight"])
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter (requests/min, tokens/min, max concurrent) for one provider.
+
+    Waiters in this process line up in a priority queue (FIFO within a priority),
+    and only the head of the queue polls the shared bucket. The queue only
+    orders calls within one process; between processes (gunicorn workers,
+    dynos) the shared bucket keeps capacity back from lower priorities, so a
+    burst of score requests anywhere can never starve live interview turns.
+    """
+
+    def __init__(self, provider, limits, backend):
+        self.provider = provider
+        self.limits = limits
+        self.backend = backend
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    @property
+    def queue_depth(self):
+        """Number of calls in this process waiting for capacity"""
+        return len(self._queue)
+
+    @contextmanager
+    def acquire(self, tokens=0, priority=PRIORITY_TURN, timeout=None):
+        """
+        Wait for capacity, run the block, then free the concurrency slot.
+
+        Args:
+            tokens: Estimated cost in provider tokens (model tokens or TTS characters)
+            priority: PRIORITY_TURN, PRIORITY_QUESTION or PRIORITY_SCORE
+            timeout: Max seconds to wait (settings.RATE_LIMIT_MAX_WAIT_SECONDS by default)
+
+        Raises:
+            RateLimitExceeded: If no capacity was available within `timeout`
+        """
+        if not self.limits:
+            yield
+            return
+
+        timeout = settings.RATE_LIMIT_MAX_WAIT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        entry = (priority, next(self._counter))
+
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+            RATE_LIMIT_QUEUE_DEPTH.labels(self.provider).set(len(self._queue))
+            self._condition.notify_all()
+        lease_id = secrets.token_hex(8)
+        try:
+            self._wait_for_capacity(entry, tokens, deadline, lease_id)
+        finally:
+            with self._condition:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                RATE_LIMIT_QUEUE_DEPTH.labels(self.provider).set(len(self._queue))
+                self._condition.notify_all()
+
+        try:
+            yield
+        finally:
+            self.backend.release(self.provider, lease_id)
+            # A slot just freed up: the head of the queue needn't wait out its backoff
+            with self._condition:
+                self._condition.notify_all()
+
+    def _wait_for_capacity(self, entry, tokens, deadline, lease_id):
+        polls = 0
+        while True:
+            with self._condition:
+                while self._queue[0] != entry:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RateLimitExceeded(f"{self.provider}: timed out in queue")
+                    self._condition.wait(remaining)
+
+            wait, slots_full = self.backend.try_acquire(
+                self.provider, self.limits, 1, tokens, lease_id, entry[0]
+            )
+            if wait == 0:
+                return
+            if slots_full:
+                # All slots taken: back off while they stay taken
+                wait = min(POLL_SECONDS * 2**polls, MAX_POLL_SECONDS)
+                polls += 1
+            else:
+                polls = 0
+
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                logger.warning(f"{self.provider} rate limit: would need to wait {wait:.1f}s")
+                raise RateLimitExceeded(f"{self.provider}: rate limit reached")
+
+            # Woken early if a higher-priority call joins the queue
+            with self._condition:
+                self._condition.wait(wait)
+
+
+BACKENDS = {
+    "local": LocalBackend,
+    "db": DatabaseBackend,
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """Return the process-wide limiter for a provider (no-op if it has no limits)"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            backend = BACKENDS[settings.RATE_LIMIT_BACKEND]()
+            _limiters[provider] = RateLimiter(
+                provider, settings.RATE_LIMITS.get(provider), backend
+            )
+        return _limiters[provider]
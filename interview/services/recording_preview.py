@@ -0,0 +1,212 @@
+"""
+Thumbnail sprite sheets and timestamp indexes for interview recordings.
+
+Once a recording upload finishes, build_preview() runs on a small background
+pool: ffmpeg decodes only keyframes (where the decoder supports skipping the
+rest), keeps one at most every RECORDING_PREVIEW_INTERVAL_SECONDS and tiles
+them into a single JPEG sprite. A JSON index next to it gives each
+thumbnail's real time and position in the sprite, plus the interview's
+conversation turns at their offsets into the recording. Review pages load these two small files instead of the video.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from django.conf import settings
+from django.db import connections
+from django.urls import reverse
+from interview.models import RecordingUpload
+from interview.services.recording_storage import LocalRecordingStorage, get_storage
+import json
+import logging
+import math
+import os
+import subprocess
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Characters of each turn's statement and reply kept in the index
+TURN_TEXT_CHARS = 160
+
+
+class PreviewError(Exception):
+    """Raised when ffmpeg can't produce thumbnails for a recording"""
+
+
+def preview_paths(upload):
+    """Local (sprite, index) paths for an upload, next to where a local recording is stored"""
+    base = os.path.join(str(settings.RECORDINGS_DIR), os.path.splitext(upload.key)[0])
+    return f"{base}.sprite.jpg", f"{base}.index.json"
+
+
+def _ffmpeg(*args):
+    command = [settings.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-nostdin", "-y", *args]
+    try:
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=settings.RECORDING_PREVIEW_TIMEOUT_SECONDS
+        )
+    except FileNotFoundError:
+        raise PreviewError(f"ffmpeg not found at {settings.FFMPEG_PATH}")
+    except subprocess.TimeoutExpired:
+        raise PreviewError(f"ffmpeg timed out after {settings.RECORDING_PREVIEW_TIMEOUT_SECONDS}s")
+    if result.returncode != 0:
+        raise PreviewError(f"ffmpeg failed: {result.stderr.strip()[-500:]}")
+
+
+def _source(upload):
+    """Path or URL ffmpeg reads the recording from"""
+    storage = get_storage()
+    if isinstance(storage, LocalRecordingStorage):
+        return storage.path(upload.key)
+    # Remote storage: ffmpeg reads over HTTP (with range requests) itself
+    return upload.url
+
+
+def _turn_index(upload):
+    """The interview's answered turns, as offsets in seconds into the recording"""
+    started = upload.recording_started_at or upload.created_at
+    turns = []
+    for turn in upload.interview.transcript:
+        try:
+            at = datetime.fromisoformat(turn["at"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        offset = (at - started).total_seconds()
+        if offset < 0:
+            continue
+        turns.append(
+            {
+                "t": round(offset, 1),
+                "statement": (turn.get("statement") or "")[:TURN_TEXT_CHARS],
+                "reply": (turn.get("reply") or "")[:TURN_TEXT_CHARS],
+                "tests": turn.get("test_results"),
+                "source": turn.get("source"),
+            }
+        )
+    return turns
+
+
+def build_preview(upload):
+    """
+    Extract thumbnails from a finished recording and write its sprite and index.
+
+    Args:
+        upload: Completed RecordingUpload
+
+    Returns:
+        The index dict
+
+    Raises:
+        PreviewError: If ffmpeg is missing or failed, or the recording has no video
+    """
+    interval = settings.RECORDING_PREVIEW_INTERVAL_SECONDS
+    width = settings.RECORDING_PREVIEW_WIDTH
+    height = settings.RECORDING_PREVIEW_HEIGHT
+    columns = settings.RECORDING_PREVIEW_COLUMNS
+    sprite_path, index_path = preview_paths(upload)
+    os.makedirs(os.path.dirname(sprite_path), exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="vode-preview-") as workdir:
+        # Keyframes only: decoding every frame of an hour-long recording is what makes this slow.
+        # Recorder keyframes can be far apart, so rather than resampling to a fixed rate
+        # (which repeats a keyframe until the next one), frames at least `interval` apart
+        # are kept and each file is named after its time in milliseconds
+        frames_dir = os.path.join(workdir, "frames")
+        os.mkdir(frames_dir)
+        _ffmpeg(
+            "-skip_frame", "nokey",
+            "-i", _source(upload),
+            "-an",
+            "-vf",
+            f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval})',"
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+            "-fps_mode", "passthrough",
+            "-enc_time_base", "1:1000",
+            "-frame_pts", "1",
+            "-frames:v", str(settings.RECORDING_PREVIEW_MAX_THUMBNAILS),
+            "-q:v", "5",
+            os.path.join(frames_dir, "%d.jpg"),
+        )
+        times_ms = sorted(int(name[: -len(".jpg")]) for name in os.listdir(frames_dir) if name.endswith(".jpg"))
+        count = len(times_ms)
+        if count == 0:
+            raise PreviewError(f"No video frames in {upload.key}")
+        # The sprite is tiled from a numbered sequence
+        for i, time_ms in enumerate(times_ms, 1):
+            os.rename(os.path.join(frames_dir, f"{time_ms}.jpg"), os.path.join(workdir, f"{i:05d}.jpg"))
+
+        rows = math.ceil(count / columns)
+        partial_sprite = sprite_path + ".tmp.jpg"
+        _ffmpeg(
+            "-framerate", "1",
+            "-i", os.path.join(workdir, "%05d.jpg"),
+            "-vf", f"tile={min(count, columns)}x{rows}",
+            "-frames:v", "1",
+            "-q:v", "5",
+            partial_sprite,
+        )
+        os.replace(partial_sprite, sprite_path)
+
+    index = {
+        "interval": interval,
+        "width": width,
+        "height": height,
+        "columns": min(count, columns),
+        "sprite": reverse("interview:recording_preview", args=[upload.id, "sprite.jpg"]),
+        "thumbnails": [
+            {"t": round(time_ms / 1000, 1), "x": (i % columns) * width, "y": (i // columns) * height}
+            for i, time_ms in enumerate(times_ms)
+        ],
+        "turns": _turn_index(upload),
+    }
+    partial_index = index_path + ".tmp"
+    with open(partial_index, "w") as f:
+        json.dump(index, f)
+    os.replace(partial_index, index_path)
+
+    logger.info(f"Built preview for {upload.key}: {count} thumbnails, {len(index['turns'])} turns")
+    return index
+
+
+def build_and_save(upload_id):
+    """build_preview() for one upload, recording the outcome in preview_status"""
+    upload = RecordingUpload.objects.select_related("interview").get(id=upload_id)
+    RecordingUpload.objects.filter(id=upload.id).update(preview_status="processing")
+    try:
+        build_preview(upload)
+    except Exception as e:
+        logger.error(f"Could not build preview for recording {upload.id}: {e}")
+        RecordingUpload.objects.filter(id=upload.id).update(preview_status="failed")
+        return False
+    RecordingUpload.objects.filter(id=upload.id).update(preview_status="ready")
+    return True
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def build_in_background(upload_id):
+    """
+    Queue build_and_save() on the process-wide preview pool
+    (RECORDING_PREVIEW_WORKERS threads, so ffmpeg runs don't pile up).
+    """
+    global _executor
+    if not settings.RECORDING_PREVIEWS_ENABLED:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.RECORDING_PREVIEW_WORKERS, thread_name_prefix="recording-preview"
+            )
+
+    def target():
+        try:
+            build_and_save(upload_id)
+        finally:
+            # Pool threads open their own DB connections
+            connections.close_all()
+
+    return _executor.submit(target)
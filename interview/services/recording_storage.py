@@ -0,0 +1,240 @@
+"""
+Storage backends for interview recordings.
+
+Recordings arrive as a sequence of chunks (see the resumable upload API in
+interview.views). Each chunk is copied from the request stream to storage
+in COPY_BUFFER_BYTES pieces, so a worker never holds a whole chunk, let
+alone a whole recording, in memory.
+
+The backend is settings.RECORDING_STORAGE: "local" (files under
+RECORDINGS_DIR) or "s3" (an S3-compatible multipart upload; needs boto3).
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from django.conf import settings
+from django.urls import reverse
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: chunks of one upload are sent one at a time anyway
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_BYTES = 64 * 1024
+
+# S3 parts must be at least 5 MiB, except the last one
+S3_MIN_PART_BYTES = 5 * 1024 * 1024
+
+
+def copy_stream(stream, out, size):
+    """
+    Copy up to `size` bytes from a file-like `stream` to `out`.
+
+    Returns:
+        Bytes copied; fewer than `size` if the client went away mid-chunk
+        (what did arrive is kept, and the client resumes from there)
+    """
+    copied = 0
+    while copied < size:
+        try:
+            data = stream.read(min(COPY_BUFFER_BYTES, size - copied))
+        except OSError as e:
+            logger.warning(f"Recording chunk cut short after {copied} bytes: {e}")
+            break
+        if not data:
+            break
+        out.write(data)
+        copied += len(data)
+    return copied
+
+
+class _FileLock:
+    """Exclusive lock on an open file, so two requests can't write one upload at once"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self.f
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+
+
+class RecordingStorage(ABC):
+    """
+    Backend interface. Methods take the RecordingUpload and may update its
+    storage_state; the caller saves the upload afterwards.
+
+    A backend missing one of these methods fails when get_storage() constructs
+    it, not on the first chunk of a candidate's recording.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def start(self, upload):
+        """Prepare storage for a new, empty upload"""
+
+    @abstractmethod
+    def lock(self, upload):
+        """
+        Context manager that keeps other requests from writing the upload. Hold
+        it from reading upload.offset until the new offset is saved.
+        """
+
+    @abstractmethod
+    def append(self, upload, stream, size):
+        """
+        Write up to `size` bytes from `stream` at upload.offset (call with lock() held).
+
+        Returns:
+            Bytes written
+        """
+
+    @abstractmethod
+    def finish(self, upload):
+        """
+        Make the complete recording available.
+
+        Returns:
+            URL the recording is served from
+        """
+
+
+class LocalRecordingStorage(RecordingStorage):
+    """Files under RECORDINGS_DIR, served by the recording view"""
+
+    name = "local"
+
+    def __init__(self, directory=None):
+        self.directory = str(directory or settings.RECORDINGS_DIR)
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def start(self, upload):
+        path = self.path(upload.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+    @contextmanager
+    def lock(self, upload):
+        with open(self.path(upload.key), "r+b") as f, _FileLock(f):
+            yield
+
+    def append(self, upload, stream, size):
+        with open(self.path(upload.key), "r+b") as f:
+            f.seek(upload.offset)
+            # Anything past the offset is from a write that was never acknowledged
+            f.truncate()
+            return copy_stream(stream, f, size)
+
+    def finish(self, upload):
+        return reverse("interview:recording", args=[upload.id])
+
+
+class S3RecordingStorage(RecordingStorage):
+    """
+    S3 (or compatible) multipart upload.
+
+    Chunks are spooled to a local file until there's enough for a part, so
+    chunks of an upload need to reach workers sharing RECORDING_SPOOL_DIR.
+    """
+
+    name = "s3"
+
+    def __init__(self):
+        import boto3
+
+        self.client = boto3.client("s3", endpoint_url=settings.RECORDING_S3_ENDPOINT or None)
+        self.bucket = settings.RECORDING_S3_BUCKET
+        self.spool = LocalRecordingStorage(settings.RECORDING_SPOOL_DIR)
+
+    def start(self, upload):
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=upload.key, ContentType="video/webm"
+        )
+        upload.storage_state = {"upload_id": response["UploadId"], "uploaded": 0, "parts": []}
+        self.spool.start(upload)
+
+    def lock(self, upload):
+        return self.spool.lock(upload)
+
+    def append(self, upload, stream, size):
+        state = upload.storage_state
+        spooled = upload.offset - state["uploaded"]
+        path = self.spool.path(upload.key)
+        with open(path, "r+b") as f:
+            f.seek(spooled)
+            f.truncate()
+            written = copy_stream(stream, f, size)
+            if spooled + written >= S3_MIN_PART_BYTES:
+                self._upload_part(upload, f, spooled + written)
+        return written
+
+    def finish(self, upload):
+        state = upload.storage_state
+        path = self.spool.path(upload.key)
+        with open(path, "r+b") as f, _FileLock(f):
+            remaining = upload.offset - state["uploaded"]
+            if remaining or not state["parts"]:
+                self._upload_part(upload, f, remaining)
+        os.remove(path)
+
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=upload.key,
+            UploadId=state["upload_id"],
+            MultipartUpload={"Parts": state["parts"]},
+        )
+        return f"{settings.RECORDING_S3_URL.rstrip('/')}/{upload.key}"
+
+    def _upload_part(self, upload, f, size):
+        state = upload.storage_state
+        number = len(state["parts"]) + 1
+        f.seek(0)
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=upload.key,
+            UploadId=state["upload_id"],
+            PartNumber=number,
+            Body=f,
+            ContentLength=size,
+        )
+        state["parts"].append({"PartNumber": number, "ETag": response["ETag"]})
+        state["uploaded"] += size
+        f.seek(0)
+        f.truncate()
+        logger.info(f"Uploaded part {number} ({size} bytes) of {upload.key}")
+
+
+STORAGES = {
+    LocalRecordingStorage.name: LocalRecordingStorage,
+    S3RecordingStorage.name: S3RecordingStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Return the process-wide recording storage backend (settings.RECORDING_STORAGE)"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            try:
+                _storage = STORAGES[settings.RECORDING_STORAGE]()
+            except KeyError:
+                raise ValueError(
+                    f"Unknown recording storage '{settings.RECORDING_STORAGE}'. Options: {', '.join(STORAGES)}"
+                )
+        return _storage
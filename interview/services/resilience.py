@@ -0,0 +1,273 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connections
+from interview.services.rate_limiter import RateLimitExceeded
+import contextvars
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call's time budget ran out"""
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a provider that is currently failing"""
+
+
+def failure_reason(error):
+    """
+    Metric label for why a provider call failed: timeout, circuit_open,
+    rate_limited or error. Exception class names would give every new error
+    type its own time series.
+    """
+    if isinstance(error, (DeadlineExceeded, TimeoutError)):
+        return "timeout"
+    if isinstance(error, CircuitOpen):
+        return "circuit_open"
+    if isinstance(error, RateLimitExceeded):
+        return "rate_limited"
+    return "error"
+
+
+class Deadline:
+    """Absolute time budget for a request, shared by every call made while serving it"""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def budget(self, cap=None, reserve=0.0):
+        """
+        Seconds a single call may take: what's left minus `reserve` (time kept
+        back for later steps), never more than `cap`.
+
+        Raises:
+            DeadlineExceeded: If nothing is left
+        """
+        seconds = self.remaining() - reserve
+        if cap is not None:
+            seconds = min(seconds, cap)
+        if seconds <= 0:
+            raise DeadlineExceeded("No time left in the request budget")
+        return seconds
+
+
+class LatencyTracker:
+    """Rolling window of successful call durations (seconds)"""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p, min_samples=20):
+        """p-th percentile, or None until enough samples have been seen"""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `reset_seconds`. Then one trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold, reset_seconds):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go to the provider right now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def available(self):
+        """Like allow(), but only peeks (no trial call is claimed)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.reset_seconds
+            return not self._trial_running
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_skipped(self):
+        """The allowed call never reached the provider (e.g. it was rate limited)"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        """State for monitoring endpoints"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_seconds": (
+                    round(time.monotonic() - self.opened_at, 1)
+                    if self.state == self.OPEN
+                    else 0
+                ),
+            }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PROVIDER_CALL_THREADS, thread_name_prefix="provider-call"
+            )
+        return _executor
+
+
+def _run_attempt(fn):
+    try:
+        return fn()
+    finally:
+        # Executor threads are reused and never see request_finished, so nothing
+        # else closes the connections an attempt opened (the db rate limit
+        # backend). Left open, each provider-call thread would hold its own
+        # connection for CONN_MAX_AGE.
+        connections.close_all()
+
+
+def hedged_call(fn, timeout, hedge_after=None):
+    """
+    Run `fn` with a hard timeout, optionally racing a duplicate.
+
+    If the first attempt hasn't finished after `hedge_after` seconds (typically
+    the provider's recent p95), a second identical attempt starts and whichever
+    succeeds first wins. Only use for idempotent calls. Database connections
+    an attempt opens are closed when it finishes.
+
+    Raises:
+        DeadlineExceeded: If no attempt succeeded within `timeout`
+        Exception: The first attempt's error, if every attempt failed
+    """
+    executor = _get_executor()
+    deadline = time.monotonic() + timeout
+
+    def submit():
+        # Each attempt runs in a copy of the caller's context (keeps trace spans nested)
+        return executor.submit(contextvars.copy_context().run, _run_attempt, fn)
+
+    futures = [submit()]
+
+    if hedge_after is not None and hedge_after < timeout:
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            logger.info(f"Hedging slow call after {hedge_after:.2f}s")
+            futures.append(submit())
+
+    errors = []
+    pending = set(futures)
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            errors.append(future.exception())
+
+    if errors and not pending:
+        raise errors[0]
+    raise DeadlineExceeded(f"Call did not finish within {timeout:.1f}s")
+
+
+_breakers = {}
+_trackers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Process-wide circuit breaker for a provider"""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+            )
+        return _breakers[name]
+
+
+def get_latency_tracker(name):
+    """Process-wide latency window for a provider"""
+    with _registry_lock:
+        if name not in _trackers:
+            _trackers[name] = LatencyTracker()
+        return _trackers[name]
+
+
+def provider_health():
+    """Breaker state and recent latency for every provider seen by this process"""
+    with _registry_lock:
+        names = sorted(set(_breakers) | set(_trackers))
+    health = {}
+    for name in names:
+        p95 = get_latency_tracker(name).percentile(95, min_samples=1)
+        health[name] = dict(
+            get_breaker(name).snapshot(),
+            p95_ms=round(p95 * 1000) if p95 is not None else None,
+        )
+    return health
@@ -0,0 +1,539 @@
+"""
+Sandbox harness that executes candidate Python code against test cases.
+
+This file is deliberately free of Django imports so it can be launched with
+`python -I sandbox_harness.py <result fd>` (isolated mode, no site-packages,
+no env). A job is read as JSON from stdin and the result is written as JSON
+to the result fd, never to stdout:
+
+    {"code": "...", "cases": [{"input": {...}, "output": ...}], "limits": {...}}
+
+The process that reads the job never runs candidate code. execute_job() forks
+a child for that, which before loading the code:
+- points stdin/stdout/stderr at /dev/null and closes every other inherited fd
+  except its own output pipe (so the result fd is unreachable)
+- applies CPU, memory, file-size and process-count rlimits
+- installs a seccomp filter that fails process creation, exec, sockets,
+  writable opens and filesystem changes with EPERM
+The child only reports what the entry point returned for each case; the
+parent compares that with the expected outputs, which the child never sees.
+A Python audit hook is installed as well, as a second layer.
+"""
+
+import ast
+import contextlib
+import ctypes
+import errno
+import io
+import json
+import os
+import platform
+import resource
+import select
+import signal
+import struct
+import sys
+import time
+
+# Modules candidates commonly reach for. Importing them before the child is
+# locked down means their source files never need to be opened afterwards.
+import bisect  # noqa: F401
+import collections  # noqa: F401
+import functools  # noqa: F401
+import heapq  # noqa: F401
+import itertools  # noqa: F401
+import math  # noqa: F401
+import re  # noqa: F401
+import string  # noqa: F401
+import typing  # noqa: F401
+
+MAX_OUTPUT_CHARS = 2000
+
+# Audit events that are never allowed once candidate code starts running
+BLOCKED_EVENT_PREFIXES = (
+    "socket.",
+    "subprocess.",
+    "os.system",
+    "os.exec",
+    "os.posix_spawn",
+    "os.spawn",
+    "os.fork",
+    "os.forkpty",
+    "os.kill",
+    "os.remove",
+    "os.rmdir",
+    "os.rename",
+    "os.chmod",
+    "os.chown",
+    "os.putenv",
+    "shutil.",
+    "ctypes.",
+    "urllib.",
+    "http.",
+    "ftplib.",
+    "smtplib.",
+    "webbrowser.",
+)
+
+# Only the interpreter's own files may be opened (read-only) by candidate code
+READABLE_PREFIXES = tuple({sys.base_prefix, sys.prefix})
+
+# Syscalls that fail with EPERM in the child, per architecture: process
+# creation and exec, networking, signals to other processes, tracing,
+# namespaces and mounts, filesystem changes, raising rlimits, kernel interfaces
+DENIED_SYSCALLS = {
+    "x86_64": (
+        56, 57, 58, 435, 59, 322,  # clone fork vfork clone3 execve execveat
+        41, 53, 42, 49, 50, 43, 288, 44, 46, 307,  # socket socketpair connect bind listen accept accept4 sendto sendmsg sendmmsg
+        62, 200, 234, 101, 310, 311,  # kill tkill tgkill ptrace process_vm_readv/writev
+        272, 308, 165, 166, 155, 161,  # unshare setns mount umount2 pivot_root chroot
+        85, 87, 263, 82, 264, 316, 83, 258, 84, 86, 265, 88, 266,  # creat unlink(at) rename(at/at2) mkdir(at) rmdir link(at) symlink(at)
+        90, 91, 268, 452, 92, 93, 94, 260, 76, 77, 133, 259,  # chmod family, chown family, truncate ftruncate mknod(at)
+        437, 304, 160, 302, 425, 321, 298, 248, 249, 250, 175, 313, 176,  # openat2 open_by_handle_at setrlimit prlimit64 io_uring bpf perf keys modules
+    ),
+    "aarch64": (
+        220, 435, 221, 281,  # clone clone3 execve execveat
+        198, 199, 203, 200, 201, 202, 242, 206, 211, 269,  # socket socketpair connect bind listen accept accept4 sendto sendmsg sendmmsg
+        129, 130, 131, 117, 270, 271,  # kill tkill tgkill ptrace process_vm_readv/writev
+        97, 268, 40, 39, 41, 51,  # unshare setns mount umount2 pivot_root chroot
+        35, 38, 276, 34, 37, 36,  # unlinkat renameat renameat2 mkdirat linkat symlinkat
+        52, 53, 452, 55, 54, 45, 46, 33,  # fchmod fchmodat fchmodat2 fchown fchownat truncate ftruncate mknodat
+        437, 265, 164, 261, 425, 280, 241, 217, 218, 219, 105, 273, 106,  # openat2 open_by_handle_at setrlimit prlimit64 io_uring bpf perf keys modules
+    ),
+}
+# (syscall, index of its flags argument) for opens that are only allowed read-only
+OPEN_SYSCALLS = {"x86_64": ((2, 1), (257, 2)), "aarch64": ((56, 2),)}
+AUDIT_ARCH = {"x86_64": 0xC000003E, "aarch64": 0xC00000B7}
+# x32 syscalls on x86_64 have this bit set; none are allowed
+X32_SYSCALL_BIT = 0x40000000
+WRITE_OPEN_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_TRUNC
+
+PR_SET_NO_NEW_PRIVS = 38
+PR_SET_SECCOMP = 22
+SECCOMP_MODE_FILTER = 2
+SECCOMP_RET_KILL_PROCESS = 0x80000000
+SECCOMP_RET_ERRNO = 0x00050000
+SECCOMP_RET_ALLOW = 0x7FFF0000
+BPF_LD_W_ABS = 0x20
+BPF_JEQ_K = 0x15
+BPF_JGE_K = 0x35
+BPF_JSET_K = 0x45
+BPF_RET_K = 0x06
+# Offsets into struct seccomp_data
+SECCOMP_DATA_NR = 0
+SECCOMP_DATA_ARCH = 4
+SECCOMP_DATA_ARGS = 16
+
+
+class SandboxUnavailable(Exception):
+    """Raised when the seccomp filter can't be installed on this host"""
+
+
+def apply_limits(limits):
+    """Apply CPU, memory, file-size and process-count rlimits to the current process."""
+    cpu_seconds = int(limits.get("cpu_seconds", 2))
+    memory_bytes = int(limits.get("memory_mb", 256)) * 1024 * 1024
+
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    # Not enforced for root; the seccomp filter blocks fork/clone regardless
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+
+def seccomp_program(machine):
+    """
+    Assemble the seccomp BPF filter for an architecture.
+
+    Returns:
+        List of (code, jt, jf, k) instructions
+    """
+    program = [
+        (BPF_LD_W_ABS, 0, 0, SECCOMP_DATA_ARCH),
+        (BPF_JEQ_K, 1, 0, AUDIT_ARCH[machine]),
+        (BPF_RET_K, 0, 0, SECCOMP_RET_KILL_PROCESS),
+        (BPF_LD_W_ABS, 0, 0, SECCOMP_DATA_NR),
+    ]
+    # Jumps are relative, so targets are resolved once the length is known
+    jumps = []
+    if machine == "x86_64":
+        jumps.append((len(program), "deny", BPF_JGE_K, X32_SYSCALL_BIT))
+        program.append(None)
+    for nr in DENIED_SYSCALLS[machine]:
+        jumps.append((len(program), "deny", BPF_JEQ_K, nr))
+        program.append(None)
+    for nr, flags_arg in OPEN_SYSCALLS[machine]:
+        # Not this syscall: skip to the next check
+        program.append((BPF_JEQ_K, 0, 2, nr))
+        program.append((BPF_LD_W_ABS, 0, 0, SECCOMP_DATA_ARGS + 8 * flags_arg))
+        jumps.append((len(program), "deny_or_allow", BPF_JSET_K, WRITE_OPEN_FLAGS))
+        program.append(None)
+    program.append((BPF_RET_K, 0, 0, SECCOMP_RET_ALLOW))
+    deny = len(program)
+    program.append((BPF_RET_K, 0, 0, SECCOMP_RET_ERRNO | errno.EPERM))
+
+    for index, kind, code, k in jumps:
+        to_deny = deny - index - 1
+        if kind == "deny":
+            program[index] = (code, to_deny, 0, k)
+        else:
+            # The accumulator now holds the flags, so both outcomes return
+            program[index] = (code, to_deny, to_deny - 1, k)
+    return program
+
+
+def install_seccomp():
+    """
+    Install the seccomp filter on the current process (and any threads it
+    would start). It can't be removed or loosened afterwards.
+
+    Raises:
+        SandboxUnavailable: On non-Linux hosts, unknown architectures, or
+            kernels without seccomp filter support
+    """
+    machine = platform.machine()
+    if sys.platform != "linux" or machine not in DENIED_SYSCALLS:
+        raise SandboxUnavailable(f"seccomp is not supported on {sys.platform}/{machine}")
+
+    program = seccomp_program(machine)
+    filters = b"".join(struct.pack("HBBI", *instruction) for instruction in program)
+    buffer = ctypes.create_string_buffer(filters)
+
+    class SockFprog(ctypes.Structure):
+        _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+    fprog = SockFprog(len(program), ctypes.addressof(buffer))
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0) != 0:
+        raise SandboxUnavailable(f"PR_SET_NO_NEW_PRIVS failed: {os.strerror(ctypes.get_errno())}")
+    if libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(fprog), 0, 0) != 0:
+        raise SandboxUnavailable(f"PR_SET_SECCOMP failed: {os.strerror(ctypes.get_errno())}")
+
+
+def _audit_hook(event, args):
+    if event.startswith(BLOCKED_EVENT_PREFIXES):
+        raise PermissionError(f"'{event}' is not allowed in the sandbox")
+
+    if event == "open":
+        path, mode = args[0], args[1]
+        writable = isinstance(mode, str) and any(c in mode for c in "wax+")
+        if isinstance(path, int):
+            return
+        if writable or not str(path).startswith(READABLE_PREFIXES):
+            raise PermissionError("File access is not allowed in the sandbox")
+
+
+def lock_down(allow_unconfined=False):
+    """
+    Install the seccomp filter, then the audit hook. Neither can be removed.
+
+    Args:
+        allow_unconfined: Carry on with only the audit hook where seccomp is
+            unavailable (local development on macOS); never in production
+    """
+    try:
+        install_seccomp()
+    except SandboxUnavailable:
+        if not allow_unconfined:
+            raise
+    sys.addaudithook(_audit_hook)
+
+
+def isolate_fds(keep_fd):
+    """Point fds 0-2 at /dev/null and close every other fd except keep_fd."""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.closerange(3, keep_fd)
+    os.closerange(keep_fd + 1, resource.getrlimit(resource.RLIMIT_NOFILE)[0])
+
+
+def write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def read_all(fd, deadline):
+    """Read from fd until EOF or the deadline passes. Returns (bytes, timed_out)."""
+    chunks = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return b"".join(chunks), True
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks), False
+        chunks.append(chunk)
+
+
+def find_entry_point(tree, input_names):
+    """
+    Pick the function to call for the test cases.
+
+    Prefers methods of a `Solution` class (LeetCode style), then top-level
+    functions. Among those, a function whose parameters match the test case
+    input names wins, then one with the same arity, then the first one found.
+
+    Returns:
+        Tuple of (class_name or None, function_name, params) or None if nothing is callable
+    """
+    candidates = []
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Solution":
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and not item.name.startswith("_"):
+                    params = [a.arg for a in item.args.args][1:]
+                    candidates.append(("Solution", item.name, params))
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+            params = [a.arg for a in node.args.args]
+            candidates.append((None, node.name, params))
+
+    if not candidates:
+        return None
+
+    wanted = set(input_names)
+    for candidate in candidates:
+        if set(candidate[2]) == wanted:
+            return candidate
+    for candidate in candidates:
+        if len(candidate[2]) == len(wanted):
+            return candidate
+
+    return candidates[0]
+
+
+def _normalize(value):
+    """Round-trip through JSON so tuples compare equal to lists, etc."""
+    return json.loads(json.dumps(value, default=repr))
+
+
+def _report(fd, record):
+    write_all(fd, (json.dumps(record, default=repr) + "\n").encode())
+
+
+def run_candidate(tree, entry, inputs, out_fd):
+    """
+    Child side: load the code, then call its entry point once per case,
+    reporting one JSON line per case to out_fd. Runs after lock_down().
+
+    Args:
+        tree: Parsed candidate code
+        entry: (class_name or None, function_name, params) from find_entry_point
+        inputs: Each case's {name: value} inputs (the expected outputs stay in the parent)
+        out_fd: Pipe to the parent
+    """
+    class_name, func_name, params = entry
+    namespace = {"__name__": "__sandbox__"}
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            exec(compile(tree, "<candidate>", "exec"), namespace)
+        target = namespace[class_name]() if class_name else namespace
+        func = getattr(target, func_name) if class_name else namespace[func_name]
+    except BaseException as e:  # candidate code may raise anything, even SystemExit
+        _report(out_fd, {"load_error": f"{type(e).__name__}: {e}"})
+        return
+
+    for index, case_inputs in enumerate(inputs):
+        stdout = io.StringIO()
+        record = {"index": index, "actual": None, "error": None}
+
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                if set(case_inputs) == set(params):
+                    actual = func(**case_inputs)
+                else:
+                    actual = func(*case_inputs.values())
+            record["actual"] = _normalize(actual)
+        except MemoryError:
+            record["error"] = "MemoryError: memory limit exceeded"
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        record["stdout"] = stdout.getvalue()[:MAX_OUTPUT_CHARS]
+        _report(out_fd, record)
+
+
+def grade(data, cases, entry):
+    """
+    Parent side: compare what the child reported with the expected outputs.
+
+    The child's output is candidate-controlled, so it is only read for the
+    values the entry point returned; anything malformed counts as no result.
+
+    Returns:
+        Result dict, or None if the child reported nothing usable
+    """
+    load_error = None
+    records = {}
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        if load_error is None and record.get("load_error"):
+            load_error = str(record["load_error"])[:MAX_OUTPUT_CHARS]
+        index = record.get("index")
+        if type(index) is int and 0 <= index < len(cases):
+            records.setdefault(index, record)
+
+    if not records:
+        if load_error:
+            return {"ok": False, "error": load_error, "results": []}
+        return None
+
+    results = []
+    for index, case in enumerate(cases):
+        expected = case.get("output")
+        record = records.get(index)
+        if record is None:
+            error = "No result (the run stopped early)"
+        else:
+            error = str(record["error"])[:MAX_OUTPUT_CHARS] if record.get("error") else None
+        actual = record.get("actual") if record is not None and error is None else None
+        duration_ms = record.get("duration_ms") if record is not None else None
+        results.append(
+            {
+                "index": index,
+                "input": case.get("input") or {},
+                "expected": expected,
+                "actual": actual,
+                "passed": error is None and actual == _normalize(expected),
+                "error": error,
+                "duration_ms": duration_ms if isinstance(duration_ms, (int, float)) else 0.0,
+                "stdout": str(record.get("stdout") or "")[:MAX_OUTPUT_CHARS] if record is not None else "",
+            }
+        )
+
+    class_name, func_name, _ = entry
+    return {
+        "ok": True,
+        "error": None,
+        "entry_point": f"{class_name}.{func_name}" if class_name else func_name,
+        "results": results,
+        "limit_breached": any(
+            r["error"] and ("MemoryError" in r["error"] or r["error"].startswith("No result")) for r in results
+        ),
+    }
+
+
+def _wait(pid, deadline):
+    """waitpid, killing the child if it is still running at the deadline. Returns (status, timed_out)."""
+    while True:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return status, False
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            return os.waitpid(pid, 0)[1], True
+        time.sleep(0.005)
+
+
+def execute_job(job):
+    """
+    Run a job's code in a locked-down child and grade what it returns.
+
+    Args:
+        job: {"code", "cases", "limits", "workdir", "wall_seconds", "allow_unconfined"}
+
+    Returns:
+        Dict with ok, error (compile/load/limit error), entry_point and
+        per-case results; limit_breached is set when a resource limit was hit
+    """
+    code = job.get("code", "")
+    cases = job.get("cases") or []
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return {"ok": False, "error": f"SyntaxError: {e.msg} (line {e.lineno})", "results": []}
+    except (ValueError, RecursionError, MemoryError) as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}", "results": []}
+
+    input_names = list((cases[0].get("input") or {}).keys()) if cases else []
+    entry = find_entry_point(tree, input_names)
+    if entry is None:
+        return {"ok": False, "error": "No function found to test", "results": []}
+
+    wall_seconds = float(job.get("wall_seconds", 5))
+    deadline = time.monotonic() + wall_seconds
+    inputs = [case.get("input") or {} for case in cases]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:  # child: nothing here may be trusted once candidate code has run
+        try:
+            os.close(read_fd)
+            isolate_fds(write_fd)
+            os.chdir(job.get("workdir") or "/")
+            apply_limits(job.get("limits") or {})
+            lock_down(bool(job.get("allow_unconfined")))
+            run_candidate(tree, entry, inputs, write_fd)
+        except BaseException as e:
+            with contextlib.suppress(BaseException):
+                _report(write_fd, {"load_error": f"{type(e).__name__}: {e}"})
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    try:
+        data, timed_out = read_all(read_fd, deadline)
+    finally:
+        os.close(read_fd)
+    # The child may close its end and keep running; the deadline still applies
+    status, wait_timed_out = _wait(pid, deadline if not timed_out else 0)
+
+    # Wall-clock timeouts and lost results can come from load rather than the
+    # code, so they are marked transient and CodeRunner doesn't cache them
+    if timed_out or wait_timed_out:
+        return {
+            "ok": False,
+            "error": f"Time limit exceeded ({wall_seconds}s)",
+            "results": [],
+            "limit_breached": True,
+            "transient": True,
+        }
+    if os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+        return {
+            "ok": False,
+            "error": "CPU time limit exceeded",
+            "results": [],
+            "limit_breached": True,
+        }
+
+    result = grade(data, cases, entry)
+    if result is None:
+        return {
+            "ok": False,
+            "error": f"Sandbox exited without a result (status {status})",
+            "results": [],
+            "limit_breached": True,
+            "transient": True,
+        }
+    return result
+
+
+def main():
+    # The result goes to a dedicated fd from the caller; stdout is never read
+    result_fd = int(sys.argv[1])
+    try:
+        result = execute_job(json.loads(sys.stdin.read()))
+    except Exception as e:
+        result = {"ok": False, "error": f"Sandbox failed: {type(e).__name__}: {e}", "results": [], "transient": True}
+    write_all(result_fd, json.dumps(result, default=repr).encode())
+    os.close(result_fd)
+
+
+if __name__ == "__main__":
+    main()
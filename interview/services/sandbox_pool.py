@@ -0,0 +1,171 @@
+from django.conf import settings
+from pathlib import Path
+import json
+import logging
+import queue
+import select
+import subprocess
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+WORKER_PATH = Path(__file__).resolve().parent / "sandbox_worker.py"
+
+
+class SandboxBusy(Exception):
+    """Raised when the pool's wait queue is full or no worker frees up in time"""
+
+
+class SandboxWorker:
+    """A warm `sandbox_worker.py` process that runs jobs one at a time"""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-I", "-S", str(WORKER_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            env={},
+        )
+        self.runs = 0
+
+    @property
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, job, timeout):
+        """
+        Send one job and wait for its result line.
+
+        Raises:
+            TimeoutError: If the worker does not answer within `timeout` seconds
+            RuntimeError: If the worker process died
+        """
+        self.runs += 1
+        self.proc.stdin.write(json.dumps(job) + "\n")
+        self.proc.stdin.flush()
+
+        ready, _, _ = select.select([self.proc.stdout], [], [], timeout)
+        if not ready:
+            raise TimeoutError("Sandbox worker did not respond in time")
+
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError("Sandbox worker exited unexpectedly")
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=1)
+        except Exception:
+            self.proc.kill()
+
+
+class SandboxPool:
+    """
+    Pool of pre-forked, pre-imported sandbox workers.
+
+    Each worker forks a fresh child per job, so runs stay isolated while the
+    interpreter startup cost is paid once per worker. Workers are recycled
+    after `max_runs` jobs or whenever a job breaches a resource limit.
+
+    Callers wait in a bounded queue: once `max_queue` callers are already
+    waiting, new runs fail fast with SandboxBusy instead of piling up.
+    """
+
+    def __init__(self, size, max_runs=100, max_queue=32, queue_timeout=10.0):
+        self.size = size
+        self.max_runs = max_runs
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._closed = False
+
+        for _ in range(size):
+            self._idle.put(SandboxWorker())
+
+    @property
+    def queue_depth(self):
+        """Number of callers currently waiting for a worker"""
+        return self._waiting
+
+    def run(self, job, timeout):
+        """
+        Run a job on the next idle worker.
+
+        Args:
+            job: Harness job dict (code, cases, limits, workdir, wall_seconds)
+            timeout: Seconds to wait for the worker's answer
+
+        Raises:
+            SandboxBusy: If the wait queue is full or no worker became free in time
+        """
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise SandboxBusy("Sandbox queue is full")
+            self._waiting += 1
+
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise SandboxBusy("No sandbox worker became available")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        result = None
+        try:
+            result = worker.run(job, timeout)
+            return result
+        finally:
+            self._release(worker, result)
+
+    def _release(self, worker, result):
+        breached = result is None or result.get("limit_breached")
+        if not self._closed and worker.alive and not breached and worker.runs < self.max_runs:
+            self._idle.put(worker)
+            return
+
+        # Spawn the replacement off the request path
+        worker.close()
+        if not self._closed:
+            threading.Thread(target=self._replace, daemon=True).start()
+
+    def _replace(self):
+        try:
+            self._idle.put(SandboxWorker())
+        except Exception as e:
+            logger.error(f"Could not start replacement sandbox worker: {e}")
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use (None if disabled)"""
+    global _pool
+    if settings.CODE_RUNNER_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool(
+                size=settings.CODE_RUNNER_POOL_SIZE,
+                max_runs=settings.CODE_RUNNER_POOL_MAX_RUNS,
+                max_queue=settings.CODE_RUNNER_POOL_MAX_QUEUE,
+            )
+        return _pool
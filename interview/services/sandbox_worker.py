@@ -0,0 +1,51 @@
+"""
+Warm sandbox worker process.
+
+Started once by SandboxPool and reused for many runs, so interpreter startup
+and module imports are paid once instead of per run. Jobs arrive as one JSON
+object per line on stdin and one JSON result line is written back to stdout.
+
+This process never runs candidate code itself: sandbox_harness.execute_job()
+forks a child per job, which gets /dev/null as stdin/stdout/stderr before it
+is locked down, so it can neither read the next job nor write a result line.
+Like the harness, this file must not import Django.
+"""
+
+import json
+import os
+import signal
+import sys
+
+# `python -I` does not put the script directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sandbox_harness  # noqa: E402
+
+
+def run_job(job):
+    """Run one job in a locked-down child and return its graded result."""
+    try:
+        return sandbox_harness.execute_job(job)
+    except Exception as e:
+        return {
+            "ok": False,
+            "error": f"Sandbox failed: {type(e).__name__}: {e}",
+            "results": [],
+            "limit_breached": True,
+            "transient": True,
+        }
+
+
+def main():
+    # The pool stops workers by closing stdin; ignore Ctrl+C aimed at the parent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = run_job(json.loads(line))
+        sys.stdout.write(json.dumps(result, default=repr) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Response schema (OpenAPI subset understood by Gemini's response_schema).
+# Questions can't have one: test case inputs are free-form objects, which
+# response_schema can't express, so they use plain JSON mode and
+# validate_question() instead.
+SCORE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "feedback": {"type": "string"},
+    },
+    "required": ["score", "feedback"],
+}
+
+DEFAULT_FEEDBACK = "Interview completed. Feedback will be provided shortly."
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class JsonStreamParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed it text chunks as they arrive; every top-level field is returned as
+    soon as its value is complete, so e.g. a question's title can be checked
+    long before the statement and test cases have finished streaming.
+
+    A top-level array works the same way: each element is returned (keyed by
+    its index) as soon as it is complete, and collected in `items`. A malformed
+    element is recorded in `errors` and skipped without losing the others.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+        self.items = []
+        self.is_array = False
+        self.errors = []
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._field_start = None
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk: Next piece of the response text
+
+        Returns:
+            List of (key, value) pairs completed by this chunk
+        """
+        self.text += chunk
+        completed = []
+
+        while self._pos < len(self.text) and not self.done:
+            char = self.text[self._pos]
+
+            if self._field_start is None:
+                # Skip anything before the opening brace (e.g. a ```json fence)
+                if char in "{[":
+                    self.is_array = char == "["
+                    self._depth = 1
+                    self._field_start = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed += self._close_field(self._pos)
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                completed += self._close_field(self._pos)
+                self._field_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _close_field(self, end):
+        segment = self.text[self._field_start : end].strip()
+        if not segment:
+            return []
+        if self.is_array:
+            try:
+                item = json.loads(segment)
+            except json.JSONDecodeError as e:
+                self.errors.append(f"item {len(self.items) + len(self.errors)}: {e}")
+                return []
+            self.items.append(item)
+            return [(len(self.items) - 1, item)]
+        try:
+            pair = json.loads("{" + segment + "}")
+        except json.JSONDecodeError as e:
+            self.errors.append(f"{segment[:60]}: {e}")
+            return []
+        self.fields.update(pair)
+        return list(pair.items())
+
+
+def _close_open_brackets(text):
+    """Append whatever quotes/brackets a truncated JSON document is missing"""
+    stack = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    return text + ('"' if in_string else "") + "".join(reversed(stack))
+
+
+def _json_literals(text):
+    """Python-style True/False/None to JSON (only ever tried after a parse failure)"""
+    for python, json_literal in (("True", "true"), ("False", "false"), ("None", "null")):
+        text = re.sub(rf"\b{python}\b", json_literal, text)
+    return text
+
+
+def repair_json(text):
+    """
+    Parse a model's JSON output, fixing the usual slips instead of regenerating:
+    code fences, prose around the object, trailing commas, Python literals and
+    truncation at the end of the output.
+
+    Raises:
+        ValueError: If no JSON object can be recovered
+    """
+    cleaned = _FENCE.sub("", text.strip())
+    start = cleaned.find("{")
+    if start == -1:
+        raise ValueError("No JSON object in response")
+    cleaned = cleaned[start:]
+
+    candidates = [cleaned]
+    end = cleaned.rfind("}")
+    if end != -1:
+        candidates.append(cleaned[: end + 1])
+
+    for candidate in candidates:
+        for attempt in (
+            candidate,
+            _TRAILING_COMMA.sub(r"\1", candidate),
+            _TRAILING_COMMA.sub(r"\1", _json_literals(candidate)),
+            _close_open_brackets(_TRAILING_COMMA.sub(r"\1", candidate.rstrip().rstrip(","))),
+        ):
+            try:
+                value = json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(value, dict):
+                if attempt is not candidate:
+                    logger.info("Repaired malformed JSON from model output")
+                return value
+
+    raise ValueError(f"Unrecoverable JSON in response: {text[:200]}")
+
+
+def _as_json(value):
+    """Decode a value the model sent as a JSON string instead of an object/list"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def title_key(title):
+    """Normalized title for duplicate checks ("Two-Sum " and "two sum" collide)"""
+    return re.sub(r"[^a-z0-9]+", " ", str(title).lower()).strip()
+
+
+def validate_question(data):
+    """
+    Check a generated question and repair what can be repaired.
+
+    Repairs: whitespace around the title, a single test case sent as an object,
+    test cases or inputs sent as JSON strings, and test cases that are missing
+    an input or output (dropped, as long as at least one usable case remains).
+
+    Returns:
+        (question dict, list of repairs made)
+
+    Raises:
+        ValueError: If a usable question can't be recovered
+    """
+    repairs = []
+
+    title = data.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("Question has no title")
+    if title != title.strip():
+        repairs.append("stripped title")
+    title = title.strip()[:300]
+
+    statement = data.get("statement")
+    if not isinstance(statement, str) or not statement.strip():
+        raise ValueError("Question has no statement")
+
+    test_cases = _as_json(data.get("test_cases"))
+    if isinstance(test_cases, dict):
+        test_cases = [test_cases]
+        repairs.append("wrapped single test case in a list")
+    if not isinstance(test_cases, list):
+        raise ValueError("Question has no test cases")
+
+    valid_cases = []
+    for case in test_cases:
+        case = _as_json(case)
+        if not isinstance(case, dict) or "output" not in case:
+            repairs.append("dropped test case without output")
+            continue
+        case_input = _as_json(case.get("input"))
+        if not isinstance(case_input, dict):
+            repairs.append("dropped test case without input object")
+            continue
+        if case_input is not case.get("input"):
+            repairs.append("decoded test case input")
+        valid_cases.append(dict(case, input=case_input))
+
+    if not valid_cases:
+        raise ValueError("Question has no usable test cases")
+
+    question = dict(data, title=title, statement=statement, test_cases=valid_cases)
+    return question, repairs
+
+
+def validate_score(data):
+    """
+    Coerce a scoring response into {"score": int 0-100, "feedback": str}.
+
+    Scores like "85", 85.5 or "85/100" are read as numbers, list or dict
+    feedback is flattened, and missing feedback gets the default. A score is
+    never invented: callers decide whether a placeholder is acceptable.
+
+    Returns:
+        (score dict, list of repairs made)
+
+    Raises:
+        ValueError: If the score is missing or unreadable
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Scoring response is not an object")
+    repairs = []
+
+    score = data.get("score")
+    if isinstance(score, bool) or score is None:
+        raise ValueError("Scoring response has no score")
+    if not isinstance(score, (int, float)):
+        match = _NUMBER.search(str(score))
+        if not match:
+            raise ValueError(f"Unreadable score {score!r}")
+        repairs.append(f"parsed score from {score!r}")
+        score = float(match.group())
+    score = max(0, min(100, int(round(score))))
+
+    feedback = data.get("feedback")
+    if isinstance(feedback, list):
+        feedback = " ".join(str(item) for item in feedback)
+        repairs.append("joined feedback list")
+    elif isinstance(feedback, dict):
+        feedback = " ".join(f"{key}: {value}" for key, value in feedback.items())
+        repairs.append("flattened feedback object")
+    if not isinstance(feedback, str) or not feedback.strip():
+        repairs.append("missing feedback")
+        feedback = DEFAULT_FEEDBACK
+
+    return {"score": score, "feedback": feedback.strip()}, repairs
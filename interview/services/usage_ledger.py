@@ -0,0 +1,160 @@
+"""
+Per-call cost and latency ledger.
+
+Model and TTS calls report what they cost to the UsageLedger, which buffers
+records in memory and writes them with one bulk_create per batch from a
+background thread, so the request path never waits on the database.
+
+Records are attributed to the interview (and round) bound with usage_scope()
+by whoever makes the calls; the scope is a ContextVar, so it follows calls
+onto hedged threads (see resilience.hedged_call).
+"""
+
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+import atexit
+import contextvars
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+KIND_MODEL = "model"
+KIND_TTS = "tts"
+
+_current_scope = contextvars.ContextVar("usage_scope", default=(None, None))
+
+
+@contextmanager
+def usage_scope(interview_id=None, round_id=None):
+    """
+    Attribute calls made inside the block to an interview and/or round.
+
+    The round can be left out when the interview is known; it is looked up
+    when the records are written.
+    """
+    token = _current_scope.set((interview_id, round_id))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+class UsageLedger:
+    """Buffers usage records and writes them in batches on a background thread"""
+
+    def __init__(self, batch_size=None, flush_seconds=None, max_buffer=None):
+        self.batch_size = batch_size or settings.USAGE_LEDGER_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.USAGE_LEDGER_FLUSH_SECONDS
+        self.max_buffer = max_buffer or settings.USAGE_LEDGER_MAX_BUFFER
+        self._buffer = []
+        self._lock = threading.Lock()
+        # Serializes flushes (the background thread and atexit/explicit calls)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="usage-ledger", daemon=True)
+        self._thread.start()
+
+    def record(
+        self,
+        kind,
+        call_type="",
+        model="",
+        input_tokens=0,
+        output_tokens=0,
+        characters=0,
+        latency_ms=0.0,
+        outcome="ok",
+    ):
+        """Queue one call's usage; never blocks on the database"""
+        interview_id, round_id = _current_scope.get()
+        entry = {
+            "interview_id": interview_id,
+            "round_id": round_id,
+            "kind": kind,
+            "call_type": call_type,
+            "model": model or "",
+            "input_tokens": max(0, int(input_tokens or 0)),
+            "output_tokens": max(0, int(output_tokens or 0)),
+            "characters": max(0, int(characters or 0)),
+            "latency_ms": round(latency_ms, 3),
+            "outcome": outcome,
+            "created_at": timezone.now(),
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) > self.max_buffer:
+                # The database has been unreachable for a while; keep the newest
+                dropped = len(self._buffer) - self.max_buffer
+                del self._buffer[:dropped]
+                logger.warning(f"Usage ledger buffer full, dropped {dropped} records")
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Write everything buffered so far.
+
+        Returns:
+            Number of records written
+        """
+        from interview.models import Interview, UsageRecord
+
+        with self._flush_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+
+            try:
+                # Fill in rounds for interview-scoped calls, and drop references to
+                # interviews deleted meanwhile (the FK would fail the whole batch)
+                interview_ids = {e["interview_id"] for e in entries if e["interview_id"]}
+                rounds = {}
+                if interview_ids:
+                    rounds = dict(
+                        Interview.objects.filter(id__in=interview_ids).values_list("id", "round_id")
+                    )
+                for entry in entries:
+                    if entry["interview_id"] not in rounds:
+                        entry["interview_id"] = None
+                    elif not entry["round_id"]:
+                        entry["round_id"] = rounds[entry["interview_id"]]
+
+                UsageRecord.objects.bulk_create(
+                    [UsageRecord(**entry) for entry in entries], batch_size=self.batch_size
+                )
+            except Exception as e:
+                logger.error(f"Could not write {len(entries)} usage records: {e}")
+                with self._lock:
+                    self._buffer[:0] = entries
+                    del self._buffer[: max(0, len(self._buffer) - self.max_buffer)]
+                return 0
+            return len(entries)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                # This thread's connection would otherwise outlive CONN_MAX_AGE
+                connections.close_all()
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """Return the process-wide UsageLedger, starting its writer thread on first use"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+            atexit.register(_ledger.flush)
+        return _ledger
@@ -0,0 +1,213 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from cand.models import Candidate
+from interview.mocks import MOCK_QUESTION
+from interview.models import Interview, Question, Role, Round
+from interview.services import recording_storage
+
+# Pages render without a collectstatic run (the manifest storage needs one)
+PLAIN_STATIC_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Wall-time baselines, saved locally like pytest-benchmark's: run the suite with
+# VIEW_BENCHMARK_SAVE=True to write them, later runs compare against them
+BENCHMARK_BASELINE = os.environ.get(
+    "VIEW_BENCHMARK_BASELINE", os.path.join(settings.BASE_DIR, ".benchmarks", "views.json")
+)
+BENCHMARK_SAVE = os.environ.get("VIEW_BENCHMARK_SAVE", "False") == "True"
+# Timed requests per view; 0 turns timing off
+BENCHMARK_RUNS = int(os.environ.get("VIEW_BENCHMARK_RUNS", "10"))
+# A view fails when its median is this much slower than baseline (0.5 = +50%)
+BENCHMARK_TOLERANCE = float(os.environ.get("VIEW_BENCHMARK_TOLERANCE", "0.5"))
+# Sub-millisecond views are noisy: smaller slowdowns are ignored
+BENCHMARK_MIN_DELTA_MS = float(os.environ.get("VIEW_BENCHMARK_MIN_DELTA_MS", "1.0"))
+
+
+def seed_interviews(roles=20, rounds_per_role=3, candidates=200, questions_per_round=5):
+    """
+    Roles, rounds, questions and interviews for view tests. The defaults (60
+    rounds, ~3000 interviews) are large enough that a query per row (an N+1)
+    shows up in both the query counts and the wall time.
+
+    Returns:
+        Dict of ids to fill view paths with: role, round and interview (an
+        unfinished interview of the first candidate, whom the views act as)
+    """
+    users = User.objects.bulk_create(
+        [User(username=f"seed{i}", first_name="Seed", last_name=str(i)) for i in range(candidates)]
+    )
+    candidate_rows = Candidate.objects.bulk_create([Candidate(user=user) for user in users])
+    role_rows = Role.objects.bulk_create([Role(title=f"Role {i}", description="Seeded role") for i in range(roles)])
+    rounds = Round.objects.bulk_create(
+        [
+            Round(
+                role=role,
+                round_number=number,
+                name=f"Round {number}",
+                data_structures="arrays, hash maps",
+                success_metrics="Correctness, Communication",
+            )
+            for role in role_rows
+            for number in range(1, rounds_per_role + 1)
+        ]
+    )
+    questions = Question.objects.bulk_create(
+        [
+            Question(
+                round=round,
+                title=f"{MOCK_QUESTION['title']} {round.id}-{i}",
+                statement=MOCK_QUESTION["statement"],
+                test_cases=MOCK_QUESTION["test_cases"],
+            )
+            for round in rounds
+            for i in range(questions_per_round)
+        ]
+    )
+
+    now = timezone.now()
+    interviews = []
+    for index, candidate in enumerate(candidate_rows):
+        for round in rounds[index % 4 :: 4]:
+            completed = (index + round.id) % 3 != 0
+            interviews.append(
+                Interview(
+                    candidate=candidate,
+                    round=round,
+                    question=questions[(round.id * 7 + index) % len(questions)],
+                    score=(index * 37 + round.id) % 101 if completed else 0,
+                    notes="Seeded feedback" if completed else "",
+                    completed_at=now if completed else None,
+                )
+            )
+    Interview.objects.bulk_create(interviews)
+
+    first = Candidate.objects.order_by("id").first()
+    pending = Interview.objects.filter(candidate=first, completed_at__isnull=True).first()
+    return {"role": rounds[0].role_id, "round": rounds[0].id, "interview": pending.id}
+
+
+def load_baseline():
+    if not os.path.exists(BENCHMARK_BASELINE):
+        return {}
+    with open(BENCHMARK_BASELINE) as f:
+        return json.load(f)
+
+
+def save_baseline(timings):
+    """Merges per-view medians into the baseline file (each app's tests save their own views)"""
+    baseline = load_baseline()
+    baseline.update(timings)
+    os.makedirs(os.path.dirname(BENCHMARK_BASELINE), exist_ok=True)
+    with open(BENCHMARK_BASELINE, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class ViewBudgetTestCase(TestCase):
+    """
+    Renders pages against seed_interviews() data.
+
+    The expected query counts are constants on purpose: a count that grows
+    with the data (an N+1 like round.interviews.count in a loop) breaks them.
+    Median wall time is compared with the saved baseline, if there is one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ids = seed_interviews()
+
+    def assertViewBudgets(self, views):
+        """
+        Args:
+            views: (path template, queries) pairs; paths are filled from seed_interviews()
+        """
+        baseline = {} if BENCHMARK_SAVE else load_baseline()
+        timings = {}
+        for template, queries in views:
+            path = template.format(**self.ids)
+            with self.subTest(path=path):
+                # The first request also warms template and URL caches
+                with self.assertNumQueries(queries):
+                    response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                if not BENCHMARK_RUNS:
+                    continue
+
+                timings[template] = self.median_ms(path)
+                previous = baseline.get(template)
+                if previous is not None:
+                    limit = max(previous * (1 + BENCHMARK_TOLERANCE), previous + BENCHMARK_MIN_DELTA_MS)
+                    self.assertLessEqual(
+                        timings[template],
+                        limit,
+                        f"{path}: median {timings[template]:.2f}ms vs baseline {previous:.2f}ms",
+                    )
+        if BENCHMARK_SAVE and timings:
+            save_baseline(timings)
+
+    def median_ms(self, path):
+        timings = []
+        for _ in range(BENCHMARK_RUNS):
+            started = time.perf_counter()
+            self.client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        return round(statistics.median(timings), 3)
+
+
+class RecordingStorageMixin:
+    """Points recording storage at a temporary directory for the test"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(
+            recording_storage, "_storage", recording_storage.LocalRecordingStorage(directory.name)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+def make_interview(started_minutes_ago=5, time_limit=30, **fields):
+    user = User.objects.create(username=f"candidate{User.objects.count()}")
+    round = Round.objects.create(
+        role=Role.objects.create(title="Backend"), round_number=1, name="Coding", time_limit=time_limit
+    )
+    return Interview.objects.create(
+        candidate=Candidate.objects.create(user=user),
+        round=round,
+        started_at=timezone.now() - timedelta(minutes=started_minutes_ago),
+        **fields,
+    )
+
+
+class UploadTestMixin(RecordingStorageMixin):
+    """An interview to upload recordings for, and requests against the upload API"""
+
+    def setUp(self):
+        super().setUp()
+        self.interview = make_interview()
+
+    def create(self, kind="screen", session="a" * 32, **fields):
+        return self.client.post(
+            "/interview/api/uploads/",
+            json.dumps({"interview_id": self.interview.id, "kind": kind, "session": session, **fields}),
+            content_type="application/json",
+        )
+
+    def patch(self, url, offset, data):
+        return self.client.generic(
+            "PATCH", url, data, content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET=str(offset)
+        )
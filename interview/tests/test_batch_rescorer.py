@@ -0,0 +1,120 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+from unittest import mock
+import json
+import os
+import tempfile
+
+from interview.models import Interview
+from interview.services.batch_rescorer import BatchRescorer, Checkpoint, without_transcript
+from interview.services.llm_providers import FakeProvider
+from interview.services.rate_limiter import LocalBackend, RateLimiter
+from interview.tests import make_interview
+
+TURN = {"code": "def solve(): pass", "statement": "I'll start simple", "reply": "Go on"}
+
+
+class BatchRescorerTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint_path = os.path.join(directory.name, "checkpoint.json")
+        self.interviews = []
+        for _ in range(3):
+            interview = make_interview(completed_at=timezone.now(), transcript=[TURN])
+            interview.round.success_metrics = "Correctness, Communication"
+            interview.round.save()
+            self.interviews.append(interview)
+
+    def rescorer(self):
+        return BatchRescorer(
+            workers=2,
+            batch_size=2,
+            checkpoint_path=self.checkpoint_path,
+            provider=FakeProvider(latency="constant:0"),
+        )
+
+    def run_with(self, score):
+        with mock.patch.object(BatchRescorer, "score", side_effect=score):
+            return self.rescorer().run(Interview.objects.all())
+
+    def test_scores_are_written_and_checkpointed(self):
+        summary = self.run_with(lambda interview: {"score": 150, "feedback": f"Scored {interview.id}"})
+
+        self.assertEqual(summary, {"total": 3, "scored": 3, "skipped": 0, "failed": 0, "no_transcript": 0})
+        for interview in self.interviews:
+            interview.refresh_from_db()
+            self.assertEqual(interview.score, 100)
+            self.assertEqual(interview.notes, f"Scored {interview.id}")
+        with open(self.checkpoint_path) as f:
+            self.assertEqual(len(json.load(f)["done"]), 3)
+
+    def test_resumes_with_the_failed_interviews(self):
+        failing = self.interviews[0].id
+
+        def flaky(interview):
+            if interview.id == failing:
+                raise RuntimeError("model unavailable")
+            return {"score": 80, "feedback": "Good"}
+
+        first = self.run_with(flaky)
+        self.assertEqual((first["scored"], first["failed"]), (2, 1))
+
+        scored = []
+        second = self.run_with(lambda interview: scored.append(interview.id) or {"score": 60, "feedback": "Ok"})
+        self.assertEqual((second["scored"], second["skipped"], second["failed"]), (1, 2, 0))
+        self.assertEqual(scored, [failing])
+
+    def test_changed_metrics_are_scored_again(self):
+        self.run_with(lambda interview: {"score": 80, "feedback": "Good"})
+        round = self.interviews[1].round
+        round.success_metrics = "Correctness, Code Quality"
+        round.save()
+
+        summary = self.run_with(lambda interview: {"score": 70, "feedback": "Fine"})
+        self.assertEqual((summary["scored"], summary["skipped"]), (1, 2))
+
+    def test_interviews_without_a_transcript_are_counted(self):
+        make_interview(completed_at=timezone.now())
+        make_interview()  # Not finished: neither scored nor counted
+
+        self.assertEqual(without_transcript(Interview.objects.all()), 1)
+        summary = self.run_with(lambda interview: {"score": 80, "feedback": "Good"})
+        self.assertEqual((summary["total"], summary["no_transcript"]), (3, 1))
+
+    def test_replays_the_transcript_before_scoring(self):
+        rescorer = self.rescorer()
+        # No limits: the db bucket can't be reached from the provider-call thread inside a test transaction
+        unlimited = RateLimiter("gemini", None, LocalBackend())
+        with (
+            mock.patch("interview.services.gemini_service.get_limiter", return_value=unlimited),
+            mock.patch("interview.services.batch_rescorer.GeminiService.replay_turns") as replay,
+        ):
+            result = rescorer.score(self.interviews[0])
+
+        replay.assert_called_once_with([TURN], self.interviews[0].id)
+        self.assertEqual(result["score"], 72)
+
+    def test_checkpoint_survives_a_restart(self):
+        Checkpoint(self.checkpoint_path).mark(self.interviews[:2])
+        checkpoint = Checkpoint(self.checkpoint_path)
+        self.assertTrue(checkpoint.is_done(self.interviews[0]))
+        self.assertFalse(checkpoint.is_done(self.interviews[2]))
+
+        checkpoint.clear()
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+
+class RescoreCommandTests(TestCase):
+    def test_reports_interviews_without_a_transcript(self):
+        make_interview(completed_at=timezone.now())
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            call_command(
+                "rescore_interviews", "--all", "--checkpoint", os.path.join(directory, "checkpoint.json"), stdout=out
+            )
+
+        self.assertIn("0 interviews: 0 re-scored", out.getvalue())
+        self.assertIn("1 completed interviews have no stored transcript", out.getvalue())
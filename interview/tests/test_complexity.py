@@ -0,0 +1,100 @@
+from django.test import SimpleTestCase, override_settings
+import math
+
+from interview.services.complexity import ComplexityProfiler, analysis_cache, fit_complexity, scale_input
+from interview.services.resilience import Deadline
+
+SIZES = [256 * 2**i for i in range(7)]
+
+
+class FitComplexityTests(SimpleTestCase):
+    def test_picks_the_growth_curve(self):
+        curves = {
+            "O(1)": lambda n: 5.0,
+            "O(log n)": lambda n: math.log2(n),
+            "O(n)": lambda n: 0.01 * n,
+            "O(n log n)": lambda n: 0.001 * n * math.log2(n),
+            "O(n^2)": lambda n: 1e-6 * n * n,
+        }
+        for estimate, curve in curves.items():
+            with self.subTest(estimate=estimate):
+                self.assertEqual(fit_complexity(SIZES, [curve(n) for n in SIZES])["estimate"], estimate)
+
+    def test_noise_does_not_promote_a_linear_fit(self):
+        times = [0.01 * n * (1.1 if i % 2 else 0.9) for i, n in enumerate(SIZES)]
+        fit = fit_complexity(SIZES, times)
+        self.assertEqual(fit["estimate"], "O(n)")
+        self.assertGreater(fit["r2"], 0.9)
+        self.assertAlmostEqual(fit["exponent"], 1.0, delta=0.1)
+
+
+class ScaleInputTests(SimpleTestCase):
+    def test_grows_sequences(self):
+        scaled = scale_input({"nums": [3, 1, 2], "word": "ab", "target": 4, "flag": True}, 100)
+        self.assertEqual(len(scaled["nums"]), 100)
+        self.assertTrue(all(1 <= value <= 101 for value in scaled["nums"]))
+        self.assertEqual(scaled["word"], "ab" * 50)
+        self.assertEqual((scaled["target"], scaled["flag"]), (4, True))
+        # Same seed, same input
+        self.assertEqual(scale_input({"nums": [3, 1, 2]}, 100), scale_input({"nums": [3, 1, 2]}, 100))
+
+    def test_integers_are_the_size_without_a_sequence(self):
+        self.assertEqual(scale_input({"n": 5, "flag": False}, 1024), {"n": 1024, "flag": False})
+
+
+class StubRunner:
+    """Records each run's wall limit and reports a linear run time"""
+
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.wall_limits = []
+
+    def run(self, code, cases, use_cache=True, wall_seconds=None):
+        self.wall_limits.append(wall_seconds)
+        n = len(cases[0]["input"]["nums"])
+        if n == self.fail_at:
+            return {"ok": False, "error": "Time limit exceeded", "results": []}
+        return {"ok": True, "results": [{"duration_ms": n / 100, "error": None}] * len(cases)}
+
+
+@override_settings(
+    COMPLEXITY_MIN_N=256, COMPLEXITY_MAX_N=16384, COMPLEXITY_BUDGET_SECONDS=3, COMPLEXITY_RESERVE_SECONDS=10
+)
+class ComplexityProfilerTests(SimpleTestCase):
+    code = "def total(nums):\n    return sum(nums)"
+    cases = [{"input": {"nums": [1, 2, 3]}, "output": 6}]
+
+    def setUp(self):
+        analysis_cache.clear()
+        self.addCleanup(analysis_cache.clear)
+
+    def profile(self, runner, deadline=None):
+        return ComplexityProfiler(runner).profile(self.code, self.cases, question_id=1, deadline=deadline)
+
+    def test_profiles_until_max_n(self):
+        runner = StubRunner()
+        analysis = self.profile(runner, Deadline(25))
+        self.assertEqual(analysis["estimate"], "O(n)")
+        self.assertEqual(analysis["sizes"], SIZES)
+        # Runs never get more wall time than the profiling budget
+        self.assertTrue(all(0 < limit <= 3 for limit in runner.wall_limits))
+        # The analysis is cached for unchanged code
+        self.assertEqual(self.profile(StubRunner()), analysis)
+
+    def test_stops_at_the_first_failed_run(self):
+        analysis = self.profile(StubRunner(fail_at=4096))
+        self.assertEqual(analysis["sizes"], [256, 512, 1024, 2048])
+        analysis_cache.clear()
+        # Fewer than three sizes is not enough for a fit
+        self.assertIsNone(self.profile(StubRunner(fail_at=1024)))
+
+    def test_keeps_the_reserve_of_the_request_deadline(self):
+        runner = StubRunner()
+        # Only the reserve left: the model call gets it, profiling doesn't run
+        self.assertIsNone(self.profile(runner, Deadline(10)))
+        self.assertEqual(runner.wall_limits, [])
+        # Half a second past the reserve caps every run at that
+        runner = StubRunner()
+        self.profile(runner, Deadline(10.5))
+        self.assertTrue(runner.wall_limits)
+        self.assertTrue(all(limit <= 0.5 for limit in runner.wall_limits))
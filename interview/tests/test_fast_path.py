@@ -0,0 +1,99 @@
+from django.test import SimpleTestCase, override_settings
+from unittest import mock
+import ast
+
+from interview.services.fast_path import (
+    FALLBACK_REPLIES,
+    HINT,
+    IDLE_HINTS,
+    MODEL,
+    SKIP,
+    TurnClassifier,
+    ast_change_size,
+    fallback_reply,
+)
+from interview.services.interview_orchestrator import InterviewOrchestrator
+
+CODE = "def add(a, b):\n    return a + b\n"
+
+
+@override_settings(FAST_PATH_ENABLED=True, FAST_PATH_MIN_AST_CHANGE=3, FAST_PATH_IDLE_NUDGE_SECONDS=120)
+class TurnClassifierTests(SimpleTestCase):
+    def setUp(self):
+        self.classifier = TurnClassifier()
+        self.session = {}
+
+    def classify(self, code, transcript="", now=0.0):
+        return self.classifier.classify(code, transcript, self.session, now=now)
+
+    def test_first_code_and_speech_go_to_the_model(self):
+        self.assertEqual(self.classify(CODE)["action"], MODEL)
+        self.assertEqual(self.classify(CODE, "Should I handle negatives?")["action"], MODEL)
+
+    def test_empty_and_unchanged_code_is_skipped(self):
+        self.assertEqual(self.classify("   ")["action"], SKIP)
+        self.classify(CODE)
+        decision = self.classify("def add(a, b):  # sum\n\n    return a + b\n")
+        self.assertEqual((decision["action"], decision["reason"]), (SKIP, "unchanged apart from formatting"))
+
+    def test_minor_edits_are_skipped_and_real_ones_escalate(self):
+        self.classify(CODE)
+        self.assertEqual(self.classify(CODE.replace("a + b", "a - b"))["action"], SKIP)
+        loop = "def add(a, b):\n    total = 0\n    for x in (a, b):\n        total += x\n    return total\n"
+        self.assertEqual(self.classify(loop)["action"], MODEL)
+
+    def test_syntax_error_hint_only_once_it_persists(self):
+        broken = "def add(a, b)\n    return a + b\n"
+        self.assertEqual(self.classify(broken)["reason"], "syntax error (in progress)")
+        decision = self.classify(broken)
+        self.assertEqual(decision["action"], HINT)
+        self.assertIn("line 1", decision["reply"])
+        # Never the same hint twice in a row
+        self.assertEqual(self.classify(broken)["action"], SKIP)
+
+    def test_idle_nudge(self):
+        self.classify(CODE, now=0.0)
+        self.assertEqual(self.classify(CODE, now=60.0)["action"], SKIP)
+        decision = self.classify(CODE, now=130.0)
+        self.assertEqual(decision["action"], HINT)
+        self.assertIn(decision["reply"], IDLE_HINTS)
+        self.assertEqual(self.classify(CODE, now=200.0)["action"], SKIP)
+
+    @override_settings(FAST_PATH_ENABLED=False)
+    def test_disabled(self):
+        classifier = TurnClassifier()
+        self.assertEqual(classifier.classify("", "", {}, now=0.0)["action"], MODEL)
+
+
+class FastPathHelperTests(SimpleTestCase):
+    def test_ast_change_size(self):
+        tree = ast.parse(CODE)
+        self.assertEqual(ast_change_size(tree, ast.parse("def add(a,b): return a+b  # short")), 0)
+        self.assertEqual(ast_change_size(tree, ast.parse(CODE.replace("+", "-"))), 1)
+        self.assertEqual(ast_change_size(None, tree), len(list(ast.walk(tree))))
+
+    def test_fallback_reply_from_the_test_run(self):
+        self.assertEqual(fallback_reply(None), FALLBACK_REPLIES["untested"])
+        self.assertIn("NameError", fallback_reply({"ok": False, "error": "NameError"}))
+        self.assertIn("passing 1 of 3", fallback_reply({"ok": True, "passed": 1, "total": 3}))
+        self.assertIn("All 3 test cases pass", fallback_reply({"ok": True, "passed": 3, "total": 3}))
+
+
+@override_settings(LLM_PROVIDER="fake", ELEVENLABS_TTS_ENABLED=False, FAST_PATH_ENABLED=True)
+class OrchestratorFastPathTests(SimpleTestCase):
+    def test_fast_path_turns_skip_the_model_but_run_the_tests(self):
+        orchestrator = InterviewOrchestrator()
+        passed = {"ok": True, "error": None, "passed": 1, "total": 1, "results": [{"passed": True}]}
+        context = {"interview_id": 1, "test_cases": [{"input": {"a": 1, "b": 2}, "output": 3}]}
+        with (
+            mock.patch.object(orchestrator.code_runner, "run", return_value=passed) as run,
+            mock.patch.object(orchestrator.complexity, "profile", return_value=None),
+            mock.patch.object(orchestrator.gemini, "agent_reasoning", return_value="Nice.") as reasoning,
+        ):
+            first = orchestrator.get_ai_response(CODE, "", context)
+            second = orchestrator.get_ai_response(CODE + "\n", "", context)
+
+        self.assertEqual((first["fast_path"], first["reasoning"]), (MODEL, "Nice."))
+        self.assertEqual((second["fast_path"], second["reasoning"]), (SKIP, ""))
+        self.assertEqual(second["test_results"], passed)
+        self.assertEqual((reasoning.call_count, run.call_count), (1, 2))
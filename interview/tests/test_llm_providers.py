@@ -0,0 +1,91 @@
+from django.test import SimpleTestCase
+import json
+import random
+
+from interview.mocks import MOCK_COACHING_REPLIES, MOCK_SCORE, QUESTION_BATCH_GENERATION_PROMPT
+from interview.services.llm_providers import FakeProvider, LLMProvider, contents_text, get_provider, parse_latency
+from interview.services.structured_output import validate_question
+
+BATCH_PROMPT = QUESTION_BATCH_GENERATION_PROMPT % {
+    "count": 3,
+    "difficulty": "Medium",
+    "topics": "arrays",
+    "already_picked": "None",
+}
+
+
+class ParseLatencyTests(SimpleTestCase):
+    def test_distributions(self):
+        rng = random.Random(0)
+        self.assertEqual(parse_latency("constant:0.5")(rng), 0.5)
+        self.assertTrue(all(0.2 <= parse_latency("uniform:0.2:1.5")(rng) <= 1.5 for _ in range(100)))
+        samples = sorted(parse_latency("lognormal:0.8:0.35")(rng) for _ in range(1001))
+        self.assertAlmostEqual(samples[500], 0.8, delta=0.05)
+        with self.assertRaises(ValueError):
+            parse_latency("gaussian:1")
+
+
+class FakeProviderTests(SimpleTestCase):
+    def provider(self, seed=0):
+        return FakeProvider(latency="constant:0", seed=seed)
+
+    def test_same_seed_same_replies(self):
+        replies = [self.provider(seed=7).generate("Hello", "fake-model").text for _ in range(2)]
+        self.assertEqual(replies[0], replies[1])
+        self.assertIn(replies[0], MOCK_COACHING_REPLIES)
+
+    def test_batch_question_prompt_gets_valid_questions(self):
+        questions = json.loads(self.provider().generate(BATCH_PROMPT, "fake-model").text)
+        self.assertEqual(len(questions), 3)
+        self.assertEqual(len({question["title"] for question in questions}), 3)
+        for question in questions:
+            validate_question(question)
+
+    def test_scoring_prompt_gets_a_score(self):
+        prompt = 'Evaluate.\nRESPONSE FORMAT:\n{"score": <number 0-100>, "feedback": "..."}'
+        history = [
+            {"role": "user", "parts": [{"text": 'An earlier "score" RESPONSE FORMAT mention'}]},
+            {"role": "model", "parts": [{"text": "Okay"}]},
+            {"role": "user", "parts": [{"text": prompt}]},
+        ]
+        self.assertEqual(json.loads(self.provider().generate(history, "fake-model").text), MOCK_SCORE)
+        # Only the latest message decides the kind of answer
+        self.assertIn(self.provider().generate(history[:2], "fake-model").text, MOCK_COACHING_REPLIES)
+
+    def test_stream_matches_generate(self):
+        text = self.provider().generate("Hello", "fake-model").text
+        chunks = list(self.provider().stream("Hello", "fake-model"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), text)
+
+    def test_slower_than_the_timeout_raises(self):
+        provider = FakeProvider(latency="constant:0.2", seed=0)
+        with self.assertRaises(TimeoutError):
+            provider.generate("Hello", "fake-model", timeout=0.01)
+        with self.assertRaises(TimeoutError):
+            list(provider.stream("Hello", "fake-model", timeout=0.01))
+
+    def test_usage_is_reported(self):
+        response = self.provider().generate("x" * 400, "fake-model")
+        self.assertEqual((response.model, response.input_tokens), ("fake-model", 100))
+        self.assertGreater(response.output_tokens, 0)
+
+
+class ProviderInterfaceTests(SimpleTestCase):
+    def test_incomplete_backend_fails_at_construction(self):
+        class Partial(LLMProvider):
+            def generate(self, contents, model, timeout=None, response_format=None, **options):
+                return None
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_get_provider(self):
+        self.assertIsInstance(get_provider("fake"), FakeProvider)
+        with self.assertRaisesMessage(ValueError, "Unknown LLM provider 'nope'"):
+            get_provider("nope")
+
+    def test_contents_text(self):
+        history = [{"role": "user", "parts": [{"text": "a"}, {"text": "b"}]}, {"role": "model", "parts": []}]
+        self.assertEqual(contents_text(history), "a\nb")
+        self.assertEqual(contents_text("plain"), "plain")
@@ -0,0 +1,42 @@
+from django.test import SimpleTestCase, override_settings
+import itertools
+
+from interview.services.model_router import ModelRouter, breaker_name
+from interview.services.resilience import get_breaker
+
+ROUTES = {"turn": [["fast", "faster"], ["fallback"]]}
+
+# Breakers are process-wide, so every router gets a provider name of its own
+_providers = itertools.count()
+
+
+@override_settings(CIRCUIT_FAILURE_THRESHOLD=1, CIRCUIT_RESET_SECONDS=60)
+class ModelRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.provider = f"router-test-{next(_providers)}"
+        self.router = ModelRouter(self.provider, routes=ROUTES, alpha=0.5)
+
+    def test_tiers_in_order_and_unmeasured_models_first(self):
+        self.assertEqual(self.router.candidates("turn"), ["fast", "faster", "fallback"])
+        self.router.record("turn", "fast", 1.0)
+        self.assertEqual(self.router.candidates("turn"), ["faster", "fast", "fallback"])
+
+    def test_faster_model_moves_up_within_its_tier_only(self):
+        self.router.record("turn", "fast", 2.0)
+        self.router.record("turn", "faster", 1.0)
+        self.router.record("turn", "fallback", 0.1)
+        self.assertEqual(self.router.candidates("turn"), ["faster", "fast", "fallback"])
+
+    def test_latency_is_an_exponentially_weighted_average(self):
+        self.router.record("turn", "fast", 1.0)
+        self.router.record("turn", "fast", 3.0)
+        self.router.record("turn", "faster", 1.5)
+        # 0.5 * 3.0 + 0.5 * 1.0 = 2.0, now slower than "faster"
+        self.assertEqual(self.router.snapshot()["turn"]["ewma_ms"], {"fast": 2000, "faster": 1500})
+        self.assertEqual(self.router.candidates("turn")[0], "faster")
+
+    def test_models_with_an_open_circuit_are_skipped(self):
+        get_breaker(breaker_name(self.provider, "fast")).record_failure()
+        get_breaker(breaker_name(self.provider, "faster")).record_failure()
+        self.assertEqual(self.router.candidates("turn"), ["fallback"])
+        self.assertEqual(self.router.snapshot()["turn"]["order"], ["fallback"])
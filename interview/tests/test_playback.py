@@ -0,0 +1,74 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from interview.tests import UploadTestMixin
+from interview.views import parse_range
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_no_header_or_unsupported_sends_whole_file(self):
+        self.assertIsNone(parse_range("", 100))
+        self.assertIsNone(parse_range("items=0-10", 100))
+        self.assertIsNone(parse_range("bytes=0-10,20-30", 100))
+        self.assertIsNone(parse_range("bytes=a-b", 100))
+
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=500-", 1000), (500, 999))
+        # Past the end is clamped
+        self.assertEqual(parse_range("bytes=900-5000", 1000), (900, 999))
+        # Suffix: the last N bytes
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-5000", 1000), (0, 999))
+
+    def test_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range("bytes=1000-", 1000)
+        with self.assertRaises(ValueError):
+            parse_range("bytes=50-10", 1000)
+
+
+@override_settings(RECORDING_PREVIEWS_ENABLED=False, RECORDING_SENDFILE="")
+class RecordingPlaybackTests(UploadTestMixin, TestCase):
+    def upload(self, data=b"0123456789", finish=True):
+        upload = self.create().json()
+        self.patch(upload["url"], 0, data)
+        if finish:
+            self.client.post(upload["url"] + "finish/")
+        return reverse("interview:recording", args=[upload["id"]])
+
+    def test_whole_file_and_ranges(self):
+        url = self.upload()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.client.get(url, headers={"Range": "bytes=2-4"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+
+        response = self.client.get(url, headers={"Range": "bytes=10-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_finished_recording_is_cached_and_revalidated(self):
+        url = self.upload()
+        response = self.client.get(url)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": response["ETag"]}).status_code, 304)
+        # A stale If-Range gets the whole file instead of the range
+        stale = self.client.get(url, headers={"Range": "bytes=2-4", "If-Range": '"old"'})
+        self.assertEqual(stale.status_code, 200)
+
+    def test_unfinished_recording_is_not_cached(self):
+        response = self.client.get(self.upload(finish=False))
+        self.assertEqual(response["Cache-Control"], "no-store")
+        self.assertNotIn("Last-Modified", response)
+
+    @override_settings(RECORDING_SENDFILE="x-accel-redirect", RECORDING_ACCEL_PREFIX="/protected/")
+    def test_sendfile_hands_the_file_to_the_web_server(self):
+        response = self.client.get(self.upload())
+        self.assertTrue(response["X-Accel-Redirect"].startswith(f"/protected/{self.interview.id}/screen-"))
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+
+from interview.mocks import MOCK_QUESTION
+from interview.models import Interview
+from interview.services import presence
+from interview.services.interview_orchestrator import InterviewOrchestrator
+from interview.tests import PLAIN_STATIC_STORAGES, RecordingStorageMixin, make_interview
+
+
+@override_settings(
+    REAPER_ENABLED=False,
+    INTERVIEW_GRACE_SECONDS=60,
+    RECORDING_PREVIEWS_ENABLED=False,
+    STORAGES=PLAIN_STATIC_STORAGES,
+)
+class ReaperTests(RecordingStorageMixin, TestCase):
+    def test_claims_only_expired_interviews_once(self):
+        live = make_interview(started_minutes_ago=5)
+        gone = make_interview(started_minutes_ago=40)
+
+        self.assertEqual(presence.reap_expired(dry_run=True), [gone.id])
+        gone.refresh_from_db()
+        self.assertIsNone(gone.completed_at)
+
+        self.assertEqual(presence.reap_expired(), [gone.id])
+        self.assertEqual(presence.reap_expired(), [])
+        gone.refresh_from_db()
+        live.refresh_from_db()
+        self.assertIsNotNone(gone.completed_at)
+        self.assertEqual((gone.score, gone.notes), (0, presence.ABANDONED_NOTE))
+        self.assertIsNone(live.completed_at)
+
+    def test_end_after_reap_does_not_score_again(self):
+        gone = make_interview(started_minutes_ago=40)
+        presence.reap_expired()
+        with mock.patch("interview.views.get_orchestrator") as orchestrator:
+            response = self.client.get(f"/interview/end/{gone.id}/")
+        self.assertEqual(response.status_code, 200)
+        orchestrator().end_interview.assert_not_called()
+        gone.refresh_from_db()
+        self.assertEqual(gone.notes, presence.ABANDONED_NOTE)
+
+    def test_end_claims_before_scoring(self):
+        interview = make_interview(started_minutes_ago=40)
+        calls = []
+
+        def end_interview(metrics, interview_id=None, deadline=None):
+            calls.append(interview_id)
+            # Scoring is slow: the reaper and a double submit run meanwhile
+            self.assertIsNotNone(Interview.objects.get(id=interview_id).completed_at)
+            self.assertEqual(presence.reap_expired(), [])
+            self.client.get(f"/interview/end/{interview_id}/")
+            return {"score": 77, "feedback": "Well done"}
+
+        with mock.patch("interview.views.get_orchestrator") as orchestrator:
+            orchestrator().end_interview.side_effect = end_interview
+            self.client.get(f"/interview/end/{interview.id}/")
+        self.assertEqual(calls, [interview.id])
+        interview.refresh_from_db()
+        self.assertEqual((interview.score, interview.notes), (77, "Well done"))
+
+
+@override_settings(LLM_PROVIDER="fake", ELEVENLABS_TTS_ENABLED=False, SESSION_IDLE_SECONDS=60)
+class SessionEvictionTests(TestCase):
+    def setUp(self):
+        self.orchestrator = InterviewOrchestrator()
+        patcher = mock.patch.object(presence, "_loaded_orchestrator", return_value=self.orchestrator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self, interview):
+        self.orchestrator.start_interview(MOCK_QUESTION, {"role": "Backend", "interview_id": interview.id})
+        self.orchestrator.gemini.replay_turns([{"code": "", "statement": f"I am {interview.id}"}], interview.id)
+
+    def test_interviews_keep_separate_conversations(self):
+        first, second = make_interview(), make_interview()
+        self.start(first)
+        self.start(second)
+
+        self.assertIn(f"I am {first.id}", str(self.orchestrator.gemini.history(first.id)))
+        self.assertNotIn(f"I am {second.id}", str(self.orchestrator.gemini.history(first.id)))
+        # A reloaded page starts its own conversation over, leaving the other alone
+        self.start(first)
+        self.assertEqual(len(self.orchestrator.gemini.history(first.id)), 3)
+        self.assertEqual(len(self.orchestrator.gemini.history(second.id)), 3)
+
+    def test_ending_an_interview_drops_only_its_conversation(self):
+        first, second = make_interview(), make_interview()
+        self.start(first)
+        self.start(second)
+        with mock.patch.object(self.orchestrator.gemini, "_generate", side_effect=TimeoutError):
+            self.orchestrator.end_interview(["Correctness"], interview_id=first.id)
+        self.assertEqual(self.orchestrator.active_interview_ids(), {second.id})
+
+    def test_idle_and_finished_interviews_lose_their_conversation(self):
+        live = make_interview(last_seen_at=timezone.now())
+        idle = make_interview(last_seen_at=timezone.now() - timedelta(minutes=2))
+        finished = make_interview(completed_at=timezone.now())
+        for interview in (live, idle, finished):
+            self.start(interview)
+
+        self.assertEqual(presence.evict_idle_sessions(presence.PresenceStore()), sorted([idle.id, finished.id]))
+        self.assertEqual(self.orchestrator.active_interview_ids(), {live.id})
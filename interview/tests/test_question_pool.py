@@ -0,0 +1,61 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+
+from interview.mocks import MOCK_QUESTION
+from interview.models import Question, Role, Round, UsageRecord
+from interview.services.gemini_service import GeminiService
+from interview.services.llm_providers import FakeProvider
+from interview.services.question_pool import claim_question, fill_pool, take_question, unused_questions
+from interview.services.usage_ledger import get_ledger
+
+
+class QuestionPoolTests(TestCase):
+    def setUp(self):
+        self.round = Round.objects.create(role=Role.objects.create(title="Backend"), round_number=1, name="Coding")
+
+    def add_questions(self, count):
+        for i in range(count):
+            Question.objects.create(round=self.round, title=f"Question {i}", statement="S", test_cases=[])
+
+    def test_each_question_is_claimed_once(self):
+        self.add_questions(2)
+        first, second = claim_question(self.round), claim_question(self.round)
+        self.assertNotEqual(first.id, second.id)
+        self.assertIsNone(claim_question(self.round))
+
+    def test_lost_claim_moves_on(self):
+        self.add_questions(2)
+        first_id = unused_questions(self.round).first().id
+        # Another interview claims the first question between the read and the claim
+        Question.objects.filter(id=first_id).update(claimed_at=timezone.now())
+        self.assertNotEqual(claim_question(self.round).id, first_id)
+
+    @override_settings(QUESTION_POOL_SIZE=3, QUESTION_BATCH_SIZE=3)
+    def test_empty_pool_is_refilled(self):
+        gemini = GeminiService(provider=FakeProvider(latency="constant:0"))
+        question = take_question(self.round, gemini)
+        self.assertIsNotNone(question.claimed_at)
+        self.assertEqual(unused_questions(self.round).count(), 2)
+        # The generation call was recorded against this round; write it before the rollback
+        get_ledger().flush()
+        self.assertEqual(UsageRecord.objects.filter(round=self.round, call_type="question").count(), 1)
+
+    @override_settings(QUESTION_POOL_SIZE=3)
+    def test_fill_counts_only_questions_that_were_added(self):
+        self.add_questions(1)
+        other_round = Round.objects.create(role=self.round.role, round_number=2, name="Design")
+        # Another worker stored this title first; bulk_create drops it
+        Question.objects.create(round=other_round, title="Taken", statement="S", test_cases=[])
+        gemini = mock.Mock()
+        gemini.get_questions.return_value = [dict(MOCK_QUESTION, title=title) for title in ("Taken", "Fresh")]
+
+        self.assertEqual(fill_pool(self.round, gemini), 1)
+        self.assertEqual(gemini.get_questions.call_args.args[1], 2)
+        self.assertEqual(unused_questions(self.round).count(), 2)
+
+    def test_full_pool_is_not_refilled(self):
+        self.add_questions(3)
+        gemini = mock.Mock()
+        self.assertEqual(fill_pool(self.round, gemini, size=3), 0)
+        gemini.get_questions.assert_not_called()
@@ -0,0 +1,139 @@
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+import threading
+
+from interview.services.rate_limiter import (
+    POLL_SECONDS,
+    PRIORITY_QUESTION,
+    PRIORITY_SCORE,
+    PRIORITY_TURN,
+    DatabaseBackend,
+    RateLimiter,
+    RateLimitExceeded,
+    _decide,
+)
+
+
+@override_settings(RATE_LIMIT_LEASE_SECONDS=120, RATE_LIMIT_PRIORITY_RESERVE=0.25)
+class RateLimitDecideTests(SimpleTestCase):
+    limits = {"requests_per_minute": 60, "tokens_per_minute": 6000, "max_concurrent": 2}
+
+    def state(self, requests=60, tokens=6000, leases=None, refilled_at=1000.0):
+        return {
+            "requests_available": requests,
+            "tokens_available": tokens,
+            "refilled_at": refilled_at,
+            "leases": dict(leases or {}),
+        }
+
+    def test_takes_capacity_under_a_lease(self):
+        state = self.state()
+        self.assertEqual(_decide(state, self.limits, 1, 100, 1000.0, "a"), (0.0, False))
+        self.assertEqual(state["requests_available"], 59)
+        self.assertEqual(state["tokens_available"], 5900)
+        self.assertEqual(state["leases"], {"a": 1120.0})
+
+    def test_waits_for_a_free_slot(self):
+        state = self.state(leases={"a": 1100.0, "b": 1100.0})
+        self.assertEqual(_decide(state, self.limits, 1, 100, 1000.0, "c"), (POLL_SECONDS, True))
+        self.assertNotIn("c", state["leases"])
+        self.assertEqual(state["requests_available"], 60)
+
+    def test_waits_for_requests_and_tokens_to_refill(self):
+        # One request per second: half a request short is half a second
+        state = self.state(requests=0.5)
+        wait, slots_full = _decide(state, self.limits, 1, 100, 1000.0, "a")
+        self.assertAlmostEqual(wait, 0.5)
+        self.assertFalse(slots_full)
+        # 100 tokens per second: 50 short is half a second
+        state = self.state(tokens=50)
+        self.assertAlmostEqual(_decide(state, self.limits, 1, 100, 1000.0, "a")[0], 0.5)
+
+    def test_refill_wait_equal_to_the_poll_interval_is_not_a_full_slot(self):
+        state = self.state(requests=1 - POLL_SECONDS)
+        wait, slots_full = _decide(state, self.limits, 1, 100, 1000.0, "a")
+        self.assertAlmostEqual(wait, POLL_SECONDS)
+        self.assertFalse(slots_full)
+
+    def test_refills_with_elapsed_time_up_to_capacity(self):
+        state = self.state(requests=0, tokens=0, refilled_at=990.0)
+        self.assertEqual(_decide(state, self.limits, 1, 100, 1000.0, "a"), (0.0, False))
+        self.assertAlmostEqual(state["requests_available"], 9)
+        self.assertAlmostEqual(state["tokens_available"], 900)
+
+        state = self.state(refilled_at=0.0)
+        _decide(state, self.limits, 1, 100, 1000.0, "a")
+        self.assertEqual(state["requests_available"], 59)
+
+    def test_oversized_call_is_capped_to_the_bucket(self):
+        # Larger than a full bucket: would otherwise never fit
+        for priority in (PRIORITY_TURN, PRIORITY_SCORE):
+            with self.subTest(priority=priority):
+                state = self.state()
+                self.assertEqual(_decide(state, self.limits, 1, 10**6, 1000.0, "a", priority), (0.0, False))
+                self.assertEqual(state["tokens_available"], 0)
+
+    def test_reclaims_expired_leases(self):
+        # A worker killed mid-call never releases; its lease runs out instead
+        state = self.state(leases={"dead": 999.0, "live": 1100.0})
+        self.assertEqual(_decide(state, self.limits, 1, 100, 1000.0, "new"), (0.0, False))
+        self.assertEqual(set(state["leases"]), {"live", "new"})
+
+    def test_lower_priorities_leave_a_reserve(self):
+        limits = dict(self.limits, max_concurrent=8)
+        # Scoring may hold half the slots, question generation three quarters, turns all
+        for running, priority, slots_full in (
+            (4, PRIORITY_SCORE, True),
+            (4, PRIORITY_QUESTION, False),
+            (6, PRIORITY_QUESTION, True),
+            (7, PRIORITY_TURN, False),
+        ):
+            with self.subTest(running=running, priority=priority):
+                state = self.state(leases={f"lease{i}": 1100.0 for i in range(running)})
+                self.assertEqual(_decide(state, limits, 1, 100, 1000.0, "new", priority)[1], slots_full)
+
+        # Scoring waits for the requests bucket to refill above its reserve, turns don't
+        # (it must leave half of the 59 other requests: 10.5 short at one per second)
+        state = self.state(requests=20)
+        wait, slots_full = _decide(state, self.limits, 1, 100, 1000.0, "s", PRIORITY_SCORE)
+        self.assertAlmostEqual(wait, 10.5)
+        self.assertFalse(slots_full)
+        self.assertEqual(_decide(state, self.limits, 1, 100, 1000.0, "t", PRIORITY_TURN)[0], 0.0)
+
+    def test_every_priority_keeps_a_slot(self):
+        limits = dict(self.limits, max_concurrent=1)
+        self.assertEqual(_decide(self.state(), limits, 1, 100, 1000.0, "s", PRIORITY_SCORE), (0.0, False))
+
+
+@override_settings(RATE_LIMIT_LEASE_SECONDS=120, RATE_LIMIT_PRIORITY_RESERVE=0.25)
+class SharedRateLimitTests(TransactionTestCase):
+    """Two limiters on the database backend stand in for two gunicorn workers"""
+
+    limits = {"requests_per_minute": 600, "tokens_per_minute": 60000, "max_concurrent": 4}
+
+    def test_scoring_in_one_worker_cannot_starve_turns_in_another(self):
+        scoring = RateLimiter("gemini", self.limits, DatabaseBackend())
+        live = RateLimiter("gemini", self.limits, DatabaseBackend())
+        release = threading.Event()
+        holding = threading.Barrier(3)
+
+        def score():
+            with scoring.acquire(tokens=10, priority=PRIORITY_SCORE, timeout=5):
+                holding.wait()
+                release.wait(5)
+
+        threads = [threading.Thread(target=score) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        try:
+            holding.wait(5)
+            # Scoring has its two slots; a third scoring call has to wait for one
+            with self.assertRaises(RateLimitExceeded):
+                with scoring.acquire(tokens=10, priority=PRIORITY_SCORE, timeout=0.3):
+                    pass
+            # A live turn in the other worker still gets in straight away
+            with live.acquire(tokens=10, priority=PRIORITY_TURN, timeout=0.3):
+                pass
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+import json
+import os
+import tempfile
+
+from interview.models import RecordingUpload
+from interview.services import recording_preview
+from interview.tests import RecordingStorageMixin, make_interview
+
+
+def fake_ffmpeg(*args):
+    """Stands in for ffmpeg: three keyframes 5.2s apart, then a sprite"""
+    output = args[-1]
+    if output.endswith("%d.jpg"):
+        for time_ms in (0, 5200, 10400):
+            with open(output.replace("%d", str(time_ms)), "wb") as f:
+                f.write(b"jpg")
+    else:
+        with open(output, "wb") as f:
+            f.write(b"sprite")
+
+
+@override_settings(
+    RECORDING_PREVIEW_INTERVAL_SECONDS=5,
+    RECORDING_PREVIEW_WIDTH=160,
+    RECORDING_PREVIEW_HEIGHT=90,
+    RECORDING_PREVIEW_COLUMNS=2,
+    RECORDING_PREVIEWS_ENABLED=False,
+)
+class RecordingPreviewTests(RecordingStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(RECORDINGS_DIR=directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        started = timezone.now() - timedelta(minutes=10)
+        self.interview = make_interview(
+            transcript=[
+                {"at": (started - timedelta(seconds=5)).isoformat(), "statement": "Before the recording"},
+                {"at": "not a time", "statement": "Unparseable"},
+                {
+                    "at": (started + timedelta(seconds=42)).isoformat(),
+                    "statement": "x" * 500,
+                    "reply": "Try a hash map",
+                    "test_results": "3/5 passed",
+                    "source": "model",
+                },
+            ]
+        )
+        self.upload = RecordingUpload.objects.create(
+            id="a" * 32,
+            interview=self.interview,
+            kind="screen",
+            key=f"{self.interview.id}/screen-{'a' * 32}.webm",
+            recording_started_at=started,
+            completed_at=timezone.now(),
+        )
+
+    def test_turns_are_labelled_at_their_offset_into_the_recording(self):
+        (turn,) = recording_preview._turn_index(self.upload)
+        self.assertEqual(turn["t"], 42.0)
+        self.assertEqual(len(turn["statement"]), recording_preview.TURN_TEXT_CHARS)
+        self.assertEqual((turn["reply"], turn["tests"], turn["source"]), ("Try a hash map", "3/5 passed", "model"))
+
+    def test_index_places_each_thumbnail_in_the_sprite(self):
+        with mock.patch.object(recording_preview, "_ffmpeg", side_effect=fake_ffmpeg):
+            index = recording_preview.build_preview(self.upload)
+
+        self.assertEqual(
+            index["thumbnails"],
+            [{"t": 0.0, "x": 0, "y": 0}, {"t": 5.2, "x": 160, "y": 0}, {"t": 10.4, "x": 0, "y": 90}],
+        )
+        self.assertEqual(index["columns"], 2)
+        self.assertEqual([turn["t"] for turn in index["turns"]], [42.0])
+        sprite_path, index_path = recording_preview.preview_paths(self.upload)
+        self.assertTrue(os.path.isfile(sprite_path))
+        with open(index_path) as f:
+            self.assertEqual(json.load(f), index)
+
+    def test_status_follows_the_build_and_gates_the_preview_files(self):
+        url = f"/interview/recordings/{self.upload.id}/index.json"
+        with mock.patch.object(recording_preview, "_ffmpeg", side_effect=recording_preview.PreviewError("no ffmpeg")):
+            self.assertFalse(recording_preview.build_and_save(self.upload.id))
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.preview_status, "failed")
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        with mock.patch.object(recording_preview, "_ffmpeg", side_effect=fake_ffmpeg):
+            self.assertTrue(recording_preview.build_and_save(self.upload.id))
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.preview_status, "ready")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(b"".join(response.streaming_content))["thumbnails"]), 3)
+
+    @override_settings(FFMPEG_PATH="/nonexistent/ffmpeg")
+    def test_missing_ffmpeg_is_a_preview_error(self):
+        with self.assertRaisesMessage(recording_preview.PreviewError, "ffmpeg not found"):
+            recording_preview.build_preview(self.upload)
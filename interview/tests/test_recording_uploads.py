@@ -0,0 +1,141 @@
+from datetime import timedelta
+from django.db import connections
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from unittest import mock
+import threading
+import time
+
+from interview.models import RecordingUpload
+from interview.services import recording_storage
+from interview.tests import UploadTestMixin
+
+
+@override_settings(RECORDING_PREVIEWS_ENABLED=False)
+class RecordingUploadTests(UploadTestMixin, TestCase):
+    def test_append_at_offset(self):
+        url = self.create().json()["url"]
+        response = self.patch(url, 0, b"abc")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response["Upload-Offset"], "3")
+        self.assertEqual(self.patch(url, 3, b"def")["Upload-Offset"], "6")
+        self.assertEqual(self.client.head(url)["Upload-Offset"], "6")
+
+    def test_stale_offset_is_a_conflict(self):
+        url = self.create().json()["url"]
+        self.patch(url, 0, b"abc")
+        # A retried chunk the server already has
+        response = self.patch(url, 0, b"abc")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Upload-Offset"], "3")
+        self.assertEqual(self.patch(url, 5, b"abc").status_code, 409)
+
+    def test_offset_moved_by_an_unlocked_writer_is_a_conflict(self):
+        upload_id = self.create().json()["id"]
+        storage = recording_storage.get_storage()
+        append = storage.append
+
+        def racing_append(upload, stream, size):
+            # A writer that skipped the lock (no fcntl on Windows) committed first
+            RecordingUpload.objects.filter(id=upload.id).update(offset=upload.offset + 2)
+            return append(upload, stream, size)
+
+        with mock.patch.object(storage, "append", racing_append):
+            response = self.patch(f"/interview/api/uploads/{upload_id}/", 0, b"abc")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Upload-Offset"], "2")
+
+    def test_wrong_content_type(self):
+        url = self.create().json()["url"]
+        response = self.client.generic("PATCH", url, b"abc", content_type="video/webm", HTTP_UPLOAD_OFFSET="0")
+        self.assertEqual(response.status_code, 415)
+
+    def test_finished_upload_rejects_chunks(self):
+        url = self.create().json()["url"]
+        self.client.post(url + "finish/")
+        self.assertEqual(self.patch(url, 0, b"abc").status_code, 409)
+
+
+
+
+@override_settings(RECORDING_PREVIEWS_ENABLED=False)
+class RecordingSegmentTests(UploadTestMixin, TestCase):
+    def test_each_recorder_session_is_a_new_segment(self):
+        first = self.create().json()
+        self.patch(first["url"], 0, b"first")
+        # The same session (a retried create) carries on where it was
+        again = self.create()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual((again.json()["id"], again.json()["offset"]), (first["id"], 5))
+        # A reloaded page records a new stream, which must not be appended to the old one
+        reloaded = self.create(session="b" * 32)
+        self.assertEqual(reloaded.status_code, 201)
+        self.assertNotEqual(reloaded.json()["id"], first["id"])
+        self.assertEqual(reloaded.json()["offset"], 0)
+
+        for upload in (first, reloaded.json()):
+            self.assertEqual(self.client.post(upload["url"] + "finish/").status_code, 200)
+        self.interview.refresh_from_db()
+        parts = self.interview.recording_parts()
+        self.assertEqual([part["screen"].id for part in parts], [first["id"], reloaded.json()["id"]])
+        self.assertEqual(self.interview.screen_video, parts[0]["screen"].url)
+
+    def test_segments_are_ordered_by_when_recording_started(self):
+        # The second create reports more recorded media, so it started earlier
+        later = self.create(session="a" * 32, recorded_ms=1000).json()
+        earlier = self.create(session="b" * 32, recorded_ms=60_000).json()
+        for upload in (later, earlier):
+            self.patch(upload["url"], 0, b"webm")
+            self.client.post(upload["url"] + "finish/")
+
+        self.interview.refresh_from_db()
+        parts = self.interview.recording_parts()
+        self.assertEqual([part["screen"].id for part in parts], [earlier["id"], later["id"]])
+        self.assertEqual(self.interview.screen_video, parts[0]["screen"].url)
+        started = RecordingUpload.objects.get(id=earlier["id"]).recording_started_at
+        self.assertLess(timezone.now() - started, timedelta(seconds=61))
+        self.assertGreater(timezone.now() - started, timedelta(seconds=59))
+
+    def test_invalid_session_or_recorded_ms(self):
+        self.assertEqual(self.create(session="x" * 33).status_code, 400)
+        self.assertEqual(self.create(recorded_ms="soon").status_code, 400)
+
+
+@override_settings(RECORDING_PREVIEWS_ENABLED=False)
+class ConcurrentUploadTests(UploadTestMixin, TransactionTestCase):
+    def test_two_appends_at_the_same_offset(self):
+        upload_id = self.create().json()["id"]
+        url = f"/interview/api/uploads/{upload_id}/"
+        storage = recording_storage.get_storage()
+        append = storage.append
+
+        def slow_append(upload, stream, size):
+            # Long enough for the other request to reach the offset check meanwhile
+            time.sleep(0.2)
+            return append(upload, stream, size)
+
+        statuses = {}
+
+        def send(body):
+            try:
+                # A client per thread, like two browser tabs
+                response = Client().generic(
+                    "PATCH", url, body, content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET="0"
+                )
+                statuses[body] = response.status_code
+            finally:
+                connections.close_all()
+
+        with mock.patch.object(storage, "append", slow_append):
+            threads = [threading.Thread(target=send, args=(body,)) for body in (b"aaaa", b"bb")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sorted(statuses.values()), [204, 409])
+        (winner,) = [body for body, status in statuses.items() if status == 204]
+        upload = RecordingUpload.objects.get(id=upload_id)
+        self.assertEqual(upload.offset, len(winner))
+        with open(storage.path(upload.key), "rb") as f:
+            self.assertEqual(f.read(), winner)
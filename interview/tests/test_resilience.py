@@ -0,0 +1,185 @@
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+from unittest import mock
+import threading
+import time
+
+from interview.services.interview_orchestrator import InterviewOrchestrator
+from interview.services.rate_limiter import RateLimitExceeded
+from interview.services.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    Deadline,
+    DeadlineExceeded,
+    LatencyTracker,
+    failure_reason,
+    hedged_call,
+)
+
+
+class DeadlineTests(SimpleTestCase):
+    def test_budget_is_what_is_left_minus_the_reserve(self):
+        deadline = Deadline(10)
+        self.assertAlmostEqual(deadline.budget(), 10, delta=0.1)
+        self.assertAlmostEqual(deadline.budget(reserve=4), 6, delta=0.1)
+        self.assertEqual(deadline.budget(cap=2), 2)
+
+    def test_nothing_left(self):
+        deadline = Deadline(1)
+        with self.assertRaises(DeadlineExceeded):
+            deadline.budget(reserve=1)
+        with mock.patch("interview.services.resilience.time.monotonic", return_value=deadline.expires_at + 5):
+            self.assertEqual(deadline.remaining(), 0.0)
+            with self.assertRaises(DeadlineExceeded):
+                deadline.budget()
+
+
+class LatencyTrackerTests(SimpleTestCase):
+    def test_percentile_once_there_are_enough_samples(self):
+        tracker = LatencyTracker(window=100)
+        for i in range(19):
+            tracker.record(i / 100)
+        self.assertIsNone(tracker.percentile(95))
+        for i in range(19, 100):
+            tracker.record(i / 100)
+        self.assertEqual(tracker.percentile(95), 0.95)
+        self.assertEqual(tracker.percentile(50), 0.5)
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=10)
+        for _ in range(10):
+            tracker.record(5.0)
+        for _ in range(10):
+            tracker.record(0.1)
+        self.assertEqual(tracker.percentile(99, min_samples=1), 0.1)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = 1000.0
+        patcher = mock.patch("interview.services.resilience.time.monotonic", side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+
+    def open_circuit(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertFalse(self.breaker.available())
+
+    def test_one_trial_call_after_the_reset_time(self):
+        self.open_circuit()
+        self.clock += 30
+        self.assertTrue(self.breaker.available())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # Only one trial at a time
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.snapshot(), {"state": "closed", "consecutive_failures": 0, "open_for_seconds": 0})
+
+    def test_failed_trial_reopens(self):
+        self.open_circuit()
+        self.clock += 30
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock += 10
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.snapshot()["open_for_seconds"], 10)
+
+    def test_skipped_trial_frees_the_slot(self):
+        self.open_circuit()
+        self.clock += 30
+        self.assertTrue(self.breaker.allow())
+        # Rate limited before reaching the provider: says nothing about its health
+        self.breaker.record_skipped()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+
+class HedgedCallTests(SimpleTestCase):
+    def test_returns_the_result(self):
+        self.assertEqual(hedged_call(lambda: 42, timeout=1), 42)
+
+    def test_hedge_wins_over_a_slow_first_attempt(self):
+        calls = []
+        lock = threading.Lock()
+
+        def attempt():
+            with lock:
+                calls.append(len(calls))
+                first = len(calls) == 1
+            time.sleep(1 if first else 0)
+            return "slow" if first else "hedge"
+
+        self.assertEqual(hedged_call(attempt, timeout=2, hedge_after=0.05), "hedge")
+        self.assertEqual(len(calls), 2)
+
+    def test_times_out(self):
+        with self.assertRaises(DeadlineExceeded):
+            hedged_call(lambda: time.sleep(0.5), timeout=0.05)
+
+    def test_raises_the_first_error_when_every_attempt_fails(self):
+        def attempt():
+            raise ValueError("provider error")
+
+        with self.assertRaisesMessage(ValueError, "provider error"):
+            hedged_call(attempt, timeout=1, hedge_after=0.01)
+
+    def test_closes_connections_on_the_attempt_thread(self):
+        # The db rate limit backend opens a connection on the provider-call
+        # thread. (Closing is a no-op on the in-memory test database, so the
+        # call itself is checked.)
+        closed_on = []
+        with mock.patch("interview.services.resilience.connections") as connections:
+            connections.close_all.side_effect = lambda: closed_on.append(threading.current_thread().name)
+            hedged_call(lambda: True, timeout=5)
+            with self.assertRaises(ValueError):
+                hedged_call(mock.Mock(side_effect=ValueError), timeout=5)
+        self.assertEqual(len(closed_on), 2)
+        self.assertTrue(all(name.startswith("provider-call") for name in closed_on))
+
+
+@override_settings(LLM_PROVIDER="fake", ELEVENLABS_TTS_ENABLED=False)
+class ScoringDeadlineTests(SimpleTestCase):
+    def test_scoring_falls_back_once_the_request_deadline_is_spent(self):
+        orchestrator = InterviewOrchestrator()
+        orchestrator.gemini.replay_turns([{"code": "def solve(): pass", "statement": "Done", "reply": "Ok"}], 1)
+
+        with mock.patch.object(orchestrator.gemini.provider, "generate") as generate:
+            result = orchestrator.end_interview(["Correctness"], interview_id=1, deadline=Deadline(0))
+
+        generate.assert_not_called()
+        self.assertTrue(result["success"])
+        self.assertEqual(result["score"], 50)
+
+    def test_fallbacks_are_labelled_by_failure_kind(self):
+        def fallbacks():
+            return REGISTRY.get_sample_value("vode_fallbacks_total", {"stage": "score", "reason": "timeout"}) or 0
+
+        before = fallbacks()
+        orchestrator = InterviewOrchestrator()
+        orchestrator.gemini.replay_turns([{"code": "def solve(): pass", "statement": "Done", "reply": "Ok"}], 1)
+        orchestrator.end_interview(["Correctness"], interview_id=1, deadline=Deadline(0))
+        self.assertEqual(fallbacks(), before + 1)
+
+
+class FailureReasonTests(SimpleTestCase):
+    def test_exceptions_map_to_a_fixed_set_of_labels(self):
+        self.assertEqual(failure_reason(DeadlineExceeded()), "timeout")
+        self.assertEqual(failure_reason(TimeoutError()), "timeout")
+        self.assertEqual(failure_reason(CircuitOpen()), "circuit_open")
+        self.assertEqual(failure_reason(RateLimitExceeded()), "rate_limited")
+        self.assertEqual(failure_reason(KeyError("text")), "error")
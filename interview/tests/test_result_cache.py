@@ -0,0 +1,83 @@
+from django.test import SimpleTestCase, override_settings
+from unittest import mock
+
+from interview.services.code_runner import (
+    CodeRunner,
+    ResultCache,
+    code_fingerprint,
+    result_cache,
+    test_cases_version,
+)
+
+
+class ResultCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(max_size=2)
+        cache.set("a", {"passed": 1})
+        cache.set("b", {"passed": 2})
+        cache.get("a")
+        cache.set("c", {"passed": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"passed": 1})
+        self.assertEqual(len(cache), 2)
+
+    def test_returns_copies(self):
+        cache = ResultCache(max_size=2)
+        result = {"results": [{"passed": True}]}
+        cache.set("a", result)
+        result["results"].append({"passed": False})
+        cache.get("a")["results"].clear()
+        self.assertEqual(cache.get("a"), {"results": [{"passed": True}]})
+
+    def test_size_zero_disables_it(self):
+        cache = ResultCache(max_size=0)
+        cache.set("a", {"passed": 1})
+        self.assertIsNone(cache.get("a"))
+
+
+class CacheKeyTests(SimpleTestCase):
+    def test_formatting_and_comments_keep_the_fingerprint(self):
+        code = "def add(a, b):\n    return a + b"
+        self.assertEqual(code_fingerprint(code), code_fingerprint("def add(a,b):  # sum\n\n    return (a + b)\n"))
+        self.assertNotEqual(code_fingerprint(code), code_fingerprint("def add(a, b):\n    return a - b"))
+        # Code that doesn't parse is keyed by its source
+        self.assertEqual(code_fingerprint("def add(:\n  "), code_fingerprint("def add(:"))
+
+    def test_edited_cases_change_the_version(self):
+        cases = [{"input": {"a": 1}, "output": 1}]
+        self.assertEqual(test_cases_version(cases), test_cases_version([{"output": 1, "input": {"a": 1}}]))
+        self.assertNotEqual(test_cases_version(cases), test_cases_version([{"input": {"a": 1}, "output": 2}]))
+
+
+@override_settings(CODE_RUNNER_POOL_SIZE=0)
+class CodeRunnerCacheTests(SimpleTestCase):
+    cases = [{"input": {"a": 1, "b": 2}, "output": 3}]
+    code = "def add(a, b):\n    return a + b"
+
+    def setUp(self):
+        result_cache.clear()
+        self.addCleanup(result_cache.clear)
+
+    def run_with(self, result, code=None, **options):
+        with mock.patch.object(CodeRunner, "_run_subprocess", return_value=dict(result)) as run:
+            return CodeRunner().run(code or self.code, self.cases, **options), run.call_count
+
+    def test_unchanged_code_hits_the_cache(self):
+        passed = {"ok": True, "error": None, "results": [{"passed": True}]}
+        result, runs = self.run_with(passed, question_id=1)
+        self.assertEqual((result["passed"], result["cached"], runs), (1, False, 1))
+        result, runs = self.run_with(passed, code=self.code + "  # done", question_id=1)
+        self.assertEqual((result["passed"], result["cached"], runs), (1, True, 0))
+        # Another question's cases are another key
+        self.assertEqual(self.run_with(passed, question_id=2)[1], 1)
+
+    def test_one_off_runs_skip_the_cache(self):
+        passed = {"ok": True, "error": None, "results": [{"passed": True}]}
+        self.run_with(passed, use_cache=False)
+        self.assertEqual(len(result_cache), 0)
+
+    def test_transient_failures_are_not_cached(self):
+        timeout = {"ok": False, "error": "Time limit exceeded (5s)", "results": [], "transient": True}
+        result, _ = self.run_with(timeout)
+        self.assertNotIn("transient", result)
+        self.assertEqual(len(result_cache), 0)
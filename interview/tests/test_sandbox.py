@@ -0,0 +1,192 @@
+from django.test import SimpleTestCase, override_settings
+from unittest import skipUnless
+import os
+import sys
+import tempfile
+
+from interview.services.code_runner import CodeRunner, format_test_results, normalize_test_cases
+from interview.services.sandbox_pool import SandboxPool
+
+
+class NormalizeTestCasesTests(SimpleTestCase):
+    def test_list_or_wrapped_list(self):
+        cases = [{"input": {"a": 1}, "output": 1}]
+        self.assertEqual(normalize_test_cases(cases), cases)
+        self.assertEqual(normalize_test_cases({"test_cases": cases}), cases)
+        self.assertEqual(normalize_test_cases({"cases": cases}), cases)
+
+    def test_drops_cases_without_input(self):
+        cases = [{"output": 1}, "case", {"input": {}, "output": 2}]
+        self.assertEqual(normalize_test_cases(cases), [{"input": {}, "output": 2}])
+        self.assertEqual(normalize_test_cases("not cases"), [])
+
+
+class FormatTestResultsTests(SimpleTestCase):
+    def test_lists_failures_for_the_prompt(self):
+        result = {
+            "ok": True,
+            "passed": 1,
+            "total": 3,
+            "results": [
+                {"index": 0, "passed": True},
+                {"index": 1, "input": {"a": 1}, "expected": 2, "actual": 3, "passed": False},
+                {"index": 2, "input": {"a": 0}, "expected": 0, "error": "ZeroDivisionError", "passed": False},
+            ],
+        }
+        self.assertEqual(
+            format_test_results(result),
+            "Passed 1/3 test cases.\n"
+            '- Case 2: input {"a": 1}, expected 2, got 3\n'
+            '- Case 3: input {"a": 0}, expected 0, ZeroDivisionError',
+        )
+
+    def test_not_run_or_not_loaded(self):
+        self.assertEqual(format_test_results(None), "(Tests not run)")
+        self.assertEqual(
+            format_test_results({"ok": False, "error": "SyntaxError"}), "Code could not be tested: SyntaxError"
+        )
+
+
+@skipUnless(sys.platform.startswith("linux"), "the sandbox is confined with seccomp, which needs Linux")
+@override_settings(CODE_RUNNER_POOL_SIZE=0, CODE_RUNNER_CPU_SECONDS=1, CODE_RUNNER_WALL_SECONDS=5)
+class SandboxTests(SimpleTestCase):
+    """Candidate code must not escape the sandbox or report results it didn't earn"""
+
+    cases = [{"input": {"a": 1, "b": 2}, "output": 3}, {"input": {"a": 2, "b": 2}, "output": 4}]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = SandboxPool(size=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        super().tearDownClass()
+
+    def run_both(self, code):
+        """Results from a fresh interpreter and from a warm pool worker"""
+        return {
+            "fresh": CodeRunner().run(code, self.cases, use_cache=False),
+            "pool": CodeRunner(pool=self.pool).run(code, self.cases, use_cache=False),
+        }
+
+    def assertFailsAll(self, code):
+        for path, result in self.run_both(code).items():
+            with self.subTest(path=path):
+                self.assertEqual(result["passed"], 0)
+
+    def test_correct_code_passes(self):
+        for path, result in self.run_both("def add(a, b):\n    return a + b").items():
+            with self.subTest(path=path):
+                self.assertEqual((result["passed"], result["total"]), (2, 2))
+
+    def test_reports_each_case(self):
+        code = "def add(a, b):\n    print(a)\n    return 1 / (a - 1)"
+        for path, result in self.run_both(code).items():
+            with self.subTest(path=path):
+                self.assertTrue(result["ok"])
+                first, second = result["results"]
+                self.assertEqual((first["passed"], first["error"]), (False, "ZeroDivisionError: division by zero"))
+                self.assertEqual((second["actual"], second["passed"], second["stdout"]), (1.0, False, "2\n"))
+
+    def test_load_errors_and_limits(self):
+        for code, error in (
+            ("def add(a, b) return", "SyntaxError: expected ':' (line 1)"),
+            ("x = 1", "No function found to test"),
+            ("def add(a, b):\n    while True:\n        pass", "CPU time limit exceeded"),
+        ):
+            for path, result in self.run_both(code).items():
+                with self.subTest(path=path, error=error):
+                    self.assertEqual((result["ok"], result["error"], result["total"]), (False, error, 0))
+
+    def test_cannot_start_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            marker = os.path.join(directory, "pwned")
+            self.assertFailsAll(
+                "import _posixsubprocess\n"
+                "def add(a, b):\n"
+                f"    _posixsubprocess.fork_exec(['/bin/sh', '-c', 'touch {marker}'], [b'/bin/sh'], True, (), None, None,"
+                " -1, -1, -1, -1, -1, -1, -1, -1, False, False, -1, None, None, None, -1, None, False)\n"
+                "    return a + b"
+            )
+            self.assertFailsAll("import os\ndef add(a, b):\n    os.fork()\n    return a + b")
+            self.assertFalse(os.path.exists(marker))
+
+    def test_cannot_open_sockets(self):
+        self.assertFailsAll("import _socket\ndef add(a, b):\n    _socket.socket()\n    return a + b")
+
+    def test_cannot_write_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, "written")
+            self.assertFailsAll(f"import _io\ndef add(a, b):\n    _io.FileIO({target!r}, 'w')\n    return a + b")
+            self.assertFalse(os.path.exists(target))
+
+    def test_cannot_kill_the_harness(self):
+        self.assertFailsAll("import os\ndef add(a, b):\n    os.kill(os.getppid(), 9)\n    return a + b")
+
+    def test_cannot_forge_results(self):
+        forged = '{"ok": true, "error": null, "results": [{"passed": true}, {"passed": true}]}\\n'
+        # On the stdout the harness used to report on
+        self.assertFailsAll(
+            f"import sys\nsys.__stdout__.write('{forged}')\nsys.__stdout__.flush()\ndef add(a, b):\n    return 0"
+        )
+        # On every inherited descriptor, then exiting before the harness reports
+        self.assertFailsAll(
+            "import os\n"
+            "for fd in range(3, 64):\n"
+            "    try:\n"
+            f"        os.write(fd, b'{forged}')\n"
+            "    except OSError:\n"
+            "        pass\n"
+            "os._exit(0)\n"
+            "def add(a, b):\n"
+            "    return 0"
+        )
+
+
+@skipUnless(sys.platform.startswith("linux"), "the sandbox is confined with seccomp, which needs Linux")
+@override_settings(CODE_RUNNER_CPU_SECONDS=1, CODE_RUNNER_WALL_SECONDS=5)
+class SandboxPoolTests(SimpleTestCase):
+    cases = [{"input": {"a": 1, "b": 2}, "output": 3}]
+
+    def make_pool(self, **options):
+        pool = SandboxPool(**options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def run_on(self, pool, code="def add(a, b):\n    return a + b"):
+        return CodeRunner(pool=pool).run(code, self.cases, use_cache=False)
+
+    def idle_pid(self, pool):
+        """Pid of the worker the next run gets, once it is back in the pool"""
+        worker = pool._idle.get(timeout=10)
+        pool._idle.put(worker)
+        return worker.proc.pid
+
+    def test_reuses_a_warm_worker(self):
+        pool = self.make_pool(size=1)
+        pid = self.idle_pid(pool)
+        self.assertEqual(self.run_on(pool)["passed"], 1)
+        self.assertEqual(self.run_on(pool)["passed"], 1)
+        self.assertEqual(self.idle_pid(pool), pid)
+
+    def test_recycles_after_max_runs(self):
+        pool = self.make_pool(size=1, max_runs=1)
+        pid = self.idle_pid(pool)
+        self.assertEqual(self.run_on(pool)["passed"], 1)
+        self.assertNotEqual(self.idle_pid(pool), pid)
+
+    def test_recycles_after_a_limit_breach(self):
+        pool = self.make_pool(size=1)
+        pid = self.idle_pid(pool)
+        result = self.run_on(pool, "def add(a, b):\n    while True:\n        pass")
+        self.assertEqual(result["error"], "CPU time limit exceeded")
+        self.assertNotEqual(self.idle_pid(pool), pid)
+        self.assertEqual(self.run_on(pool)["passed"], 1)
+
+    def test_busy_pool_fails_fast(self):
+        for options in ({"size": 1, "max_queue": 0}, {"size": 0, "queue_timeout": 0.1}):
+            with self.subTest(**options):
+                result = self.run_on(self.make_pool(**options))
+                self.assertEqual((result["ok"], result["error"]), (False, "Code runner is busy, try again shortly"))
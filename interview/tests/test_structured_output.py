@@ -0,0 +1,75 @@
+from django.test import SimpleTestCase
+import json
+
+from interview.services.structured_output import (
+    JsonStreamParser,
+    repair_json,
+    validate_question,
+    validate_score,
+)
+
+
+class StructuredOutputTests(SimpleTestCase):
+    def test_stream_parser_yields_fields_as_they_complete(self):
+        parser = JsonStreamParser()
+        self.assertEqual(parser.feed('{"title": "Two Sum", "state'), [("title", "Two Sum")])
+        self.assertFalse(parser.done)
+        self.assertEqual(parser.feed('ment": "Add {a} and [b]",'), [("statement", "Add {a} and [b]")])
+        fields = parser.feed(' "test_cases": [{"input": {"a": 1}, "output": 2}]}')
+        self.assertEqual(fields, [("test_cases", [{"input": {"a": 1}, "output": 2}])])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.errors, [])
+
+    def test_stream_parser_keeps_good_array_items(self):
+        parser = JsonStreamParser()
+        items = []
+        for chunk in ('[{"title": "A"}, {"title": ', "oops}, ", '{"title": "C"}]'):
+            items.extend(item for _, item in parser.feed(chunk))
+        self.assertTrue(parser.is_array)
+        self.assertEqual(items, [{"title": "A"}, {"title": "C"}])
+        self.assertEqual(len(parser.errors), 1)
+
+    def test_repair_json(self):
+        self.assertEqual(repair_json('```json\n{"score": 80}\n```'), {"score": 80})
+        self.assertEqual(repair_json('Sure! {"score": 80} Hope that helps.'), {"score": 80})
+        self.assertEqual(repair_json('{"items": [1, 2,], "score": 80,}'), {"items": [1, 2], "score": 80})
+        self.assertEqual(repair_json('{"ok": True, "why": None}'), {"ok": True, "why": None})
+        # Truncated output is closed off
+        self.assertEqual(repair_json('{"feedback": "good", "items": [1, 2'), {"feedback": "good", "items": [1, 2]})
+        with self.assertRaises(ValueError):
+            repair_json("no json here")
+
+    def test_validate_question(self):
+        question, repairs = validate_question(
+            {
+                "title": " Two Sum ",
+                "statement": "Add them",
+                "test_cases": json.dumps({"input": {"a": 1}, "output": 1}),
+            }
+        )
+        self.assertEqual(question["title"], "Two Sum")
+        self.assertEqual(question["test_cases"], [{"input": {"a": 1}, "output": 1}])
+        self.assertIn("wrapped single test case in a list", repairs)
+
+        question, repairs = validate_question(
+            {"title": "T", "statement": "S", "test_cases": [{"output": 1}, {"input": '{"a": 1}', "output": 1}]}
+        )
+        self.assertEqual(question["test_cases"], [{"input": {"a": 1}, "output": 1}])
+        self.assertIn("dropped test case without input object", repairs)
+
+        with self.assertRaises(ValueError):
+            validate_question({"title": "T", "statement": "S", "test_cases": [{"input": {}}]})
+        with self.assertRaises(ValueError):
+            validate_question({"statement": "S", "test_cases": []})
+
+    def test_validate_score(self):
+        result, repairs = validate_score({"score": "85/100", "feedback": ["Good.", "Test more."]})
+        self.assertEqual(result, {"score": 85, "feedback": "Good. Test more."})
+        self.assertEqual(len(repairs), 2)
+        self.assertEqual(validate_score({"score": 140.4, "feedback": "x"})[0]["score"], 100)
+
+    def test_validate_score_never_invents_a_score(self):
+        # Re-scoring must not overwrite a real score with a placeholder
+        for data in ({"feedback": "x"}, {"score": "n/a"}, {"score": True}, [80]):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                validate_score(data)
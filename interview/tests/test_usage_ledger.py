@@ -0,0 +1,50 @@
+from django.test import TestCase
+from unittest import mock
+
+from interview.models import UsageRecord
+from interview.services.usage_ledger import KIND_MODEL, KIND_TTS, UsageLedger, usage_scope
+from interview.tests import make_interview
+
+
+class UsageLedgerTests(TestCase):
+    def setUp(self):
+        # The writer thread only wakes for a full batch; the tests flush explicitly
+        self.ledger = UsageLedger(batch_size=100, flush_seconds=3600, max_buffer=3)
+        self.interview = make_interview()
+
+    def test_flush_attributes_records_to_the_scoped_interview_and_its_round(self):
+        with usage_scope(self.interview.id):
+            self.ledger.record(KIND_MODEL, call_type="turn", model="m", input_tokens=10, output_tokens=5)
+        with usage_scope(round_id=self.interview.round_id):
+            self.ledger.record(KIND_MODEL, call_type="question", input_tokens=-1)
+        self.ledger.record(KIND_TTS, characters=42, latency_ms=12.34567)
+
+        self.assertEqual(self.ledger.flush(), 3)
+        self.assertEqual(self.ledger.flush(), 0)
+        turn, question, speech = UsageRecord.objects.order_by("id")
+        self.assertEqual((turn.interview_id, turn.round_id), (self.interview.id, self.interview.round_id))
+        self.assertEqual((question.interview_id, question.round_id), (None, self.interview.round_id))
+        self.assertEqual(question.input_tokens, 0)
+        self.assertEqual((speech.interview_id, speech.characters, speech.latency_ms), (None, 42, 12.346))
+
+    def test_records_for_deleted_interviews_are_kept_without_the_link(self):
+        gone = make_interview()
+        with usage_scope(gone.id):
+            self.ledger.record(KIND_MODEL, call_type="score")
+        gone.delete()
+
+        self.assertEqual(self.ledger.flush(), 1)
+        self.assertIsNone(UsageRecord.objects.get().interview_id)
+
+    def test_failed_write_keeps_the_records_for_the_next_flush(self):
+        self.ledger.record(KIND_MODEL, call_type="turn")
+        with mock.patch.object(UsageRecord.objects, "bulk_create", side_effect=RuntimeError("db down")):
+            self.assertEqual(self.ledger.flush(), 0)
+        self.assertEqual(self.ledger.flush(), 1)
+
+    def test_full_buffer_drops_the_oldest_records(self):
+        for call_type in ("a", "b", "c", "d"):
+            self.ledger.record(KIND_MODEL, call_type=call_type)
+
+        self.ledger.flush()
+        self.assertEqual(list(UsageRecord.objects.order_by("id").values_list("call_type", flat=True)), ["b", "c", "d"])
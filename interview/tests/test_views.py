@@ -0,0 +1,14 @@
+from django.test import override_settings
+
+from interview.tests import ViewBudgetTestCase
+
+
+@override_settings(LLM_PROVIDER="fake", REAPER_ENABLED=False)
+class InterviewViewBudgetTests(ViewBudgetTestCase):
+    def test_view_budgets(self):
+        self.assertViewBudgets(
+            [
+                ("/interview/{interview}/", 2),
+                ("/interview/api/health/", 0),
+            ]
+        )
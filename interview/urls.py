@@ -8,5 +8,12 @@ urlpatterns = [
     path("<int:id>/", views.interview, name="interview"),
     path("end/<int:id>/", views.end, name="end-interview"),
     path("api/get-response/", views.get_response, name="get_response"),
+    path("api/heartbeat/", views.heartbeat, name="heartbeat"),
+    path("api/health/", views.health, name="health"),
+    path("api/uploads/", views.create_upload, name="create_upload"),
+    path("api/uploads/<str:upload_id>/", views.upload_chunk, name="upload"),
+    path("api/uploads/<str:upload_id>/finish/", views.finish_upload, name="finish_upload"),
+    path("recordings/<str:upload_id>/", views.recording, name="recording"),
+    path("recordings/<str:upload_id>/<str:asset>", views.recording_preview, name="recording_preview"),
     # path("api/end-interview/", views.end_interview_audio, name="end_interview_audio"),
 ]
\ No newline at end of file
@@ -1,26 +1,56 @@
 import base64
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from datetime import timedelta
 import json
 import logging
+import secrets
 
 from cand.models import Candidate
-from .models import Question, Interview
+from .models import Question, Interview, RecordingUpload
 
 # from .mocks import MOCK_QUESTION
-from interview.services.interview_orchestrator import InterviewOrchestrator
+from interview.services.model_router import get_router
+from interview.services.presence import get_presence
+from interview.services.question_pool import take_question
+from interview.services.rate_limiter import get_limiter
+from interview.services.recording_preview import build_in_background as build_preview_in_background, preview_paths
+from interview.services.recording_storage import LocalRecordingStorage, get_storage as get_recording_storage
+from interview.services.resilience import Deadline, provider_health
+from interview.services.usage_ledger import usage_scope
+from vode.tracing import span
 
 logger = logging.getLogger(__name__)
-orchestrator = InterviewOrchestrator()
-QUESTION_THRESHOLD = 5  # could be 1000
+
+
+def get_orchestrator():
+    """
+    The process-wide InterviewOrchestrator. Imported on first use, so loading
+    the URLconf (every worker, every management command's checks) doesn't
+    import the AI services and their SDKs.
+    """
+    from interview.services.interview_orchestrator import get_orchestrator as shared_orchestrator
+
+    return shared_orchestrator()
 
 
 def end(request, id: int):
-    """End the interview and save video URLs."""
+    """
+    End the interview and save video URLs.
+
+    Scoring shares a REQUEST_BUDGET_SECONDS deadline with the rest of the
+    request, so a slow model falls back to the default score instead of the
+    worker being killed by gunicorn.
+    """
+    deadline = Deadline(settings.REQUEST_BUDGET_SECONDS)
     mock_candidate = Candidate.objects.first()  # will be request.user.candidate later
 
     try:
@@ -32,6 +62,14 @@ def end(request, id: int):
             messages.error(request, "You are not authorized to view this interview.")
             return redirect("/candidate/")
 
+        # Claim it before the slow scoring call, the way reap_expired() does: whoever
+        # sets completed_at first owns finalizing it, so a double submit or the reaper
+        # can't score it twice
+        completed_at = timezone.now()
+        if not Interview.objects.filter(id=id, completed_at__isnull=True).update(completed_at=completed_at):
+            return render(request, "interview/end.html")
+        interview_obj.completed_at = completed_at
+
         screen_video = request.GET.get("screen_video", "")
         candidate_video = request.GET.get("candidate_video", "")
 
@@ -41,14 +79,22 @@ def end(request, id: int):
             interview_obj.candidate_video = candidate_video
 
         if screen_video or candidate_video:
-            interview_obj.save()  # so I don't lose them lol
+            interview_obj.save(update_fields=["screen_video", "candidate_video"])  # so I don't lose them lol
             logger.info(f"Saved video URLs for interview {id}")
 
-        end_result = orchestrator.end_interview(
-            interview_obj.round.success_metrics_list
-        )
+        # Recordings were uploaded while the interview ran; all that's left is finalizing them
+        # (finish_recording stores their URLs on the interview)
+        for upload in interview_obj.recording_uploads.filter(completed_at__isnull=True):
+            try:
+                finish_recording(upload)
+            except Exception as e:
+                logger.error(f"Could not finish {upload.kind} recording for interview {id}: {e}")
+
+        with usage_scope(interview_obj.id, interview_obj.round_id):
+            end_result = get_orchestrator().end_interview(
+                interview_obj.round.success_metrics_list, interview_id=interview_obj.id, deadline=deadline
+            )
 
-        interview_obj.completed_at = timezone.now()
         # if interview_obj.score == 0 and end_result.get("success"):
         score = end_result.get("score", 50)
         score = max(0, min(100, int(score)))
@@ -56,7 +102,7 @@ def end(request, id: int):
         interview_obj.score = score
         interview_obj.notes = end_result.get("feedback", "")
 
-        interview_obj.save()
+        interview_obj.save(update_fields=["score", "notes"])
 
         messages.success(request, "Interview completed successfully!")
         return render(request, "interview/end.html")
@@ -70,13 +116,13 @@ def interview(request, id: int):
     """
     Interview view - displays the technical interview interface
     """
-    mock_candidate = Candidate.objects.first()  # TODO: request.user.candidate
-    print("Interview starting for", mock_candidate.user.get_full_name())
+    mock_candidate = Candidate.objects.select_related("user").first()  # TODO: request.user.candidate
+    logger.debug(f"Interview {id} starting for {mock_candidate.user.get_full_name()}")
 
     try:
-        interview_obj = Interview.objects.get(id=id)
+        interview_obj = Interview.objects.select_related("round__role", "question").get(id=id)
 
-        if interview_obj.candidate != mock_candidate:
+        if interview_obj.candidate_id != mock_candidate.id:
             messages.error(request, "You are not authorized to view this interview.")
             return redirect("/candidate/")
 
@@ -94,6 +140,7 @@ def interview(request, id: int):
         interview_context = {
             "role": interview_obj.round.role.title,
             "difficulty": interview_obj.round.difficulty_level,
+            "interview_id": interview_obj.id,
         }
 
         # Prepare question data for AI initialization
@@ -104,7 +151,7 @@ def interview(request, id: int):
         }
 
         # Initialize the AI agent with full context about the problem
-        orchestrator.start_interview(question_data, interview_context)
+        get_orchestrator().start_interview(question_data, interview_context)
 
         context = {
             "interview": interview_obj,
@@ -143,7 +190,12 @@ def get_response(request):
     Backend returns:
     - reasoning: Text response from AI
     - audio: Base64 encoded MP3 audio feedback
+    - test_results: Sandboxed run of the code against the question's test cases
+
+    The whole request shares a REQUEST_BUDGET_SECONDS deadline, so a slow
+    provider degrades the reply instead of pinning the worker.
     """
+    deadline = Deadline(settings.REQUEST_BUDGET_SECONDS)
     try:
         data = json.loads(request.body)
         code = data.get("code", "")
@@ -151,20 +203,41 @@ def get_response(request):
         interview_id = data.get("interview_id")
 
         # Get interview context
-        interview = Interview.objects.select_related("round", "round__role").get(
-            id=interview_id
-        )
+        with span("interview.load", request_bytes=len(request.body)):
+            interview = Interview.objects.select_related(
+                "round", "round__role", "question"
+            ).get(id=interview_id)
+        # A turn is as good as a heartbeat
+        get_presence().beat(interview.id)
         context = {
+            "interview_id": interview.id,
             "role": interview.round.role.title,
             "difficulty": interview.round.difficulty_level,
+            "question_id": interview.question_id,
+            "test_cases": interview.question.test_cases if interview.question else None,
         }
 
         reasoning = ""
         audio_base64 = "EMPTY"
+        test_results = None
+        fast_path = None
 
         # Try to get AI reasoning from Gemini (separate try block)
         try:
-            result = orchestrator.get_ai_response(code, audio_transcript, context)
+            with (
+                usage_scope(interview.id, interview.round_id),
+                span("turn", code_chars=len(code), transcript_chars=len(audio_transcript)) as turn_span,
+            ):
+                result = get_orchestrator().get_ai_response(
+                    code, audio_transcript, context, deadline=deadline
+                )
+                turn_span.set(fast_path=result.get("fast_path"), success=result.get("success"))
+            test_results = result.get("test_results")
+            fast_path = result.get("fast_path")
+
+            if result.get("turn"):
+                with span("interview.record_turn"):
+                    interview.record_turn(result["turn"], complexity=result.get("complexity"))
 
             if result.get("success"):
                 reasoning = result.get("reasoning", result.get("message", ""))
@@ -172,7 +245,9 @@ def get_response(request):
                 # Try to encode audio (separate try block)
                 try:
                     if result.get("audio"):
-                        audio_base64 = base64.b64encode(result["audio"]).decode("utf-8")
+                        with span("audio.encode", audio_bytes=len(result["audio"])) as encode_span:
+                            audio_base64 = base64.b64encode(result["audio"]).decode("utf-8")
+                            encode_span.set(encoded_bytes=len(audio_base64))
                 except Exception as audio_error:
                     logger.error(f"Error encoding audio: {audio_error}")
                     audio_base64 = "EMPTY"
@@ -193,7 +268,13 @@ def get_response(request):
 
         # Always return response with reasoning and audio (even if one failed)
         return JsonResponse(
-            {"reasoning": reasoning, "audio": audio_base64, "success": True}
+            {
+                "reasoning": reasoning,
+                "audio": audio_base64,
+                "test_results": test_results,
+                "fast_path": fast_path,
+                "success": True,
+            }
         )
 
     except Interview.DoesNotExist:
@@ -205,9 +286,53 @@ def get_response(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+@require_http_methods(["POST"])
+@csrf_exempt
+def heartbeat(request):
+    """
+    Presence ping from the interview page (see sendHeartbeat in api.js).
+
+    Frontend sends:
+    - interview_id as JSON
+
+    Returns:
+        JSON with active: false once the interview has been finished (e.g. by
+        the reaper while the candidate was away), so the page can leave
+    """
+    try:
+        interview_id = int(json.loads(request.body).get("interview_id"))
+    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return JsonResponse({"error": "Invalid JSON or interview_id"}, status=400)
+    return JsonResponse({"active": get_presence().beat(interview_id)})
+
+
+@require_http_methods(["GET"])
+def health(request):
+    """
+    Provider health for monitoring, for this worker process: circuit breaker
+    state, recent p95 latency and rate limiter queue depth per provider/model,
+    plus the current model routing order per call type.
+    """
+    providers = provider_health()
+    for name, status in providers.items():
+        # Breakers are per model ("gemini:<model>"), rate limits per provider
+        status["queue_depth"] = get_limiter(name.split(":")[0]).queue_depth
+
+    degraded = any(status["state"] != "closed" for status in providers.values())
+    return JsonResponse(
+        {
+            "status": "degraded" if degraded else "ok",
+            "providers": providers,
+            # Read from the shared registry so a health check doesn't build the orchestrator
+            "routes": get_router(settings.LLM_PROVIDER).snapshot(),
+        }
+    )
+
+
 def generate_interview_question(interview: Interview) -> Question:
     """
-    Generate and create a Question object for an interview
+    Pick a Question for an interview from its round's pool of unused questions.
+    When the pool is empty it is refilled with one batched model call.
 
     Args:
         interview: Interview model instance
@@ -215,29 +340,8 @@ def generate_interview_question(interview: Interview) -> Question:
     Returns:
         Question: A Question model instance
     """
-    latest_questions = Question.objects.filter(round=interview.round).order_by("-id")[
-        :QUESTION_THRESHOLD
-    ]
-    question_titles = [question.title for question in latest_questions]
-    print("The topics to be generated for:", interview.round.data_structures)
-
-    context = {
-        "difficulty": interview.round.difficulty_level,
-        "topics": interview.round.data_structures,
-        "already_picked": ", ".join(question_titles) or "None",
-    }
-
-    question = orchestrator.gemini.get_question(context)
-    question, created = Question.objects.get_or_create(
-        title=question["title"],
-        defaults={
-            "statement": question["statement"],
-            "test_cases": question["test_cases"],
-            "round": interview.round,
-        },
-    )
-
-    return question
+    logger.debug(f"Taking a question for interview {interview.id} on: {interview.round.data_structures}")
+    return take_question(interview.round, get_orchestrator().gemini)
 
 
 # Make end behave like this and then remove end.
@@ -273,7 +377,10 @@ def end_interview_audio(request):
         success_metrics = interview.round.success_metrics_list
 
         # Get score and feedback from orchestrator
-        result = orchestrator.end_interview(success_metrics)
+        with usage_scope(interview.id, interview.round_id):
+            result = get_orchestrator().end_interview(
+                success_metrics, interview_id=interview.id, deadline=Deadline(settings.REQUEST_BUDGET_SECONDS)
+            )
 
         if result["success"]:
             # Save score and feedback to Interview model
@@ -322,3 +429,371 @@ def end_interview_audio(request):
     except Exception as e:
         logger.error(f"Error ending interview: {e}")
         return JsonResponse({"error": str(e), "success": False}, status=500)
+
+
+# Resumable recording uploads (a subset of the tus protocol: create, HEAD, PATCH at an offset, finish)
+TUS_VERSION = "1.0.0"
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+# Interview field that gets the finished recording's URL
+RECORDING_FIELDS = {"screen": "screen_video", "candidate": "candidate_video"}
+
+
+def _upload_response(upload, status=204, data=None):
+    response = JsonResponse(data, status=status) if data is not None else HttpResponse(status=status)
+    response["Tus-Resumable"] = TUS_VERSION
+    response["Upload-Offset"] = str(upload.offset)
+    if upload.length is not None:
+        response["Upload-Length"] = str(upload.length)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def create_upload(request):
+    """
+    Start (or resume) a recording upload.
+
+    Frontend sends:
+    - interview_id, kind ("screen" or "candidate") as JSON
+    - session: id of this recorder session (one per page load)
+    - recorded_ms: how long the recorder has been running (lines turns up with the video)
+    - optional Upload-Length header with the total size
+
+    Each recorder session is a new WebM stream, so it gets its own upload (a
+    segment, see Interview.recording_parts); appending it to an earlier
+    session's file would leave an unplayable recording. An unfinished upload
+    of the same session is returned instead of starting over.
+
+    Returns:
+        JSON with the upload id, its URL and the current offset
+    """
+    try:
+        data = json.loads(request.body)
+        interview = Interview.objects.get(id=data.get("interview_id"))
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    except Interview.DoesNotExist:
+        return JsonResponse({"error": "Interview not found"}, status=404)
+
+    kind = data.get("kind")
+    if kind not in RECORDING_FIELDS:
+        return JsonResponse({"error": f"kind must be one of {', '.join(RECORDING_FIELDS)}"}, status=400)
+    session = data.get("session") or ""
+    if not isinstance(session, str) or len(session) > 32:
+        return JsonResponse({"error": "session must be a string of at most 32 characters"}, status=400)
+
+    length = request.headers.get("Upload-Length")
+    try:
+        length = int(length) if length else None
+        # Media recorded before this request; the client's clock never has to match ours
+        recorded_ms = max(0, int(data.get("recorded_ms") or 0))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "Invalid Upload-Length or recorded_ms"}, status=400)
+    if length is not None and length > settings.RECORDING_MAX_BYTES:
+        return JsonResponse({"error": "Recording too large"}, status=413)
+
+    upload = RecordingUpload.objects.filter(
+        interview=interview, kind=kind, session=session, completed_at__isnull=True
+    ).first()
+    status = 200
+    if upload is None:
+        upload_id = secrets.token_hex(16)
+        upload = RecordingUpload(
+            id=upload_id,
+            interview=interview,
+            kind=kind,
+            session=session,
+            key=f"{interview.id}/{kind}-{upload_id}.webm",
+            length=length,
+            recording_started_at=timezone.now() - timedelta(milliseconds=recorded_ms),
+        )
+        try:
+            get_recording_storage().start(upload)
+        except Exception as e:
+            logger.error(f"Could not start {kind} upload for interview {interview.id}: {e}")
+            return JsonResponse({"error": "Recording storage unavailable"}, status=503)
+        upload.save()
+        status = 201
+        logger.info(f"Started {kind} recording upload {upload.id} for interview {interview.id}")
+
+    location = reverse("interview:upload", args=[upload.id])
+    response = _upload_response(
+        upload, status=status, data={"id": upload.id, "url": location, "offset": upload.offset}
+    )
+    response["Location"] = location
+    return response
+
+
+@require_http_methods(["HEAD", "PATCH"])
+@csrf_exempt
+def upload_chunk(request, upload_id):
+    """
+    HEAD: current offset (where to resume from) in the Upload-Offset header.
+
+    PATCH: append the body at Upload-Offset, which must match the server's
+    offset. The body is streamed to storage, not read into memory. If the
+    connection drops mid-chunk, whatever arrived is kept and HEAD says
+    where to carry on.
+    """
+    try:
+        upload = RecordingUpload.objects.get(id=upload_id)
+    except RecordingUpload.DoesNotExist:
+        return JsonResponse({"error": "Upload not found"}, status=404)
+
+    if request.method == "HEAD":
+        return _upload_response(upload, status=200)
+
+    if upload.completed_at is not None:
+        return _upload_response(upload, status=409, data={"error": "Upload already finished"})
+    if request.content_type != CHUNK_CONTENT_TYPE:
+        return JsonResponse({"error": f"Content-Type must be {CHUNK_CONTENT_TYPE}"}, status=415)
+    try:
+        offset = int(request.headers["Upload-Offset"])
+        size = int(request.META["CONTENT_LENGTH"])
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "Upload-Offset and Content-Length are required"}, status=400)
+
+    limit = upload.length if upload.length is not None else settings.RECORDING_MAX_BYTES
+    if size > settings.RECORDING_MAX_CHUNK_BYTES or offset + size > limit:
+        return _upload_response(upload, status=413, data={"error": "Chunk too large"})
+
+    storage = get_recording_storage()
+    # Compare and move the offset under the storage lock. Two requests resuming from
+    # the same offset would otherwise both write, leaving one's bytes in the file and
+    # the other's length in the offset
+    with storage.lock(upload):
+        upload.refresh_from_db(fields=["offset", "storage_state", "completed_at"])
+        if upload.completed_at is not None:
+            return _upload_response(upload, status=409, data={"error": "Upload already finished"})
+        if offset != upload.offset:
+            return _upload_response(upload, status=409, data={"error": "Offset mismatch"})
+
+        written = storage.append(upload, request, size)
+
+        # Without file locks (Windows) the conditional update still lets only one win
+        updated = RecordingUpload.objects.filter(id=upload.id, offset=offset).update(
+            offset=offset + written, storage_state=upload.storage_state, updated_at=timezone.now()
+        )
+    if not updated:
+        upload.refresh_from_db()
+        return _upload_response(upload, status=409, data={"error": "Offset mismatch"})
+    upload.offset = offset + written
+    return _upload_response(upload)
+
+
+@require_http_methods(["POST"])
+@csrf_exempt
+def finish_upload(request, upload_id):
+    """
+    Complete an upload and store its URL on the interview.
+
+    Returns:
+        JSON with the recording URL and its size in bytes
+    """
+    try:
+        upload = RecordingUpload.objects.get(id=upload_id)
+    except RecordingUpload.DoesNotExist:
+        return JsonResponse({"error": "Upload not found"}, status=404)
+
+    if upload.completed_at is None:
+        if upload.length is not None and upload.offset != upload.length:
+            return _upload_response(upload, status=409, data={"error": "Upload is incomplete"})
+        try:
+            finish_recording(upload)
+        except Exception as e:
+            logger.error(f"Could not finish recording upload {upload.id}: {e}")
+            return JsonResponse({"error": "Recording storage unavailable"}, status=503)
+
+    return _upload_response(upload, status=200, data={"url": upload.url, "bytes": upload.offset})
+
+
+def finish_recording(upload):
+    """
+    Finalize an upload in storage. The interview's screen_video/candidate_video
+    keeps the URL of the first segment of that kind; later ones are listed by
+    Interview.recording_parts().
+
+    Returns:
+        The recording URL
+
+    Raises:
+        Exception: If the storage backend could not finish the upload
+    """
+    upload.url = get_recording_storage().finish(upload)
+    upload.completed_at = timezone.now()
+    upload.save(update_fields=["url", "storage_state", "completed_at", "updated_at"])
+    first = (
+        RecordingUpload.objects.filter(interview_id=upload.interview_id, kind=upload.kind, completed_at__isnull=False)
+        .order_by("recording_started_at", "created_at")
+        .values_list("url", flat=True)
+        .first()
+    )
+    Interview.objects.filter(id=upload.interview_id).update(**{RECORDING_FIELDS[upload.kind]: first})
+    logger.info(f"Finished {upload.kind} recording for interview {upload.interview_id} ({upload.offset} bytes)")
+    # Thumbnails and the turn index are built off the request path
+    build_preview_in_background(upload.id)
+    return upload.url
+
+
+
+class _RangeFile:
+    """
+    Read-limited view of an open file, starting at its current position.
+
+    It keeps fileno(), so gunicorn's wsgi.file_wrapper still sends it with
+    sendfile() (bounded by Content-Length) instead of copying through Python.
+    """
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def close(self):
+        self.f.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a Range header against a file of `size` bytes.
+
+    Returns:
+        (start, end) inclusive, or None to send the whole file (no header,
+        or one we don't handle, such as several ranges)
+
+    Raises:
+        ValueError: If the range can't be satisfied (send 416)
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, _, end = header[len("bytes="):].strip().partition("-")
+    try:
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(end))
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+@require_http_methods(["GET", "HEAD"])
+def recording(request, upload_id):
+    """
+    Serve a locally stored recording with HTTP Range support, so the player
+    can seek without downloading the whole file.
+
+    Finished recordings never change, so they are cached by the browser and
+    answered with 304 when revalidated. Depending on RECORDING_SENDFILE the
+    bytes go out through nginx/Apache (X-Accel-Redirect / X-Sendfile, which
+    handle ranges themselves) or with sendfile() from the worker.
+    """
+    try:
+        upload = RecordingUpload.objects.get(id=upload_id)
+    except RecordingUpload.DoesNotExist:
+        raise Http404("No such recording")
+
+    storage = get_recording_storage()
+    if not isinstance(storage, LocalRecordingStorage):
+        # Remote storage serves (and range-requests) recordings itself
+        if not upload.url:
+            raise Http404("Recording is still uploading")
+        return redirect(upload.url)
+
+    # An unfinished file may end in bytes that were never acknowledged
+    size = upload.offset
+    etag = f'"{upload.id}-{size}"'
+    if upload.completed_at is not None:
+        cache_control = f"private, max-age={settings.RECORDING_CACHE_SECONDS}, immutable"
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(upload.completed_at.timestamp())
+        )
+        if not_modified is not None:
+            not_modified["Cache-Control"] = cache_control
+            return not_modified
+    else:
+        cache_control = "no-store"
+
+    if settings.RECORDING_SENDFILE:
+        response = HttpResponse(content_type="video/webm")
+        if settings.RECORDING_SENDFILE == "x-accel-redirect":
+            response["X-Accel-Redirect"] = settings.RECORDING_ACCEL_PREFIX + upload.key
+        else:
+            response["X-Sendfile"] = storage.path(upload.key)
+        response["Cache-Control"] = cache_control
+        response["ETag"] = etag
+        return response
+
+    start, end = 0, size - 1
+    status = 200
+    # If-Range: only honour the range if the client's copy is still current
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            status = 206
+
+    try:
+        f = open(storage.path(upload.key), "rb")
+    except FileNotFoundError:
+        raise Http404("Recording file is missing")
+    f.seek(start)
+    length = max(0, end - start + 1)
+    response = FileResponse(_RangeFile(f, length), status=status, content_type="video/webm")
+    response["Content-Length"] = str(length)
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = cache_control
+    response["ETag"] = etag
+    if upload.completed_at is not None:
+        response["Last-Modified"] = http_date(upload.completed_at.timestamp())
+    return response
+
+
+# Preview files per recording and their content types
+PREVIEW_ASSETS = {"sprite.jpg": "image/jpeg", "index.json": "application/json"}
+
+
+@require_http_methods(["GET", "HEAD"])
+def recording_preview(request, upload_id, asset):
+    """A recording's thumbnail sprite or JSON index (see services.recording_preview)"""
+    if asset not in PREVIEW_ASSETS:
+        raise Http404("No such preview file")
+    try:
+        upload = RecordingUpload.objects.get(id=upload_id, preview_status="ready")
+    except RecordingUpload.DoesNotExist:
+        raise Http404("Preview not ready")
+
+    sprite_path, index_path = preview_paths(upload)
+    path = sprite_path if asset == "sprite.jpg" else index_path
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        raise Http404("Preview file is missing")
+    response = FileResponse(f, content_type=PREVIEW_ASSETS[asset])
+    # Rebuilding a preview (build_recording_previews --force) changes it, so revalidate after a while
+    response["Cache-Control"] = f"private, max-age={settings.RECORDING_CACHE_SECONDS}"
+    return response
+
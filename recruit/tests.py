@@ -1,3 +1,14 @@
-from django.test import TestCase
+from interview.tests import ViewBudgetTestCase
 
-# Create your tests here.
+
+class RecruiterViewBudgetTests(ViewBudgetTestCase):
+    def test_view_budgets(self):
+        self.assertViewBudgets(
+            [
+                ("/recruiter/", 1),
+                ("/recruiter/role/{role}/", 2),
+                ("/recruiter/round/{round}/candidates/", 2),
+                ("/recruiter/usage/?by=interview", 1),
+                ("/recruiter/interview/{interview}/recordings/", 2),
+            ]
+        )
@@ -7,4 +7,6 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('role/<int:role_id>/', views.role_detail, name='role_detail'),
     path('round/<int:round_id>/candidates/', views.round_candidates, name='round_candidates'),
+    path('interview/<int:interview_id>/recordings/', views.interview_recordings, name='interview_recordings'),
+    path('usage/', views.usage, name='usage'),
 ]
@@ -1,7 +1,34 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from interview.models import Role, Interview, Round
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import timedelta
+from interview.models import Role, Interview, Round, UsageRecord
 from cand.models import Candidate
 
+# Usage report groupings: the fields each row is grouped by, and how to label it
+USAGE_GROUPINGS = {
+    'round': (
+        ('round_id', 'round__role__title', 'round__round_number', 'round__name'),
+        lambda row: f"{row['round__role__title']} - Round {row['round__round_number']}: {row['round__name']}"
+        if row['round_id'] else "No round",
+    ),
+    'role': (
+        ('round__role_id', 'round__role__title'),
+        lambda row: row['round__role__title'] or "No role",
+    ),
+    'day': (
+        ('day',),
+        lambda row: row['day'].isoformat(),
+    ),
+    'interview': (
+        ('interview_id', 'interview__candidate__user__first_name', 'interview__candidate__user__last_name', 'interview__round__role__title'),
+        lambda row: f"#{row['interview_id']} {row['interview__candidate__user__first_name']} "
+        f"{row['interview__candidate__user__last_name']} ({row['interview__round__role__title']})"
+        if row['interview_id'] else "Outside interviews",
+    ),
+}
+
 
 def index(request):
     """Recruiter dashboard - shows all roles"""
@@ -12,7 +39,8 @@ def index(request):
 def role_detail(request, role_id):
     """Recruiter view for a specific role - shows rounds as tiles"""
     role = get_object_or_404(Role, pk=role_id)
-    rounds = Round.objects.filter(role=role).order_by('round_number')
+    # Annotated so the template doesn't run a COUNT query per round
+    rounds = Round.objects.filter(role=role).annotate(interview_count=Count('interviews')).order_by('round_number')
     
     return render(request, 'recruit/role_detail.html', {
         'role': role,
@@ -22,13 +50,86 @@ def role_detail(request, role_id):
 
 def round_candidates(request, round_id):
     """Recruiter view for a specific round - shows all candidates with scores"""
-    round_obj = get_object_or_404(Round, pk=round_id)
+    round_obj = get_object_or_404(Round.objects.select_related('role'), pk=round_id)
     
     # Get all interviews for this round with candidate details
-    interviews = Interview.objects.filter(round=round_obj).order_by('-score').select_related('candidate')
+    interviews = Interview.objects.filter(round=round_obj).order_by('-score').select_related('candidate__user')
     
     return render(request, 'recruit/round_candidates.html', {
         'round': round_obj,
         'role': round_obj.role,
         'interviews': interviews
     })
+
+
+def interview_recordings(request, interview_id):
+    """Recruiter view for one interview's recordings (served with Range support, so seeking is instant)"""
+    interview = get_object_or_404(
+        Interview.objects.select_related('candidate__user', 'round__role'), pk=interview_id
+    )
+    # One part per recorder session: a reloaded interview page started a new recording
+    parts = interview.recording_parts()
+    try:
+        number = min(max(int(request.GET.get('part', 1)), 1), max(len(parts), 1))
+    except ValueError:
+        number = 1
+    part = parts[number - 1] if parts else {}
+    if part:
+        screen_video = part['screen'].url if 'screen' in part else ''
+        candidate_video = part['candidate'].url if 'candidate' in part else ''
+    else:
+        # Recordings from before uploads were tracked only have the URLs
+        screen_video, candidate_video = interview.screen_video, interview.candidate_video
+    # Thumbnails and turns come from the screen recording's preview when there is one
+    previews = [
+        upload for upload in (part.get('screen'), part.get('candidate'))
+        if upload and upload.preview_status == 'ready'
+    ]
+    return render(request, 'recruit/recordings.html', {
+        'interview': interview,
+        'round': interview.round,
+        'role': interview.round.role,
+        'screen_video': screen_video,
+        'candidate_video': candidate_video,
+        'parts': range(1, len(parts) + 1) if len(parts) > 1 else [],
+        'part': number,
+        'preview': previews[0] if previews else None,
+    })
+
+
+def usage(request):
+    """Recruiter view of model and TTS usage per round, role, day or interview, over the last N days"""
+    group_by = request.GET.get('by', 'round')
+    if group_by not in USAGE_GROUPINGS:
+        group_by = 'round'
+    try:
+        days = max(1, int(request.GET.get('days', 30)))
+    except ValueError:
+        days = 30
+    fields, label = USAGE_GROUPINGS[group_by]
+
+    # One GROUP BY query; nothing is summed in Python
+    rows = (
+        UsageRecord.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+        .annotate(day=TruncDate('created_at'))
+        .values(*fields)
+        .annotate(
+            calls=Count('id'),
+            failed=Count('id', filter=~Q(outcome='ok')),
+            interviews=Count('interview', distinct=True),
+            tokens_in=Sum('input_tokens'),
+            tokens_out=Sum('output_tokens'),
+            tts_characters=Sum('characters'),
+            total_ms=Sum('latency_ms'),
+            avg_ms=Avg('latency_ms'),
+        )
+        .order_by('-day' if group_by == 'day' else '-tokens_in')
+    )
+    rows = [dict(row, label=label(row)) for row in rows]
+
+    return render(request, 'recruit/usage.html', {
+        'rows': rows,
+        'group_by': group_by,
+        'groupings': list(USAGE_GROUPINGS),
+        'days': days,
+    })
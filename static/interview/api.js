@@ -1,6 +1,12 @@
 API_URL = "/interview/api/get-response/"
+const HEARTBEAT_URL = "/interview/api/heartbeat/";
+// How often the page tells the server the candidate is still here
+const HEARTBEAT_INTERVAL_MS = 15000;
+let heartbeatTimer = null;
 
 function endInterview() {
+    stopHeartbeat();
+
     const codeEditor = get("CODE_EDITOR");
     if (codeEditor) {
         codeEditor.style.pointerEvents = "none";
@@ -8,14 +14,13 @@ function endInterview() {
     }
 
     // alert("Time is up! Your interview has ended.");
-    window.location.href = `/interview/end/${window.interviewId}/`;
-    return;
-    // Later on, don't redirect. Debug the sendRecordings function instead.
-    // then when you get it to work, redirect in the console
-    // Return to prevent calling sendRecording cause. I haven't tested that part
-
-    window.sendRecordings();
-
+    // Recordings were uploaded during the interview: this flushes the last
+    // few seconds, then goes to the end page
+    if (typeof window.sendRecordings === "function") {
+        window.sendRecordings();
+    } else {
+        window.location.href = `/interview/end/${window.interviewId}/`;
+    }
 }
 
 async function sendTextCode(transcribedText = "", code = "") {
@@ -40,7 +45,8 @@ async function sendTextCode(transcribedText = "", code = "") {
 
         const data = await response.json();
 
-        // Display AI response in chat and play audio
+        // Show sandboxed test results, then the AI response
+        showTestResults(data.test_results);
         typeAndSay(data);
 
         return data;
@@ -74,8 +80,69 @@ function getCookie(name) {
 }
 
 
-function sendHeartbeat() {
-    console.log("sendHeartbeat called");
+function showTestResults(testResults) {
+    if (!testResults || (!testResults.ok && testResults.error === "Nothing to run")) {
+        return;
+    }
+
+    const chatMessages = get("CHAT_MESSAGES");
+    if (!chatMessages) return;
+
+    const msgDiv = make();
+    msgDiv.className = "chat-message system-message";
+    msgDiv.innerHTML = `<i class="bi bi-check2-square"></i><p></p>`;
+
+    // textContent, not innerHTML: errors and outputs come from candidate code
+    const summary = testResults.ok
+        ? `Tests: ${testResults.passed}/${testResults.total} passed${testResults.cached ? " (cached)" : ""}`
+        : `Tests could not run: ${testResults.error}`;
+    const failures = (testResults.results || [])
+        .filter(r => !r.passed)
+        .map(r => `Case ${r.index + 1}: ${r.error || "expected " + JSON.stringify(r.expected) + ", got " + JSON.stringify(r.actual)}`);
+    msgDiv.querySelector("p").textContent = [summary, ...failures].join("\n");
+    msgDiv.querySelector("p").style.whiteSpace = "pre-line";
+
+    add(msgDiv, chatMessages);
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+}
+
+function startHeartbeat() {
+    if (heartbeatTimer) {
+        return;
+    }
+    sendHeartbeat();
+    heartbeatTimer = setInterval(sendHeartbeat, HEARTBEAT_INTERVAL_MS);
+}
+
+function stopHeartbeat() {
+    clearInterval(heartbeatTimer);
+    heartbeatTimer = null;
+}
+
+async function sendHeartbeat() {
+    try {
+        const response = await fetch(HEARTBEAT_URL, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": getCookie("csrftoken")
+            },
+            body: JSON.stringify({ interview_id: window.interviewId })
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        if (!data.active) {
+            // Finished on the server (the candidate was away past the time limit)
+            stopHeartbeat();
+            window.location.href = `/interview/end/${window.interviewId}/`;
+        }
+    } catch (error) {
+        // A missed beat doesn't matter; the next one tries again
+        console.warn("sendHeartbeat error:", error);
+    }
 }
 
 function naturalSpeech(audioBase64) {
@@ -1,13 +1,23 @@
 // Video recording management
 let screenRecorder = null;
 let candidateRecorder = null;
-let screenChunks = [];
-let candidateChunks = [];
+// When recording began, so the server can line turns up with the video
+let recordingStartedAt = null;
+// Each page load records a new WebM stream, so its uploads are new segments
+// rather than a continuation of what an earlier load sent
+const recorderSession = crypto.randomUUID().replace(/-/g, "");
 
-// Cloudflare upload URL (set this from backend or env)
-const CLOUDFLARE_API_KEY = "hi_tehre_this_fake"
-const CLOUDFLARE_ACCOUNT_ID = "another_fake" // TODO: Get from backend
-const CLOUDFLARE_UPLOAD_URL = `https://api.cloudflare.com/client/v4/accounts/${CLOUDFLARE_ACCOUNT_ID}/stream`
+// Recordings stream to the backend while the interview runs, one resumable
+// upload per recording and recorder session (see create_upload in interview/views.py)
+const UPLOADS_URL = "/interview/api/uploads/";
+// MediaRecorder hands over data this often; each slice is sent as it arrives
+const RECORDER_TIMESLICE_MS = 5000;
+// Upper bound per PATCH when a backlog built up (e.g. after a network drop)
+const UPLOAD_CHUNK_BYTES = 5 * 1024 * 1024;
+// Consecutive failures before an uploader pauses until the next slice (backing off up to 30s)
+const UPLOAD_MAX_RETRIES = 8;
+// How long ending the interview waits for the last slices to upload
+const FINAL_FLUSH_TIMEOUT_MS = 15000;
 
 // Listen for streams ready event from permissions.js
 document.addEventListener("streamsReady", (event) => {
@@ -17,8 +27,15 @@ document.addEventListener("streamsReady", (event) => {
 });
 
 function startRecording() {
+    // Called from both the streamsReady event and permissions.js
+    if (screenRecorder || candidateRecorder) {
+        return;
+    }
+
+    recordingStartedAt = Date.now();
+
     // Use EXISTING streams from permissions.js - don't create new ones!
-    
+
     // Create MediaRecorder for screen (already has video + system audio)
     if (window.entire_screen_feed) {
         try {
@@ -29,11 +46,11 @@ function startRecording() {
 
             screenRecorder.ondataavailable = (event) => {
                 if (event.data.size > 0) {
-                    screenChunks.push(event.data);
+                    screenUploader.push(event.data);
                 }
             };
 
-            screenRecorder.start(1000); // Collect data every second
+            screenRecorder.start(RECORDER_TIMESLICE_MS);
             console.log("Screen recording started with existing stream");
         } catch (error) {
             console.error("Failed to start screen recorder:", error);
@@ -58,11 +75,11 @@ function startRecording() {
 
             candidateRecorder.ondataavailable = (event) => {
                 if (event.data.size > 0) {
-                    candidateChunks.push(event.data);
+                    candidateUploader.push(event.data);
                 }
             };
 
-            candidateRecorder.start(1000);
+            candidateRecorder.start(RECORDER_TIMESLICE_MS);
             console.log("Candidate recording started with existing stream");
         } catch (error) {
             console.error("Failed to start candidate recorder:", error);
@@ -106,67 +123,156 @@ function stopRecording() {
     });
 }
 
-async function uploadToCloudflare(videoBlob, filename) {
-    try {
-        // Create form data for Cloudflare Stream upload
-        const formData = new FormData();
-        formData.append("file", videoBlob, `${filename}.webm`);
-        
-        const response = await fetch(CLOUDFLARE_UPLOAD_URL, {
-            method: "POST",
-            body: formData,
-            headers: {
-                "Authorization": `Bearer ${CLOUDFLARE_API_KEY}`
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+async function createUpload(kind) {
+    const response = await fetch(UPLOADS_URL, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+            interview_id: window.interviewId,
+            kind,
+            session: recorderSession,
+            // Elapsed rather than a timestamp, so the candidate's clock doesn't matter
+            recorded_ms: recordingStartedAt ? Date.now() - recordingStartedAt : 0
+        })
+    });
+    if (!response.ok) {
+        throw new Error(`Could not start ${kind} upload: ${response.status}`);
+    }
+    // If this session's upload already exists (a retried create), it comes back with its offset
+    return response.json();
+}
+
+async function uploadOffset(url) {
+    const response = await fetch(url, { method: "HEAD", cache: "no-store" });
+    if (!response.ok) {
+        throw new Error(`Could not read upload offset: ${response.status}`);
+    }
+    return parseInt(response.headers.get("Upload-Offset"), 10);
+}
+
+async function patchChunk(url, offset, chunk) {
+    // Returns the server's offset after the chunk
+    const response = await fetch(url, {
+        method: "PATCH",
+        headers: {
+            "Content-Type": "application/offset+octet-stream",
+            "Upload-Offset": String(offset),
+            "Tus-Resumable": "1.0.0"
+        },
+        body: chunk
+    });
+    const serverOffset = parseInt(response.headers.get("Upload-Offset"), 10);
+    if (response.ok) {
+        return serverOffset;
+    }
+    if (response.status === 409 && serverOffset !== offset) {
+        // Our offset was stale (an earlier chunk landed after all); carry on from the server's
+        return serverOffset;
+    }
+    throw new Error(`Chunk upload failed: ${response.status}`);
+}
+
+class RecordingUploader {
+    // Sends recorder slices in order; only what the server hasn't acknowledged is kept in memory
+
+    constructor(kind) {
+        this.kind = kind;
+        this.upload = null;
+        this.queue = [];
+        // Upload offset of the first queued byte
+        this.queueStart = 0;
+        this.sending = null;
+        this.failures = 0;
+    }
+
+    push(blob) {
+        this.queue.push(blob);
+        this.failures = 0;
+        this.pump();
+    }
+
+    pump() {
+        if (!this.sending) {
+            this.sending = this.sendQueued().finally(() => {
+                this.sending = null;
+                // A slice may have arrived just as the loop finished
+                if (this.queue.length && this.failures === 0) {
+                    this.pump();
+                }
+            });
+        }
+        return this.sending;
+    }
+
+    async sendQueued() {
+        while (this.queue.length) {
+            try {
+                if (!this.upload) {
+                    this.upload = await createUpload(this.kind);
+                    this.queueStart = this.upload.offset;
+                }
+                const pending = new Blob(this.queue, { type: "video/webm" });
+                const offset = await patchChunk(
+                    this.upload.url, this.queueStart, pending.slice(0, UPLOAD_CHUNK_BYTES)
+                );
+                this.acknowledge(pending, offset);
+                this.failures = 0;
+            } catch (error) {
+                this.failures++;
+                if (this.failures > UPLOAD_MAX_RETRIES) {
+                    console.error(`${this.kind} upload paused, retrying with the next slice:`, error);
+                    return;
+                }
+                console.warn(`${this.kind} upload interrupted at ${this.queueStart} bytes, retrying:`, error);
+                await sleep(Math.min(30000, 500 * 2 ** this.failures));
+                if (this.upload) {
+                    try {
+                        // Part of the chunk may have arrived before the connection dropped
+                        this.acknowledge(new Blob(this.queue), await uploadOffset(this.upload.url));
+                    } catch (offsetError) {
+                        console.warn("Could not read upload offset:", offsetError);
+                    }
+                }
             }
-        });
+        }
+    }
 
-        if (!response.ok) {
-            throw new Error(`Upload failed: ${response.status} ${response.statusText}`);
+    acknowledge(pending, offset) {
+        const sent = offset - this.queueStart;
+        if (sent <= 0) {
+            return;
         }
+        this.queue = sent < pending.size ? [pending.slice(sent)] : [];
+        this.queueStart = offset;
+    }
 
-        const data = await response.json();
-        console.log(`${filename} upload complete:`, data);
-        
-        // Cloudflare Stream returns the video URL in result.playback.hls
-        const videoUrl = data.result?.playback?.hls || data.result?.preview || null;
-        return videoUrl;
-    } catch (error) {
-        console.error(`Error uploading ${filename}:`, error);
-        throw error;
+    async drain() {
+        while (this.sending) {
+            await this.sending;
+        }
     }
 }
 
+const screenUploader = new RecordingUploader("screen");
+const candidateUploader = new RecordingUploader("candidate");
+
 async function sendRecordings() {
+    // Recordings were uploaded as they were made; only the last slices are left
     console.log("Stopping recordings...");
     await stopRecording();
 
-    console.log("Creating video blobs...");
-    const screenBlob = new Blob(screenChunks, { type: "video/webm" });
-    const candidateBlob = new Blob(candidateChunks, { type: "video/webm" });
-
-    console.log(`Screen video size: ${(screenBlob.size / 1024 / 1024).toFixed(2)} MB`);
-    console.log(`Candidate video size: ${(candidateBlob.size / 1024 / 1024).toFixed(2)} MB`);
-
-    try {
-        console.log("Uploading videos to Cloudflare...");
-        
-        const [screenUrl, candidateUrl] = await Promise.all([
-            uploadToCloudflare(screenBlob, "screen_video"),
-            uploadToCloudflare(candidateBlob, "candidate_video")
-        ]);
-
-        console.log("Upload complete!");
-        console.log("Screen URL:", screenUrl);
-        console.log("Candidate URL:", candidateUrl);
-
-        // Navigate to end page with video URLs
-        window.location.href = `/interview/end/${window.interviewId}/?screen_video=${encodeURIComponent(screenUrl)}&candidate_video=${encodeURIComponent(candidateUrl)}`;
-    } catch (error) {
-        console.error("Failed to upload videos:", error);
-        alert("Failed to upload interview recordings. Please contact support.");
-        // Still navigate to end page even if upload fails
-        window.location.href = `/interview/end/${window.interviewId}/`;
+    const drained = await Promise.race([
+        Promise.all([screenUploader.drain(), candidateUploader.drain()]).then(() => true),
+        sleep(FINAL_FLUSH_TIMEOUT_MS).then(() => false)
+    ]);
+    if (!drained) {
+        console.error("Recording upload did not finish in time; the end page keeps what arrived");
     }
+
+    // The end page finalizes the uploads and stores their URLs on the interview
+    window.location.href = `/interview/end/${window.interviewId}/`;
 }
 
 // Export functions for use in other files
@@ -280,6 +280,9 @@ onload = () => {
         console.error("TIMER_BADGE element not found");
     }
 
+    // Lets the server tell an open interview from an abandoned one
+    startHeartbeat();
+
     // Initialize all monitoring systems
     // Speech recognition is initialized in permissions.js
     watchMonacoEditor();
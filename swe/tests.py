@@ -1,3 +1,12 @@
-from django.test import TestCase
+from interview.tests import ViewBudgetTestCase
 
-# Create your tests here.
+
+class SWEViewBudgetTests(ViewBudgetTestCase):
+    def test_view_budgets(self):
+        self.assertViewBudgets(
+            [
+                ("/swe/", 2),
+                ("/swe/role/{role}/rounds/", 2),
+                ("/swe/round/{round}/edit/", 1),
+            ]
+        )
@@ -38,7 +38,7 @@ def role_detail(request, role_id):
             score__lt=85,
         )
         .order_by("-score")
-        .select_related("candidate", "round")
+        .select_related("candidate__user", "round")
     )
 
     candidates_for_review = [interview.candidate for interview in interviews]
@@ -64,7 +64,7 @@ def role_detail(request, role_id):
 @require_http_methods(["GET", "POST"])
 def round_edit(request, round_id):
     """SWE view to edit round configuration properties"""
-    round_obj = get_object_or_404(Round, pk=round_id)
+    round_obj = get_object_or_404(Round.objects.select_related("role"), pk=round_id)
 
     if request.method == "POST":
         # Update round properties
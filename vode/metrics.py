@@ -0,0 +1,123 @@
+"""
+Prometheus metrics.
+
+Under gunicorn each worker is a separate process, so metrics use
+prometheus_client's multiprocess mode: gunicorn.conf.py sets
+PROMETHEUS_MULTIPROC_DIR before the workers start, every worker writes its
+values to files there, and /metrics aggregates all of them. Without the
+variable (runserver, management commands) the in-process registry is used.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+import hmac
+import os
+import time
+
+# Model and speech calls take seconds, not milliseconds
+SLOW_CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+REQUEST_SECONDS = Histogram(
+    "vode_http_request_duration_seconds",
+    "Request latency per view",
+    ["view", "method", "status"],
+    buckets=SLOW_CALL_BUCKETS,
+)
+MODEL_CALL_SECONDS = Histogram(
+    "vode_model_call_duration_seconds",
+    "Model call latency (including rate limit wait) per call type",
+    ["call_type", "model", "outcome"],
+    buckets=SLOW_CALL_BUCKETS,
+)
+MODEL_TOKENS = Counter(
+    "vode_model_tokens",
+    "Model tokens used per call type",
+    ["call_type", "model", "direction"],
+)
+TTS_SECONDS = Histogram(
+    "vode_tts_duration_seconds",
+    "Text-to-speech call latency",
+    ["outcome"],
+    buckets=SLOW_CALL_BUCKETS,
+)
+TTS_CHARACTERS = Counter("vode_tts_characters", "Characters sent for text-to-speech")
+TTS_AUDIO_BYTES = Counter("vode_tts_audio_bytes", "Audio bytes generated by text-to-speech")
+TURNS = Counter(
+    "vode_interview_turns",
+    "Candidate turns by how they were answered (model, fallback or a fast path)",
+    ["source"],
+)
+# reason is a fixed set: timeout, circuit_open, rate_limited, error (see
+# resilience.failure_reason), or why a scoring reply was unusable
+FALLBACKS = Counter(
+    "vode_fallbacks",
+    "Replies that fell back to a local default instead of the provider's answer",
+    ["stage", "reason"],
+)
+LIVE_INTERVIEWS = Gauge(
+    "vode_live_interviews",
+    "Interviews with an active session",
+    multiprocess_mode="livesum",
+)
+SESSIONS_EVICTED = Counter(
+    "vode_sessions_evicted",
+    "In-memory interview sessions dropped because the interview ended elsewhere or went quiet",
+)
+INTERVIEWS_REAPED = Counter(
+    "vode_interviews_reaped",
+    "Abandoned interviews finalized after their time limit and grace period",
+)
+RATE_LIMIT_QUEUE_DEPTH = Gauge(
+    "vode_rate_limit_queue_depth",
+    "Calls waiting for provider capacity",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+
+
+class MetricsMiddleware:
+    """Records latency for every request, labelled by view name (not raw path)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        REQUEST_SECONDS.labels(
+            view=match.view_name if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+        ).observe(time.perf_counter() - started)
+        return response
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint.
+
+    If METRICS_TOKEN is set, requires "Authorization: Bearer <token>".
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponseForbidden()
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,110 @@
+"""
+Development-mode N+1 query detector.
+
+NPlusOneMiddleware records every SQL query a request runs, keyed by its shape
+(the SQL with IN (...) lists collapsed), the first project frame that ran it
+and the template line being rendered at the time. When one key repeats more
+than NPLUSONE_THRESHOLD times, it is logged or raised (settings.NPLUSONE_MODE).
+
+Walking the stack for every query is slow, so this is opt-in and meant for
+development only.
+"""
+
+from collections import Counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+import logging
+import os
+import re
+import sys
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_LIMIT = re.compile(r"LIMIT \d+")
+
+_PROJECT_DIR = str(settings.BASE_DIR)
+# Installed packages (e.g. a virtualenv inside the project) and other query wrappers
+_SKIP_DIRS = ("site-packages", "dist-packages")
+_SKIP_FILES = {__file__, os.path.join(os.path.dirname(__file__), "tracing.py")}
+
+
+class NPlusOneDetected(Exception):
+    """Raised (NPLUSONE_MODE = "raise") when a request repeats a query shape too often"""
+
+
+def query_shape(sql):
+    """SQL with the parts that vary between repetitions of the same lookup collapsed"""
+    return _LIMIT.sub("LIMIT n", _IN_LIST.sub("IN (...)", sql))
+
+
+def _call_site():
+    """
+    Returns:
+        (first project frame outside this module as "path:line in function",
+         innermost template being rendered as "template:line", or None)
+    """
+    site = None
+    template = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+
+        if template is None and code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            token = getattr(node, "token", None)
+            origin = getattr(node, "origin", None)
+            if token is not None and origin is not None:
+                template = f"{origin.template_name}:{token.lineno}"
+
+        if (
+            site is None
+            and filename.startswith(_PROJECT_DIR)
+            and filename not in _SKIP_FILES
+            and not any(skip in filename for skip in _SKIP_DIRS)
+        ):
+            site = f"{os.path.relpath(filename, _PROJECT_DIR)}:{frame.f_lineno} in {code.co_name}"
+
+        if site is not None and template is not None:
+            break
+        frame = frame.f_back
+    return site or "unknown", template
+
+
+class NPlusOneMiddleware:
+    """Counts repeated query shapes per request; removed from the stack unless NPLUSONE_MODE is set"""
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_MODE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counts = Counter()
+
+        def record(execute, sql, params, many, context):
+            counts[(query_shape(sql), *_call_site())] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.get_response(request)
+
+        repeated = [
+            (count, shape, site, template)
+            for (shape, site, template), count in counts.most_common()
+            if count > settings.NPLUSONE_THRESHOLD
+        ]
+        if not repeated:
+            return response
+
+        report = "\n".join(
+            f"  {count}x at {site}" + (f" (template {template})" if template else "") + f"\n    {shape[:300]}"
+            for count, shape, site, template in repeated
+        )
+        message = f"Possible N+1 queries in {request.method} {request.path}:\n{report}"
+        if settings.NPLUSONE_MODE == "raise":
+            raise NPlusOneDetected(message)
+        logger.warning(message)
+        return response
@@ -0,0 +1,265 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware profiles a view when the request carries a valid signed
+X-Vode-Profile header (get one from the staff-only /profiles/ page), or at
+random for PROFILING_SAMPLE_RATE of requests to PROFILING_VIEWS. Profiles are
+written to PROFILING_DIR as either:
+
+- cProfile stats (.pstats): exact call counts, open with pstats or snakeviz
+- sampled stacks (.speedscope.json): low overhead, open in speedscope.app
+
+Only the request thread is profiled; model calls running on the provider
+thread pool show up as time spent waiting on them.
+"""
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Vode-Profile"
+MODE_HEADER = "X-Vode-Profile-Mode"
+CPROFILE = "cprofile"
+SAMPLE = "sample"
+EXTENSIONS = {CPROFILE: ".pstats", SAMPLE: ".speedscope.json"}
+
+_SIGNING_SALT = "vode.profiling"
+_SAFE_NAME = re.compile(r"^[\w.-]+$")
+
+
+def make_token():
+    """Signed token for the profiling header, valid for PROFILING_TOKEN_MAX_AGE seconds"""
+    return signing.TimestampSigner(salt=_SIGNING_SALT).sign(secrets.token_hex(4))
+
+
+def valid_token(token):
+    try:
+        signing.TimestampSigner(salt=_SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class StackSampler:
+    """Samples one thread's stack on a background thread (a statistical profiler)"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []
+        self.frame_index = {}
+        self.samples = []
+        self.weights = []
+        self.started = None
+        self.duration = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _frame_id(self, frame):
+        code = frame.f_code
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self.frame_index:
+            self.frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return self.frame_index[key]
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame))
+                frame = frame.f_back
+            self.samples.append(stack[::-1])
+            self.weights.append(now - last)
+            last = now
+
+    def speedscope(self, name):
+        """The samples in speedscope's file format"""
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "vode.profiling",
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": self.samples,
+                    "weights": self.weights,
+                }
+            ],
+        }
+
+
+class ProfilingMiddleware:
+    """Profiles selected views; see the module docstring for how requests are selected"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sampled_views = {
+            name.strip() for name in settings.PROFILING_VIEWS.split(",") if name.strip()
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        profile = getattr(request, "_profile", None)
+        if profile is None:
+            return response
+
+        mode, profiler, started = profile
+        duration_ms = (time.perf_counter() - started) * 1000
+        if mode == CPROFILE:
+            profiler.disable()
+        else:
+            profiler.stop()
+
+        try:
+            filename = self._save(request, mode, profiler, duration_ms)
+        except OSError as e:
+            logger.error(f"Could not save profile: {e}")
+        else:
+            response["X-Vode-Profile-File"] = filename
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        mode = self._selected(request)
+        if mode is None:
+            return None
+
+        if mode == CPROFILE:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) is already active on this thread
+                return None
+        else:
+            profiler = StackSampler(threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL)
+            profiler.start()
+
+        request._profile = (mode, profiler, time.perf_counter())
+        return None
+
+    def _selected(self, request):
+        """Profiling mode for this request, or None if it shouldn't be profiled"""
+        mode = request.headers.get(MODE_HEADER) or settings.PROFILING_MODE
+        if mode not in EXTENSIONS:
+            mode = settings.PROFILING_MODE
+
+        token = request.headers.get(HEADER)
+        if token:
+            if valid_token(token):
+                return mode
+            logger.warning(f"Invalid or expired profiling token for {request.path}")
+            return None
+
+        if settings.PROFILING_SAMPLE_RATE <= 0:
+            return None
+        if self.sampled_views and request.resolver_match.view_name not in self.sampled_views:
+            return None
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return settings.PROFILING_MODE
+        return None
+
+    def _save(self, request, mode, profiler, duration_ms):
+        directory = settings.PROFILING_DIR
+        os.makedirs(directory, exist_ok=True)
+
+        view = re.sub(r"[^\w]+", "-", request.resolver_match.view_name).strip("-")
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{view}-{duration_ms:.0f}ms-{secrets.token_hex(2)}"
+        filename = name + EXTENSIONS[mode]
+        path = os.path.join(directory, filename)
+
+        if mode == CPROFILE:
+            profiler.dump_stats(path)
+        else:
+            with open(path, "w") as f:
+                json.dump(profiler.speedscope(f"{request.method} {request.path}"), f)
+
+        logger.info(f"Saved {mode} profile of {request.path} ({duration_ms:.0f}ms) to {filename}")
+        _prune(directory)
+        return filename
+
+
+def _list_profiles(directory):
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(tuple(EXTENSIONS.values())):
+            stat = entry.stat()
+            profiles.append({"name": entry.name, "size": stat.st_size, "modified": stat.st_mtime})
+    return sorted(profiles, key=lambda p: p["modified"], reverse=True)
+
+
+def _prune(directory):
+    """Keep only the newest PROFILING_MAX_FILES profiles"""
+    for profile in _list_profiles(directory)[settings.PROFILING_MAX_FILES :]:
+        try:
+            os.remove(os.path.join(directory, profile["name"]))
+        except OSError:
+            pass
+
+
+@staff_member_required
+def profiles_index(request):
+    """Staff page listing saved profiles, with a fresh token for the profiling header"""
+    profiles = _list_profiles(settings.PROFILING_DIR)
+    for profile in profiles:
+        profile["modified"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(profile["modified"]))
+    return render(
+        request,
+        "profiling/index.html",
+        {
+            "profiles": profiles,
+            "token": make_token(),
+            "token_max_age": settings.PROFILING_TOKEN_MAX_AGE,
+            "header": HEADER,
+            "mode_header": MODE_HEADER,
+        },
+    )
+
+
+@staff_member_required
+def profile_download(request, name):
+    """Download one saved profile"""
+    if not _SAFE_NAME.match(name) or not name.endswith(tuple(EXTENSIONS.values())):
+        raise Http404("No such profile")
+    path = os.path.join(settings.PROFILING_DIR, name)
+    if not os.path.isfile(path):
+        raise Http404("No such profile")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
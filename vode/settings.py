@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 import dj_database_url
 from dotenv import load_dotenv
@@ -58,6 +59,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "vode.tracing.TracingMiddleware",  # Request tracing (no-op unless TRACING_EXPORTER is set)
+    "vode.metrics.MetricsMiddleware",  # Per-view latency for /metrics
+    "vode.nplusone.NPlusOneMiddleware",  # Development only (no-op unless NPLUSONE_MODE is set)
+    "vode.profiling.ProfilingMiddleware",  # Profiles requests with a signed header or by sampling
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Add WhiteNoise for static files
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -169,7 +174,183 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # AI Services Configuration
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY", "")
-GEMINI_MODEL = "gemini-2.0-flash-lite"
+# Off by default so development doesn't use up credits; the page then falls back to browser speech
+ELEVENLABS_TTS_ENABLED = os.environ.get("ELEVENLABS_TTS_ENABLED", "False") == "True"
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-lite")
+# Higher quality model, used first for scoring and as the fallback for everything else
+GEMINI_QUALITY_MODEL = os.environ.get("GEMINI_QUALITY_MODEL", "gemini-2.0-flash")
+
+# Model routing per call type: a list of quality tiers (best first), each a list of
+# models. Within a tier the fastest healthy model wins; lower tiers are fallbacks.
+# Override with a JSON object in LLM_ROUTES.
+LLM_ROUTES = json.loads(os.environ.get("LLM_ROUTES", "null")) or {
+    "turn": [[GEMINI_MODEL], [GEMINI_QUALITY_MODEL]],
+    "question": [[GEMINI_QUALITY_MODEL, GEMINI_MODEL]],
+    "score": [[GEMINI_QUALITY_MODEL], [GEMINI_MODEL]],
+}
+# Weight of the newest sample in each model's moving average latency
+LLM_ROUTER_EWMA_ALPHA = float(os.environ.get("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+
+# LLM backend: "gemini", or "fake" for load tests and offline development
+LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "gemini")
+# Fake provider latency: "constant:S", "uniform:LOW:HIGH" or "lognormal:MEDIAN:SIGMA" (seconds)
+LLM_FAKE_LATENCY = os.environ.get("LLM_FAKE_LATENCY", "lognormal:0.8:0.35")
+LLM_FAKE_SEED = int(os.environ.get("LLM_FAKE_SEED", "0"))
+
+# Shared rate limits for AI providers ("db" = shared by all workers, "local" = per process)
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "db")
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.environ.get("RATE_LIMIT_MAX_WAIT_SECONDS", "20"))
+# A concurrency slot not released within this long (worker killed mid-call) is reclaimed.
+# Keep it above the longest provider timeout
+RATE_LIMIT_LEASE_SECONDS = float(os.environ.get("RATE_LIMIT_LEASE_SECONDS", "120"))
+# Share of each bucket (slots, requests, tokens) kept back per step down the priority order:
+# live turns can use all of it, question generation 75%, scoring 50% (enforced across workers)
+RATE_LIMIT_PRIORITY_RESERVE = float(os.environ.get("RATE_LIMIT_PRIORITY_RESERVE", "0.25"))
+RATE_LIMITS = {
+    "gemini": {
+        "requests_per_minute": int(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", "30")),
+        "tokens_per_minute": int(os.environ.get("GEMINI_TOKENS_PER_MINUTE", "1000000")),
+        "max_concurrent": int(os.environ.get("GEMINI_MAX_CONCURRENT", "8")),
+    },
+    "elevenlabs": {
+        # ElevenLabs bills by characters, so "tokens" are characters here
+        "requests_per_minute": int(os.environ.get("ELEVENLABS_REQUESTS_PER_MINUTE", "100")),
+        "tokens_per_minute": int(os.environ.get("ELEVENLABS_CHARACTERS_PER_MINUTE", "40000")),
+        "max_concurrent": int(os.environ.get("ELEVENLABS_MAX_CONCURRENT", "4")),
+    },
+}
+
+# Latency budgets: get_response and end requests get REQUEST_BUDGET_SECONDS in total
+# (kept under gunicorn's 30s worker timeout); provider calls get what's left.
+REQUEST_BUDGET_SECONDS = float(os.environ.get("REQUEST_BUDGET_SECONDS", "25"))
+# Calls made without a request deadline (question generation while the interview page
+# loads, batch re-scoring). Also below gunicorn's timeout, with room for the rest of the page
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "20"))
+TTS_TIMEOUT_SECONDS = float(os.environ.get("TTS_TIMEOUT_SECONDS", "15"))
+# Time kept back from the model call so speech can still be generated
+TTS_RESERVE_SECONDS = float(os.environ.get("TTS_RESERVE_SECONDS", "4"))
+# Send a duplicate turn request once the first one is slower than the recent p95
+LLM_HEDGE_ENABLED = os.environ.get("LLM_HEDGE_ENABLED", "True") == "True"
+LLM_HEDGE_PERCENTILE = int(os.environ.get("LLM_HEDGE_PERCENTILE", "95"))
+PROVIDER_CALL_THREADS = int(os.environ.get("PROVIDER_CALL_THREADS", "16"))
+# Circuit breaker: fail fast (local fallbacks) after N consecutive failures, retry after RESET
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", "30"))
+
+# Code execution sandbox (candidate code is run against Question.test_cases)
+CODE_RUNNER_CPU_SECONDS = int(os.environ.get("CODE_RUNNER_CPU_SECONDS", "2"))
+CODE_RUNNER_MEMORY_MB = int(os.environ.get("CODE_RUNNER_MEMORY_MB", "256"))
+CODE_RUNNER_WALL_SECONDS = float(os.environ.get("CODE_RUNNER_WALL_SECONDS", "5"))
+# Candidate code only runs under a seccomp filter (Linux x86_64/aarch64). "True" lets it run
+# with just rlimits and an audit hook where seccomp is unavailable - local development only
+CODE_RUNNER_ALLOW_UNCONFINED = os.environ.get("CODE_RUNNER_ALLOW_UNCONFINED", "False") == "True"
+# Warm worker pool per app process (0 = spawn a fresh interpreter per run)
+CODE_RUNNER_POOL_SIZE = int(os.environ.get("CODE_RUNNER_POOL_SIZE", "2"))
+CODE_RUNNER_POOL_MAX_RUNS = int(os.environ.get("CODE_RUNNER_POOL_MAX_RUNS", "100"))
+CODE_RUNNER_POOL_MAX_QUEUE = int(os.environ.get("CODE_RUNNER_POOL_MAX_QUEUE", "32"))
+# LRU cache of run results keyed by (question, code AST hash, test-case version)
+CODE_RUNNER_CACHE_SIZE = int(os.environ.get("CODE_RUNNER_CACHE_SIZE", "512"))
+
+# Empirical complexity profiling (input sizes double from MIN_N to MAX_N)
+COMPLEXITY_MIN_N = int(os.environ.get("COMPLEXITY_MIN_N", "256"))
+COMPLEXITY_MAX_N = int(os.environ.get("COMPLEXITY_MAX_N", "16384"))
+COMPLEXITY_BUDGET_SECONDS = float(os.environ.get("COMPLEXITY_BUDGET_SECONDS", "3"))
+# Time kept back from profiling for the model's reply and speech (profiling runs on the turn request)
+COMPLEXITY_RESERVE_SECONDS = float(os.environ.get("COMPLEXITY_RESERVE_SECONDS", "12"))
+
+# Question generation: questions per model call, and unused questions kept ready per round
+QUESTION_BATCH_SIZE = int(os.environ.get("QUESTION_BATCH_SIZE", "5"))
+QUESTION_POOL_SIZE = int(os.environ.get("QUESTION_POOL_SIZE", "3"))
+
+# Batch re-scoring of completed interviews (rescore_interviews command, admin actions)
+RESCORE_WORKERS = int(os.environ.get("RESCORE_WORKERS", "4"))
+RESCORE_BATCH_SIZE = int(os.environ.get("RESCORE_BATCH_SIZE", "20"))
+RESCORE_CHECKPOINT_PATH = os.environ.get(
+    "RESCORE_CHECKPOINT_PATH", str(BASE_DIR / ".rescore_checkpoint.json")
+)
+
+# Local fast path: skip or template replies for trivial turns instead of calling the LLM
+FAST_PATH_ENABLED = os.environ.get("FAST_PATH_ENABLED", "True") == "True"
+FAST_PATH_MIN_AST_CHANGE = int(os.environ.get("FAST_PATH_MIN_AST_CHANGE", "3"))
+FAST_PATH_IDLE_NUDGE_SECONDS = int(os.environ.get("FAST_PATH_IDLE_NUDGE_SECONDS", "120"))
+
+# Request tracing: "" (off), "jsonl" (local file) or "otlp" (OTLP/HTTP collector)
+TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "")
+TRACING_JSONL_PATH = os.environ.get("TRACING_JSONL_PATH", str(BASE_DIR / "traces.jsonl"))
+TRACING_OTLP_ENDPOINT = os.environ.get("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+TRACING_SERVICE_NAME = os.environ.get("TRACING_SERVICE_NAME", "vode")
+# Fraction of requests traced
+TRACING_SAMPLE_RATE = float(os.environ.get("TRACING_SAMPLE_RATE", "1.0"))
+# Queries beyond this still count towards the request's DB totals, without their own span
+TRACING_MAX_DB_SPANS = int(os.environ.get("TRACING_MAX_DB_SPANS", "50"))
+
+# N+1 query detector for development: "" (off), "log" or "raise"
+NPLUSONE_MODE = os.environ.get("NPLUSONE_MODE", "")
+# A query shape may repeat this many times per request before it is reported
+NPLUSONE_THRESHOLD = int(os.environ.get("NPLUSONE_THRESHOLD", "5"))
+
+# Request profiling (vode.profiling): saved profiles are listed at /profiles/ for staff
+PROFILING_DIR = os.environ.get("PROFILING_DIR", str(BASE_DIR / "profiles"))
+# "cprofile" (.pstats) or "sample" (speedscope, lower overhead)
+PROFILING_MODE = os.environ.get("PROFILING_MODE", "cprofile")
+# Fraction of requests to PROFILING_VIEWS profiled without a header (0 = header only)
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+# Comma-separated view names, e.g. "interview:get_response,interview:interview" (empty = all)
+PROFILING_VIEWS = os.environ.get("PROFILING_VIEWS", "")
+PROFILING_SAMPLE_INTERVAL = float(os.environ.get("PROFILING_SAMPLE_INTERVAL", "0.005"))
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get("PROFILING_TOKEN_MAX_AGE", "3600"))
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", "200"))
+
+# Bearer token required to scrape /metrics (open when empty)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Interview recordings: uploaded in resumable chunks to "local" files or "s3" (needs boto3)
+RECORDING_STORAGE = os.environ.get("RECORDING_STORAGE", "local")
+# Local recordings are served by interview.views.recording (with Range support), not from MEDIA_ROOT
+RECORDINGS_DIR = os.environ.get("RECORDINGS_DIR", str(BASE_DIR / "recordings"))
+# Hand local recordings to the front server: "" (sendfile from the worker),
+# "x-accel-redirect" (nginx, internal location RECORDING_ACCEL_PREFIX) or "x-sendfile" (Apache)
+RECORDING_SENDFILE = os.environ.get("RECORDING_SENDFILE", "")
+RECORDING_ACCEL_PREFIX = os.environ.get("RECORDING_ACCEL_PREFIX", "/protected-recordings/")
+# Browser cache lifetime of finished recordings, in seconds
+RECORDING_CACHE_SECONDS = int(os.environ.get("RECORDING_CACHE_SECONDS", "86400"))
+# Thumbnail sprite + turn index built with ffmpeg once a recording finishes uploading
+RECORDING_PREVIEWS_ENABLED = os.environ.get("RECORDING_PREVIEWS_ENABLED", "True") == "True"
+FFMPEG_PATH = os.environ.get("FFMPEG_PATH", "ffmpeg")
+RECORDING_PREVIEW_INTERVAL_SECONDS = int(os.environ.get("RECORDING_PREVIEW_INTERVAL_SECONDS", "10"))
+RECORDING_PREVIEW_WIDTH = int(os.environ.get("RECORDING_PREVIEW_WIDTH", "160"))
+RECORDING_PREVIEW_HEIGHT = int(os.environ.get("RECORDING_PREVIEW_HEIGHT", "90"))
+RECORDING_PREVIEW_COLUMNS = int(os.environ.get("RECORDING_PREVIEW_COLUMNS", "10"))
+# Caps the sprite size for very long recordings (600 x 10s = 100 minutes)
+RECORDING_PREVIEW_MAX_THUMBNAILS = int(os.environ.get("RECORDING_PREVIEW_MAX_THUMBNAILS", "600"))
+RECORDING_PREVIEW_TIMEOUT_SECONDS = int(os.environ.get("RECORDING_PREVIEW_TIMEOUT_SECONDS", "600"))
+# ffmpeg runs at once per process
+RECORDING_PREVIEW_WORKERS = int(os.environ.get("RECORDING_PREVIEW_WORKERS", "1"))
+# Largest single PATCH (the client sends smaller chunks) and largest recording, in bytes
+RECORDING_MAX_CHUNK_BYTES = int(os.environ.get("RECORDING_MAX_CHUNK_BYTES", str(64 * 1024 * 1024)))
+RECORDING_MAX_BYTES = int(os.environ.get("RECORDING_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+RECORDING_S3_BUCKET = os.environ.get("RECORDING_S3_BUCKET", "")
+RECORDING_S3_ENDPOINT = os.environ.get("RECORDING_S3_ENDPOINT", "")
+# Public base URL of the bucket, used as the recording URL
+RECORDING_S3_URL = os.environ.get("RECORDING_S3_URL", "")
+# Where chunks wait until there's enough for an S3 part (shared by all workers)
+RECORDING_SPOOL_DIR = os.environ.get("RECORDING_SPOOL_DIR", str(BASE_DIR / "recording_spool"))
+
+# Usage ledger: records per model/TTS call, written in batches off the request path
+USAGE_LEDGER_BATCH_SIZE = int(os.environ.get("USAGE_LEDGER_BATCH_SIZE", "100"))
+USAGE_LEDGER_FLUSH_SECONDS = float(os.environ.get("USAGE_LEDGER_FLUSH_SECONDS", "5"))
+# Records kept in memory while the database is unreachable; the oldest are dropped beyond this
+USAGE_LEDGER_MAX_BUFFER = int(os.environ.get("USAGE_LEDGER_MAX_BUFFER", "10000"))
+
+# Presence: the interview page's heartbeat, and the reaper for interviews abandoned mid-way
+# Heartbeats only reach the database this often per interview and process
+PRESENCE_WRITE_SECONDS = int(os.environ.get("PRESENCE_WRITE_SECONDS", "60"))
+# Past the round's time limit by this much, an unfinished interview is finalized and scored
+INTERVIEW_GRACE_SECONDS = int(os.environ.get("INTERVIEW_GRACE_SECONDS", "300"))
+# In-memory sessions of interviews not heard from for this long are dropped
+SESSION_IDLE_SECONDS = int(os.environ.get("SESSION_IDLE_SECONDS", "900"))
+REAPER_ENABLED = os.environ.get("REAPER_ENABLED", "True") == "True"
+REAPER_INTERVAL_SECONDS = int(os.environ.get("REAPER_INTERVAL_SECONDS", "60"))
 
 # Logging
 LOGGING = {
@@ -0,0 +1,229 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from prometheus_client import REGISTRY
+from unittest import mock
+import json
+import os
+import tempfile
+
+from vode import nplusone, profiling, tracing
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+class TracingTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.exporter = CollectingExporter()
+        patcher = mock.patch.object(tracing, "get_exporter", return_value=self.exporter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def spans(self):
+        (trace,) = self.exporter.traces
+        return {s["name"]: s for s in trace["spans"]}
+
+
+@override_settings(TRACING_SAMPLE_RATE=1.0)
+class TracingTests(TracingTestMixin, SimpleTestCase):
+    def test_span_outside_a_trace_is_a_noop(self):
+        with tracing.span("orphan") as s:
+            s.set(ignored=True)
+        self.assertIs(s, tracing.NOOP_SPAN)
+        self.assertEqual(self.exporter.traces, [])
+
+    def test_spans_nest_under_their_parent(self):
+        with tracing.start_trace("job", kind="test") as trace:
+            with tracing.span("outer") as outer:
+                with tracing.span("inner", size=3) as inner:
+                    inner.set(result="ok")
+                tracing.record_span("finished", outer.start_ns)
+
+        spans = self.spans()
+        self.assertEqual(spans["job"]["span_id"], trace.root.span_id)
+        self.assertEqual(spans["job"]["attributes"]["kind"], "test")
+        self.assertEqual(spans["outer"]["parent_id"], trace.root.span_id)
+        self.assertEqual(spans["inner"]["parent_id"], spans["outer"]["span_id"])
+        self.assertEqual(spans["finished"]["parent_id"], spans["outer"]["span_id"])
+        self.assertEqual(spans["inner"]["attributes"], {"size": 3, "result": "ok"})
+
+    def test_errors_are_recorded_and_reraised(self):
+        with self.assertRaises(ValueError):
+            with tracing.start_trace("job"):
+                with tracing.span("failing"):
+                    raise ValueError("boom")
+
+        spans = self.spans()
+        self.assertEqual(spans["failing"]["error"], "ValueError('boom')")
+        self.assertEqual(spans["job"]["error"], "ValueError('boom')")
+
+    @override_settings(TRACING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_traced(self):
+        with tracing.start_trace("job") as trace:
+            self.assertIsNone(trace)
+        self.assertEqual(self.exporter.traces, [])
+
+    @override_settings(TRACING_EXPORTER="jsonl")
+    def test_middleware_tags_the_response_with_the_trace_id(self):
+        middleware = tracing.TracingMiddleware(lambda request: HttpResponse("hello"))
+        response = middleware(RequestFactory().get("/health/"))
+
+        root = self.spans()["http.request"]
+        self.assertEqual(response["X-Trace-Id"], self.exporter.traces[0]["trace_id"])
+        self.assertEqual(root["attributes"]["path"], "/health/")
+        self.assertEqual(root["attributes"]["status_code"], 200)
+        self.assertEqual(root["attributes"]["response_bytes"], 5)
+
+    def test_otlp_export_keeps_the_span_tree(self):
+        with tracing.start_trace("job"):
+            with tracing.span("child", tokens=12, cached=False):
+                pass
+
+        (request,) = tracing.to_otlp(self.exporter.traces)["resourceSpans"]
+        root, child = request["scopeSpans"][0]["spans"]
+        self.assertNotIn("parentSpanId", root)
+        self.assertEqual(child["parentSpanId"], root["spanId"])
+        self.assertIn({"key": "tokens", "value": {"intValue": "12"}}, child["attributes"])
+        self.assertIn({"key": "cached", "value": {"boolValue": False}}, child["attributes"])
+        self.assertEqual(child["status"], {"code": 1})
+
+
+class JsonlExporterTests(SimpleTestCase):
+    def test_appends_one_line_per_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces.jsonl")
+            exporter = tracing.JsonlExporter(path)
+            exporter.export({"trace_id": "a"})
+            exporter.export({"trace_id": "b"})
+            with open(path) as f:
+                self.assertEqual([json.loads(line)["trace_id"] for line in f], ["a", "b"])
+
+
+@override_settings(TRACING_SAMPLE_RATE=1.0, TRACING_MAX_DB_SPANS=1)
+class TracingQueryTests(TracingTestMixin, TestCase):
+    def test_every_query_is_counted_but_only_the_first_gets_a_span(self):
+        with tracing.start_trace("job"):
+            User.objects.count()
+            User.objects.exists()
+
+        (trace,) = self.exporter.traces
+        root = trace["spans"][0]
+        self.assertEqual(root["attributes"]["db_queries"], 2)
+        self.assertEqual([s["name"] for s in trace["spans"][1:]], ["db.query"])
+
+
+class MetricsTests(SimpleTestCase):
+    def request_count(self, view):
+        return REGISTRY.get_sample_value(
+            "vode_http_request_duration_seconds_count", {"view": view, "method": "GET", "status": "200"}
+        ) or 0
+
+    def test_requests_are_labelled_by_view_name(self):
+        before = self.request_count("metrics")
+        self.client.get("/metrics")
+        self.client.get("/metrics")
+        self.assertEqual(self.request_count("metrics"), before + 2)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_scrapes_need_the_token_when_one_is_set(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code, 403)
+        response = self.client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"vode_fallbacks", response.content)
+
+
+@override_settings(NPLUSONE_MODE="raise", NPLUSONE_THRESHOLD=2)
+class NPlusOneTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create(username=f"user{i}") for i in range(3)]
+
+    def one_query_per_user(self, request):
+        for user in self.users:
+            User.objects.filter(id=user.id).first()
+        return HttpResponse()
+
+    def test_query_shape_collapses_in_lists_and_limits(self):
+        self.assertEqual(
+            nplusone.query_shape("SELECT 1 FROM t WHERE id IN (%s, %s, %s) LIMIT 21"),
+            "SELECT 1 FROM t WHERE id IN (...) LIMIT n",
+        )
+
+    def test_repeated_query_shape_raises_with_its_call_site(self):
+        middleware = nplusone.NPlusOneMiddleware(self.one_query_per_user)
+        with self.assertRaises(nplusone.NPlusOneDetected) as raised:
+            middleware(RequestFactory().get("/roles/"))
+        self.assertIn("3x at vode/tests.py", str(raised.exception))
+        self.assertIn("in one_query_per_user", str(raised.exception))
+
+    def test_batched_queries_pass(self):
+        def one_query(request):
+            list(User.objects.filter(id__in=[user.id for user in self.users]))
+            return HttpResponse()
+
+        response = nplusone.NPlusOneMiddleware(one_query)(RequestFactory().get("/roles/"))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(NPLUSONE_MODE="log")
+    def test_log_mode_only_warns(self):
+        middleware = nplusone.NPlusOneMiddleware(self.one_query_per_user)
+        with self.assertLogs("vode.nplusone", "WARNING") as logs:
+            response = middleware(RequestFactory().get("/roles/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Possible N+1 queries in GET /roles/", logs.output[0])
+
+
+class ProfilingTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        override = override_settings(PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=0)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def get(self, **headers):
+        return self.client.get("/metrics", headers=headers)
+
+    def test_signed_header_saves_a_cprofile(self):
+        response = self.get(**{profiling.HEADER: profiling.make_token()})
+        filename = response["X-Vode-Profile-File"]
+        self.assertTrue(filename.endswith(".pstats"))
+        self.assertIn("-metrics-", filename)
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, filename)))
+
+    def test_sample_mode_saves_a_speedscope_file(self):
+        response = self.get(**{profiling.HEADER: profiling.make_token(), profiling.MODE_HEADER: profiling.SAMPLE})
+        with open(os.path.join(self.directory, response["X-Vode-Profile-File"])) as f:
+            profile = json.load(f)
+        self.assertEqual(profile["name"], "GET /metrics")
+        self.assertEqual(profile["profiles"][0]["type"], "sampled")
+
+    def test_requests_without_a_valid_token_are_not_profiled(self):
+        self.assertNotIn("X-Vode-Profile-File", self.get())
+        with self.assertLogs("vode.profiling", "WARNING"):
+            self.assertNotIn("X-Vode-Profile-File", self.get(**{profiling.HEADER: "forged:token"}))
+        with override_settings(PROFILING_TOKEN_MAX_AGE=-1), self.assertLogs("vode.profiling", "WARNING"):
+            self.assertNotIn("X-Vode-Profile-File", self.get(**{profiling.HEADER: profiling.make_token()}))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_VIEWS="metrics")
+    def test_sampled_views_are_profiled_without_a_header(self):
+        self.assertIn("X-Vode-Profile-File", self.get())
+
+    @override_settings(PROFILING_MAX_FILES=2)
+    def test_only_the_newest_profiles_are_kept(self):
+        for _ in range(3):
+            self.get(**{profiling.HEADER: profiling.make_token()})
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+    def test_profiles_are_staff_only(self):
+        self.assertEqual(self.client.get("/profiles/").status_code, 302)
+        self.assertEqual(self.client.get("/profiles/x.pstats").status_code, 302)
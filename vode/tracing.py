@@ -0,0 +1,335 @@
+"""
+Lightweight request tracing.
+
+TracingMiddleware starts a trace per request. Code anywhere below it opens
+nested spans with::
+
+    with span("llm.generate", model=model) as s:
+        ...
+        s.set(output_tokens=response.output_tokens)
+
+Spans record their duration, attributes and any exception. Every ORM query is
+timed too. Finished traces are exported to a JSONL file or an OTLP/HTTP
+collector (settings.TRACING_EXPORTER). Outside a trace, span() is a no-op, so
+instrumented code costs nothing when tracing is off.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+import json
+import logging
+import queue
+import random
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_current_trace = ContextVar("current_trace", default=None)
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    def set(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """All spans of one request (or one explicitly traced job)"""
+
+    def __init__(self, name, **attributes):
+        self.trace_id = secrets.token_hex(16)
+        self.root = Span(name, self.trace_id, attributes=attributes)
+        self.spans = []
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self):
+        self.root.set(db_queries=self.db_queries, db_ms=round(self.db_ms, 3))
+        return {
+            "trace_id": self.trace_id,
+            "service": settings.TRACING_SERVICE_NAME,
+            "spans": [self.root.to_dict()] + [s.to_dict() for s in self.spans],
+        }
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a child of the current span.
+
+    Yields:
+        The Span (call .set(...) to add attributes), or a no-op stand-in when
+        there is no active trace
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get() or trace.root
+    current = Span(name, trace.trace_id, parent.span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = repr(e)[:300]
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.add(current)
+
+
+def record_span(name, start_ns, **attributes):
+    """
+    Add an already finished span (for work that can't sit in a with block,
+    like a generator that yields to its caller).
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get() or trace.root
+    finished = Span(name, trace.trace_id, parent.span_id, attributes)
+    finished.start_ns = start_ns
+    finished.end_ns = time.time_ns()
+    trace.add(finished)
+
+
+@contextmanager
+def start_trace(name, **attributes):
+    """Start a new trace (if tracing is on), exporting it when the block ends"""
+    exporter = get_exporter()
+    if exporter is None or random.random() >= settings.TRACING_SAMPLE_RATE:
+        yield None
+        return
+
+    trace = Trace(name, **attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        with connection.execute_wrapper(_time_query):
+            yield trace
+    except Exception as e:
+        trace.root.error = repr(e)[:300]
+        raise
+    finally:
+        trace.root.end_ns = time.time_ns()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        exporter.export(trace.to_dict())
+
+
+def _time_query(execute, sql, params, many, context):
+    trace = _current_trace.get()
+    if trace is None:
+        return execute(sql, params, many, context)
+
+    started = time.time_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        trace.db_queries += 1
+        trace.db_ms += (time.time_ns() - started) / 1e6
+        # Every query still counts in the totals; only the first few get their own span
+        if trace.db_queries <= settings.TRACING_MAX_DB_SPANS:
+            record_span("db.query", started, sql=sql[:300], many=many)
+
+
+class JsonlExporter:
+    """Appends one JSON line per trace to a local file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces):
+    """Convert exported trace dicts to an OTLP/HTTP JSON ExportTraceServiceRequest"""
+    spans = []
+    for trace in traces:
+        for s in trace["spans"]:
+            otlp_span = {
+                "traceId": trace["trace_id"],
+                "spanId": s["span_id"],
+                "name": s["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(s["start_ns"]),
+                "endTimeUnixNano": str(s["start_ns"] + int(s["duration_ms"] * 1e6)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in s["attributes"].items()
+                    if value is not None
+                ],
+                # 1 = OK, 2 = ERROR
+                "status": {"code": 2, "message": s["error"]} if s["error"] else {"code": 1},
+            }
+            if s["parent_id"]:
+                otlp_span["parentSpanId"] = s["parent_id"]
+            spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(settings.TRACING_SERVICE_NAME)}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "vode.tracing"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class OtlpExporter:
+    """
+    Sends traces to an OTLP/HTTP collector (JSON encoding) from a background
+    thread in batches, so requests never wait on the collector.
+    """
+
+    BATCH_SIZE = 50
+    FLUSH_SECONDS = 2.0
+    MAX_QUEUED = 1000
+
+    def __init__(self, endpoint):
+        # Imported here: only needed when exporting over HTTP
+        import requests
+
+        self.requests = requests
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._queue = queue.Queue(maxsize=self.MAX_QUEUED)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace):
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            logger.warning("Trace export queue full, dropping trace")
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                response = self.requests.post(self.url, json=to_otlp(batch), timeout=5)
+                response.raise_for_status()
+            except self.requests.exceptions.RequestException as e:
+                logger.warning(f"Could not export {len(batch)} traces to {self.url}: {e}")
+
+
+EXPORTERS = {
+    "jsonl": lambda: JsonlExporter(settings.TRACING_JSONL_PATH),
+    "otlp": lambda: OtlpExporter(settings.TRACING_OTLP_ENDPOINT),
+}
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """Process-wide exporter, or None when tracing is off"""
+    global _exporter
+    if not settings.TRACING_EXPORTER:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = EXPORTERS[settings.TRACING_EXPORTER]()
+        return _exporter
+
+
+class TracingMiddleware:
+    """Traces every request; removed from the stack when TRACING_EXPORTER is empty"""
+
+    def __init__(self, get_response):
+        if not settings.TRACING_EXPORTER:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with start_trace("http.request", method=request.method, path=request.path) as trace:
+            response = self.get_response(request)
+            if trace is not None:
+                match = getattr(request, "resolver_match", None)
+                trace.root.set(
+                    route=match.route if match else None,
+                    status_code=response.status_code,
+                    response_bytes=(
+                        len(response.content) if not response.streaming else None
+                    ),
+                )
+                response["X-Trace-Id"] = trace.trace_id
+        return response
@@ -19,6 +19,8 @@ from django.urls import path
 from django.urls import include
 from django.conf import settings
 from django.conf.urls.static import static
+from vode.metrics import metrics
+from vode.profiling import profile_download, profiles_index
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -27,6 +29,9 @@ urlpatterns = [
     path("swe/", include("swe.urls")),
     path("candidate/", include("cand.urls"), name="candidate"),
     path("interview/", include("interview.urls"), name="interview"),
+    path("metrics", metrics, name="metrics"),
+    path("profiles/", profiles_index, name="profiles"),
+    path("profiles/<str:name>", profile_download, name="profile_download"),
 ]
 
 # Serve media files in development